@@ -0,0 +1,422 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Benchmarks run on headless machines
+
+import argparse
+import importlib.metadata
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import neat
+import pygame
+
+import main
+from components.bird import Bird
+from components.pipe import Pipe
+from components.background import Sky
+from components.population import BirdPopulation
+from components.pipe_track import PipeTrack
+from components.batch_net import BatchNetwork
+from components.simulation import DecisionSchedule, Simulation, create_pipe
+from components.training_view import TrainingView
+from components.vector_env import VectorEnv
+
+# Seed for every benchmark, so each run measures the same work
+SEED: int = 1234
+
+# Population sizes of the generation benchmarks
+GENERATION_SIZES: Tuple[int, ...] = (30, 150, 500)
+
+# Decision interval of the generation benchmark that measures action repeat
+DECISION_INTERVAL: int = 4
+
+# Allowed slowdown before a result counts as a regression, as a fraction of the baseline
+DEFAULT_THRESHOLD: float = 0.10
+
+# A benchmark returns the amount of work it did and the seconds it took
+Measurement = Tuple[float, float]
+
+
+def load_config(size: int = 30) -> neat.Config:
+    """
+    Load the NEAT configuration with a different population size.
+
+    Args:
+        size (int): The population size.
+
+    Returns:
+        neat.Config: The configuration.
+    """
+    config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        main.CONFIG_PATH
+    )
+    config.pop_size = size
+    return config
+
+
+def make_genomes(config: neat.Config, size: int, mutations: int = 5) -> List[Tuple[int, neat.DefaultGenome]]:
+    """
+    Create seeded genomes with a few mutations each, so their networks are not all the same.
+
+    Args:
+        config (neat.Config): The NEAT configuration.
+        size (int): The number of genomes.
+        mutations (int): The number of mutations applied to each genome.
+
+    Returns:
+        List[Tuple[int, neat.DefaultGenome]]: (genome id, genome) pairs, as passed to a fitness function.
+    """
+    random.seed(SEED)
+    genomes: List[Tuple[int, neat.DefaultGenome]] = []
+    for key in range(1, size + 1):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        genomes.append((key, genome))
+    return genomes
+
+
+def bench_bird_update(steps: int = 20000) -> Measurement:
+    """Bird.update calls per second, jumping every 30 frames like a bird that stays in the air."""
+    bird = Bird(random.Random(SEED))
+    start = time.perf_counter()
+    for step in range(steps):
+        if step % 30 == 0:
+            bird.jump()
+        bird.update()
+    return steps, time.perf_counter() - start
+
+
+def bench_pipe_update(steps: int = 20000) -> Measurement:
+    """Pipe.update calls per second for pairs that are moved back to the right edge when they leave."""
+    rng = random.Random(SEED)
+    pipes: List[Pipe] = [pipe for _ in range(4) for pipe in create_pipe(rng)]
+    start = time.perf_counter()
+    for _ in range(steps // len(pipes)):
+        for pipe in pipes:
+            pipe.update()
+            if pipe.rect.right < 0:
+                pipe.rect.x += 1000
+                pipe.edge_rect.x += 1000
+    return steps // len(pipes) * len(pipes), time.perf_counter() - start
+
+
+def bench_population_update(size: int = 1000, steps: int = 2000) -> Measurement:
+    """Bird updates per second with BirdPopulation, the training path."""
+    population = BirdPopulation(size, random.Random(SEED))
+    rng = np.random.default_rng(SEED)
+    start = time.perf_counter()
+    for _ in range(steps):
+        population.jump(np.flatnonzero(rng.random(size) < 0.05))
+        population.update()
+    return size * steps, time.perf_counter() - start
+
+
+def bench_activate(calls: int = 20000) -> Measurement:
+    """FeedForwardNetwork.activate calls per second."""
+    config = load_config()
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for _, genome in make_genomes(config, 30)]
+    rng = random.Random(SEED)
+    inputs = [(rng.random(), rng.random() - 1, rng.random(), rng.random()) for _ in range(256)]
+    start = time.perf_counter()
+    for call in range(calls):
+        nets[call % len(nets)].activate(inputs[call % len(inputs)])
+    return calls, time.perf_counter() - start
+
+
+def bench_batch_activate(size: int = 500, calls: int = 500) -> Measurement:
+    """Network activations per second with BatchNetwork, one row per genome."""
+    config = load_config(size)
+    nets = BatchNetwork.create([genome for _, genome in make_genomes(config, size)], config)
+    inputs = np.random.default_rng(SEED).random((size, 4))
+    start = time.perf_counter()
+    for _ in range(calls):
+        nets.activate(inputs)
+    return size * calls, time.perf_counter() - start
+
+
+def bench_collide_mask(checks: int = 20000) -> Measurement:
+    """pygame.sprite.collide_mask checks per second between a bird and pipes around it, as in play mode."""
+    rng = random.Random(SEED)
+    bird = Bird(rng)
+    pipes: List[Pipe] = []
+    for _ in range(32):
+        top, bottom = create_pipe(rng)
+        shift = rng.randint(-900, -760)  # Around the bird's column
+        for pipe in (top, bottom):
+            pipe.rect.x += shift
+            pipe.edge_rect.x += shift
+            pipes.append(pipe)
+    start = time.perf_counter()
+    for check in range(checks):
+        if check % 30 == 0:
+            bird.jump()
+        bird.update()
+        pygame.sprite.collide_mask(bird, pipes[check % len(pipes)])
+    return checks, time.perf_counter() - start
+
+
+def bench_pipe_track_collides(size: int = 1000, steps: int = 500) -> Measurement:
+    """Bird collision checks per second with PipeTrack, the training path."""
+    population = BirdPopulation(size, random.Random(SEED))
+    population.y[:] = np.random.default_rng(SEED).uniform(50, 520, size)
+    population.update()
+    pipes = PipeTrack(random.Random(SEED))
+    pipes.spawn(0)
+    birds = population.alive_indices
+    start = time.perf_counter()
+    for step in range(steps):
+        pipes.x[:] = 40 + step % 80  # Sweep the pipe through the birds' column
+        pipes.collides(population, birds, pipes.nearest(population.left[birds]))
+    return size * steps, time.perf_counter() - start
+
+
+def bench_vector_env(size: int = 1000, steps: int = 500) -> Measurement:
+    """
+    Game steps per second of a VectorEnv with auto-reset, driven by seeded random jumps.
+
+    Args:
+        size (int): The number of games.
+        steps (int): The number of batched steps.
+    """
+    env = VectorEnv(range(SEED, SEED + size), max_frames=1000, reset_seed=SEED)
+    actions = np.random.default_rng(SEED).random((steps, size)) < 0.05
+    env.reset()
+    start = time.perf_counter()
+    for step in range(steps):
+        env.step(actions[step])
+    return size * steps, time.perf_counter() - start
+
+
+def bench_generation(size: int, generations: int = 3, schedule: Optional[DecisionSchedule] = None) -> Measurement:
+    """
+    Headless eval_genomes generations per second.
+
+    Args:
+        size (int): The population size.
+        generations (int): The number of generations to evaluate, each on its own seeded course.
+        schedule (Optional[DecisionSchedule]): How often the networks decide. Defaults to every frame.
+    """
+    config = load_config(size)
+    genomes = make_genomes(config, size)
+    start = time.perf_counter()
+    for generation in range(generations):
+        main.eval_genomes(genomes, config, headless=True, progress=False, seed=SEED + generation,
+                          schedule=schedule)
+    return generations, time.perf_counter() - start
+
+
+def bench_render(frames: int = 300, dirty_rects: bool = False) -> Measurement:
+    """
+    Frames per second of the training render path, without the frame limiter.
+
+    Args:
+        frames (int): The number of frames to draw.
+        dirty_rects (bool): Update only the changed parts of the display.
+    """
+    config = load_config(100)
+    genomes = [genome for _, genome in make_genomes(config, 100)]
+    simulation = Simulation(genomes, config, SEED)
+    sky = Sky(random.Random(SEED))
+    view = TrainingView(dirty_rects=dirty_rects, fps=0)
+    view.start()
+    drawn = 0
+    start = time.perf_counter()
+    while drawn < frames:
+        if simulation.done:
+            simulation = Simulation(genomes, config, SEED + drawn)
+        simulation.step()
+        sky.update()
+        view.draw(main.display.screen, sky, simulation, [f"Birds Left: {simulation.population.alive_count}"],
+                  main.display.font(main.FONT_SIZE))
+        drawn += 1
+    return frames, time.perf_counter() - start
+
+
+def bench_import_main(imports: int = 5) -> Measurement:
+    """Start fresh interpreters that import the game module, as tools and worker processes do."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    for _ in range(imports):
+        subprocess.run([sys.executable, '-c', 'import main'], cwd=directory, check=True, stdout=subprocess.DEVNULL)
+    return imports, time.perf_counter() - start
+
+
+# name -> (benchmark, unit)
+BENCHMARKS: Dict[str, Tuple[Callable[[], Measurement], str]] = {
+    'bird_update': (bench_bird_update, 'steps/s'),
+    'pipe_update': (bench_pipe_update, 'steps/s'),
+    'population_update': (bench_population_update, 'bird steps/s'),
+    'activate': (bench_activate, 'calls/s'),
+    'batch_activate': (bench_batch_activate, 'activations/s'),
+    'collide_mask': (bench_collide_mask, 'checks/s'),
+    'pipe_track_collides': (bench_pipe_track_collides, 'checks/s'),
+    'vector_env': (bench_vector_env, 'game steps/s'),
+    **{f'generation_{size}': (lambda size=size: bench_generation(size), 'generations/s') for size in GENERATION_SIZES},
+    f'generation_500_every_{DECISION_INTERVAL}': (
+        lambda: bench_generation(500, schedule=DecisionSchedule(DECISION_INTERVAL)), 'generations/s'),
+    'render': (bench_render, 'frames/s'),
+    'render_dirty_rects': (lambda: bench_render(dirty_rects=True), 'frames/s'),
+    'import_main': (bench_import_main, 'imports/s'),
+}
+
+
+def run_benchmarks(names: List[str], repeat: int = 3) -> Dict[str, Dict[str, object]]:
+    """
+    Run benchmarks, keeping the best of several repeats to reduce noise.
+
+    Args:
+        names (List[str]): The benchmarks to run.
+        repeat (int): How often each benchmark is repeated.
+
+    Returns:
+        Dict[str, Dict[str, object]]: The rate and unit of each benchmark.
+    """
+    results: Dict[str, Dict[str, object]] = {}
+    for name in names:
+        benchmark, unit = BENCHMARKS[name]
+        rates: List[float] = []
+        for _ in range(repeat):
+            work, seconds = benchmark()
+            rates.append(work / seconds)
+        results[name] = {'value': max(rates), 'unit': unit, 'runs': rates}
+        print(f"{name:<22} {max(rates):>14,.1f} {unit}")
+    return results
+
+
+def package_version(name: str) -> str:
+    """
+    Get the installed version of a package.
+
+    Args:
+        name (str): The distribution name.
+
+    Returns:
+        str: The version, or 'unknown' if it cannot be found.
+    """
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def environment() -> Dict[str, str]:
+    """
+    Describe the machine and library versions, stored with the results.
+
+    Returns:
+        Dict[str, str]: The environment description.
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': str(os.cpu_count()),
+        'pygame': pygame.version.ver,
+        'neat-python': package_version('neat-python'),
+        'numpy': np.__version__,
+        'sdl_videodriver': os.environ.get('SDL_VIDEODRIVER', ''),
+    }
+
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]],
+            threshold: float, thresholds: Dict[str, float]) -> List[str]:
+    """
+    Compare results with a baseline. Every benchmark reports a rate, so lower is slower.
+
+    Args:
+        results (Dict[str, Dict[str, object]]): The new results.
+        baseline (Dict[str, Dict[str, object]]): The baseline results.
+        threshold (float): The allowed slowdown as a fraction of the baseline.
+        thresholds (Dict[str, float]): Allowed slowdowns of single benchmarks, overriding threshold.
+
+    Returns:
+        List[str]: The names of the benchmarks that regressed.
+    """
+    regressions: List[str] = []
+    print(f"\n{'benchmark':<22} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = float(baseline[name]['value']), float(result['value'])
+        change = new / old - 1
+        allowed = thresholds.get(name, threshold)
+        regressed = change < -allowed
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<22} {old:>14,.1f} {new:>14,.1f} {change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def parse_threshold(value: str) -> Tuple[str, float]:
+    """
+    Parse a per-benchmark threshold given as NAME=FRACTION, as an argparse type.
+
+    Args:
+        value (str): The threshold from the command line.
+
+    Returns:
+        Tuple[str, float]: The benchmark name and its threshold.
+
+    Raises:
+        argparse.ArgumentTypeError: If the name is not a benchmark or the fraction is not a number.
+    """
+    name, _, fraction = value.partition('=')
+    try:
+        if name in BENCHMARKS:
+            return name, float(fraction)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"invalid threshold {value!r}, expected NAME=FRACTION")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Flappy Bird simulation, inference and rendering.")
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)}. Defaults to all of them.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark; the best one is kept.")
+    parser.add_argument('--output', default='benchmark.json', help="File the results are written to.")
+    parser.add_argument('--baseline', default=None, help="Results file to compare against.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown against the baseline as a fraction, e.g. 0.1 for 10%%.")
+    parser.add_argument('--benchmark-threshold', action='append', default=[], type=parse_threshold,
+                        metavar='NAME=FRACTION',
+                        help="Allowed slowdown of one benchmark. Can be given several times.")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    thresholds = dict(args.benchmark_threshold)
+    results = run_benchmarks(args.benchmarks or list(BENCHMARKS), args.repeat)
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'seed': SEED, 'results': results}, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold, thresholds):
+            sys.exit(1)
@@ -0,0 +1,130 @@
+import pygame
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Bird angles are multiples of 1.25 degrees (velocity steps of 0.25 times -5), so this step reproduces every frame exactly
+ANGLE_STEP: float = 1.25
+
+# Pipe appearance, matching components.pipe
+PIPE_WIDTH: int = 80
+PIPE_HEIGHT: int = 500
+EDGE_OVERHANG: int = 8
+EDGE_HEIGHT: int = 20
+PIPE_COLOR: Tuple[int, int, int] = (0, 255, 0)
+EDGE_COLOR: Tuple[int, int, int] = (0, 200, 0)
+
+
+class AssetCache:
+    """
+    Shared surfaces for rendering, so drawing a frame does not allocate new ones.
+
+    - Bird rotation frames, computed once per color and angle step and looked up by angle.
+    - One pipe body, pipe edge and pipe mask shared by every Pipe.
+    - Rendered text, keyed by (text, font, color).
+
+    The frame and text caches are bounded and evict the least recently used entries.
+    """
+
+    def __init__(self, angle_step: float = ANGLE_STEP, max_frames: int = 8192, max_texts: int = 256) -> None:
+        """
+        Initialize the AssetCache.
+
+        Args:
+            angle_step (float): Bird angles are rounded to a multiple of this step before lookup.
+            max_frames (int): The maximum number of bird frames to keep.
+            max_texts (int): The maximum number of rendered texts to keep.
+        """
+        self.angle_step: float = angle_step
+        self.max_frames: int = max_frames
+        self.max_texts: int = max_texts
+        self._frames: 'OrderedDict[Tuple[Tuple[int, int, int], int], pygame.Surface]' = OrderedDict()
+        self._texts: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+        self._pipe_body: Optional[pygame.Surface] = None
+        self._pipe_edge: Optional[pygame.Surface] = None
+        self._pipe_mask: Optional[pygame.mask.Mask] = None
+
+    def bird_frame(self, image: pygame.Surface, color: Tuple[int, int, int], angle: float) -> pygame.Surface:
+        """
+        Get a bird image rotated by the nearest multiple of the angle step.
+
+        Args:
+            image (pygame.Surface): The unrotated bird image, used to build missing frames.
+            color (Tuple[int, int, int]): The bird's color, which identifies the image.
+            angle (float): The rotation angle in degrees.
+
+        Returns:
+            pygame.Surface: The rotated image. It is shared and must not be modified.
+        """
+        step = round(angle / self.angle_step)
+        key = (color, step)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = pygame.transform.rotate(image, step * self.angle_step)
+            self._frames[key] = frame
+            if len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        else:
+            self._frames.move_to_end(key)
+        return frame
+
+    def pipe_body(self) -> pygame.Surface:
+        """
+        Get the shared pipe body surface.
+
+        Returns:
+            pygame.Surface: The pipe body. It is shared and must not be modified.
+        """
+        if self._pipe_body is None:
+            self._pipe_body = pygame.Surface((PIPE_WIDTH, PIPE_HEIGHT))
+            self._pipe_body.fill(PIPE_COLOR)
+        return self._pipe_body
+
+    def pipe_edge(self) -> pygame.Surface:
+        """
+        Get the shared pipe edge surface.
+
+        Returns:
+            pygame.Surface: The pipe edge. It is shared and must not be modified.
+        """
+        if self._pipe_edge is None:
+            self._pipe_edge = pygame.Surface((PIPE_WIDTH + EDGE_OVERHANG, EDGE_HEIGHT))
+            self._pipe_edge.fill(EDGE_COLOR)
+        return self._pipe_edge
+
+    def pipe_mask(self) -> pygame.mask.Mask:
+        """
+        Get the collision mask of the pipe body, which is solid.
+
+        Returns:
+            pygame.mask.Mask: The pipe mask. It is shared and must not be modified.
+        """
+        if self._pipe_mask is None:
+            self._pipe_mask = pygame.mask.from_surface(self.pipe_body())
+        return self._pipe_mask
+
+    def text(self, text: str, font: pygame.font.Font, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Get rendered text, rendering it only if it is not cached.
+
+        Args:
+            text (str): The text to render.
+            font (pygame.font.Font): The font to render with.
+            color (Tuple[int, int, int]): The text color.
+
+        Returns:
+            pygame.Surface: The rendered text. It is shared and must not be modified.
+        """
+        key = (text, font, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._texts[key] = surface
+            if len(self._texts) > self.max_texts:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return surface
+
+
+# The cache shared by every sprite and screen in the game
+assets: AssetCache = AssetCache()
@@ -0,0 +1,169 @@
+import math
+import pygame
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+from components.cloud import Cloud
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+
+# Color used for the transparent parts of the cloud tiles
+COLORKEY: Tuple[int, int, int] = (255, 0, 255)
+
+
+class CloudLayer:
+    """
+    One parallax depth of clouds, pre-rendered into two screen-wide tiles.
+
+    Drawing a frame is two blits no matter how many clouds the layer has. When a tile scrolls off
+    the left edge it is moved behind the other tile and refilled with new clouds, which are blitted
+    from sprites rasterized once per cloud size.
+    """
+
+    def __init__(self, speed: float, clouds: int, y_range: Tuple[int, int], size_range: Tuple[int, int],
+                 rng: random.Random = random) -> None:
+        """
+        Initialize the CloudLayer.
+
+        Args:
+            speed (float): Pixels the layer moves left per frame. Slower layers look further away.
+            clouds (int): The number of clouds spread over two screen widths, like the ten clouds of the old sky.
+            y_range (Tuple[int, int]): The range of cloud center heights.
+            size_range (Tuple[int, int]): The range of cloud sizes.
+            rng (random.Random): The random number generator that places the clouds.
+        """
+        self.speed: float = speed
+        self.clouds_per_tile: int = max(1, clouds // 2)
+        self.y_range: Tuple[int, int] = y_range
+        self.size_range: Tuple[int, int] = size_range
+        self.rng: random.Random = rng
+        self.top: int = y_range[0] - size_range[1]
+        height = y_range[1] + int(size_range[1] * 1.3) + 1 - self.top
+        self.tiles: List[pygame.Surface] = [self._new_tile(height) for _ in range(2)]
+        self.offsets: List[float] = [0.0, float(SCREEN_WIDTH)]
+        self._sprites: Dict[int, pygame.Surface] = {}
+        for tile in self.tiles:
+            self._fill(tile)
+
+    @staticmethod
+    def _new_tile(height: int) -> pygame.Surface:
+        """
+        Create an empty tile.
+
+        Args:
+            height (int): The height of the tile.
+
+        Returns:
+            pygame.Surface: A transparent, screen-wide surface.
+        """
+        tile = pygame.Surface((SCREEN_WIDTH, height))
+        tile.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return tile
+
+    def cloud_sprite(self, size: int) -> pygame.Surface:
+        """
+        Get a cloud of the given size, rasterized on first use with the same circles as Cloud.draw.
+
+        Args:
+            size (int): The cloud size.
+
+        Returns:
+            pygame.Surface: The cloud, centered on the surface.
+        """
+        sprite = self._sprites.get(size)
+        if sprite is None:
+            sprite = pygame.Surface((size * 4, size * 4))
+            sprite.fill(COLORKEY)
+            cloud = Cloud(self.rng)
+            cloud.x, cloud.y, cloud.size = size * 2, size * 2, size
+            cloud.draw(sprite)
+            sprite.set_colorkey(COLORKEY)
+            self._sprites[size] = sprite
+        return sprite
+
+    def _fill(self, tile: pygame.Surface) -> None:
+        """
+        Clear a tile and place new clouds on it.
+
+        Args:
+            tile (pygame.Surface): The tile to fill.
+        """
+        tile.fill(COLORKEY)
+        width = SCREEN_WIDTH // self.clouds_per_tile
+        for k in range(self.clouds_per_tile):
+            size = self.rng.randint(*self.size_range)
+            # Keep whole clouds inside the tile so they are not cut at the seam
+            x = self.rng.randint(k * width + size * 2, max(k * width + size * 2, (k + 1) * width - size * 2))
+            y = self.rng.randint(*self.y_range) - self.top
+            tile.blit(self.cloud_sprite(size), (x - size * 2, y - size * 2))
+
+    def update(self) -> None:
+        """Scroll the layer, recycling a tile once it has left the screen."""
+        self.offsets = [offset - self.speed for offset in self.offsets]
+        for k, offset in enumerate(self.offsets):
+            if offset <= -SCREEN_WIDTH:
+                self.offsets[k] = offset + 2 * SCREEN_WIDTH
+                self._fill(self.tiles[k])
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """pygame.Rect: The screen area the layer can draw on."""
+        return pygame.Rect(0, self.top, SCREEN_WIDTH, self.tiles[0].get_height())
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw the layer with one blit per tile.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+        """
+        for tile, offset in zip(self.tiles, self.offsets):
+            screen.blit(tile, (math.floor(offset), self.top))
+
+
+class Sky:
+    """The cloud layers behind the game, drawn from the furthest to the nearest."""
+
+    # (speed, clouds, y_range, size_range) of the default layers. The near layer matches the clouds of
+    # components.cloud; slower layers listed before it are drawn behind it and add depth.
+    DEFAULT_LAYERS: Sequence[Tuple[float, int, Tuple[int, int], Tuple[int, int]]] = (
+        (1.0, 10, (50, 200), (20, 40)),
+    )
+
+    def __init__(self, rng: random.Random = random,
+                 layers: Optional[Sequence[Tuple[float, int, Tuple[int, int], Tuple[int, int]]]] = None) -> None:
+        """
+        Initialize the Sky.
+
+        Args:
+            rng (random.Random): The random number generator that places the clouds.
+            layers (Optional[Sequence]): (speed, clouds, y_range, size_range) for each layer, furthest first.
+        """
+        self.layers: List[CloudLayer] = [
+            CloudLayer(speed, clouds, y_range, size_range, rng)
+            for speed, clouds, y_range, size_range in (layers if layers is not None else self.DEFAULT_LAYERS)
+        ]
+
+    def update(self) -> None:
+        """Scroll every layer."""
+        for layer in self.layers:
+            layer.update()
+
+    def rects(self) -> List[pygame.Rect]:
+        """
+        Get the screen areas the layers draw on.
+
+        Returns:
+            List[pygame.Rect]: One rect per layer.
+        """
+        return [layer.rect for layer in self.layers]
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw every layer.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+        """
+        for layer in self.layers:
+            layer.draw(screen)
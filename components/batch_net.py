@@ -0,0 +1,258 @@
+from collections import OrderedDict
+import numpy as np
+import neat
+from neat.graphs import feed_forward_layers
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Vectorized versions of neat's built-in activation functions
+NUMPY_ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'relu': lambda z: np.where(z > 0.0, z, 0.0),
+    'identity': lambda z: z,
+    'clamped': lambda z: np.clip(z, -1.0, 1.0),
+    'sigmoid': lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    'tanh': lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    'abs': np.abs,
+    'square': np.square,
+}
+
+
+# Number of recent row selections whose compacted arrays are kept, so a repeating pattern such as
+# the birds due under a decision interval does not gather the weights again on every call
+SELECTION_CACHE_SIZE: int = 4
+
+
+class NetworkGroup:
+    """
+    Networks with the same number of node slots, stacked in one array per parameter.
+
+    Every genome gets the same node slot layout: the inputs first, then the outputs, then its hidden
+    nodes in evaluation order. Nodes are evaluated layer by layer for all networks of the group at once.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, response: np.ndarray, depth: np.ndarray,
+                 activation: np.ndarray) -> None:
+        """
+        Initialize the NetworkGroup.
+
+        Args:
+            weights (np.ndarray): Connection weights, shaped (networks, nodes, nodes) as [network, to, from].
+            bias (np.ndarray): Node biases, shaped (networks, nodes).
+            response (np.ndarray): Node responses, shaped (networks, nodes).
+            depth (np.ndarray): The layer each node is evaluated in, 0 for inputs and unused slots.
+            activation (np.ndarray): Index into the activation functions for each node.
+        """
+        self.weights: np.ndarray = weights
+        self.bias: np.ndarray = bias
+        self.response: np.ndarray = response
+        self.depth: np.ndarray = depth
+        self.activation: np.ndarray = activation
+
+    def __len__(self) -> int:
+        """Return the number of networks."""
+        return self.weights.shape[0]
+
+    def take(self, rows: np.ndarray) -> 'NetworkGroup':
+        """
+        Copy some networks into a compact group.
+
+        Args:
+            rows (np.ndarray): The networks to keep, by index in this group.
+
+        Returns:
+            NetworkGroup: The selected networks, in the order of rows.
+        """
+        return NetworkGroup(self.weights[rows], self.bias[rows], self.response[rows], self.depth[rows],
+                            self.activation[rows])
+
+    def activate(self, inputs: np.ndarray, num_inputs: int, num_outputs: int,
+                 activation_functions: List[Callable[[np.ndarray], np.ndarray]]) -> np.ndarray:
+        """
+        Evaluate every network of the group.
+
+        Args:
+            inputs (np.ndarray): One row of inputs per network, shaped (len(self), num_inputs).
+            num_inputs (int): The number of network inputs.
+            num_outputs (int): The number of network outputs.
+            activation_functions (List[Callable]): The vectorized activation functions in use.
+
+        Returns:
+            np.ndarray: The network outputs, shaped (len(self), num_outputs).
+        """
+        depth, activation = self.depth, self.activation
+        values = np.zeros(self.bias.shape)
+        values[:, :num_inputs] = inputs
+        for d in range(1, int(depth.max(initial=0)) + 1):
+            layer = depth == d
+            if not layer.any():
+                continue
+            totals = self.bias + self.response * np.matmul(self.weights, values[:, :, None])[:, :, 0]
+            for a, function in enumerate(activation_functions):
+                nodes = layer & (activation == a) if len(activation_functions) > 1 else layer
+                if nodes.any():
+                    values[nodes] = function(totals[nodes])
+        return values[:, num_inputs:num_inputs + num_outputs]
+
+
+class BatchNetwork:
+    """
+    All feed-forward networks of a generation, compiled so that one call evaluates many of them.
+
+    Genomes are grouped by their number of node slots and each group is padded only to its own size,
+    so one large genome does not make every network of the generation as expensive as itself. A single
+    call to activate() produces the outputs of any set of networks from one input matrix. When only
+    some networks are evaluated, for example because birds have died, their arrays are compacted once
+    and reused for as long as the same networks are asked for. Only the 'sum' aggregation is
+    supported, which is the only one allowed by config-feedforward.txt.
+    """
+
+    def __init__(self, groups: List[NetworkGroup], group_of: np.ndarray, index_in_group: np.ndarray,
+                 activation_functions: List[Callable[[np.ndarray], np.ndarray]],
+                 num_inputs: int, num_outputs: int) -> None:
+        """
+        Initialize the BatchNetwork. Use BatchNetwork.create to build one from genomes.
+
+        Args:
+            groups (List[NetworkGroup]): The networks, grouped by number of node slots.
+            group_of (np.ndarray): The group of each network.
+            index_in_group (np.ndarray): The index of each network in its group.
+            activation_functions (List[Callable]): The vectorized activation functions in use.
+            num_inputs (int): The number of network inputs.
+            num_outputs (int): The number of network outputs.
+        """
+        self.groups: List[NetworkGroup] = groups
+        self.group_of: np.ndarray = group_of
+        self.index_in_group: np.ndarray = index_in_group
+        self.activation_functions: List[Callable[[np.ndarray], np.ndarray]] = activation_functions
+        self.num_inputs: int = num_inputs
+        self.num_outputs: int = num_outputs
+        self._selections: 'OrderedDict[bytes, List[Tuple[np.ndarray, NetworkGroup]]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of networks."""
+        return len(self.group_of)
+
+    @staticmethod
+    def create(genomes: Sequence[neat.DefaultGenome], config: neat.Config) -> 'BatchNetwork':
+        """
+        Compile genomes into a BatchNetwork, using the same layering as FeedForwardNetwork.create.
+
+        Args:
+            genomes (Sequence[neat.DefaultGenome]): The genomes to compile, in bird order.
+            config (neat.Config): The NEAT configuration.
+
+        Returns:
+            BatchNetwork: The compiled networks.
+        """
+        genome_config = config.genome_config
+        input_keys: List[int] = list(genome_config.input_keys)
+        output_keys: List[int] = list(genome_config.output_keys)
+        num_io = len(input_keys) + len(output_keys)
+
+        # Work out each genome's evaluation layers first so the size of every group is known
+        plans = []
+        for genome in genomes:
+            connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+            layers = feed_forward_layers(input_keys, output_keys, connections)
+            plans.append((connections, layers))
+        sizes = np.array([num_io + sum(len(layer) for layer in layers) for _, layers in plans], dtype=np.int64)
+        group_sizes = sorted(set(sizes.tolist()))
+        group_of = np.searchsorted(group_sizes, sizes).astype(np.int64)
+        index_in_group = np.zeros(len(genomes), dtype=np.int64)
+        arrays = []
+        for k, num_nodes in enumerate(group_sizes):
+            members = np.flatnonzero(group_of == k)
+            index_in_group[members] = np.arange(len(members))
+            count = len(members)
+            arrays.append((np.zeros((count, num_nodes, num_nodes)), np.zeros((count, num_nodes)),
+                           np.zeros((count, num_nodes)), np.zeros((count, num_nodes), dtype=np.int64),
+                           np.zeros((count, num_nodes), dtype=np.int64)))
+        activation_names: List[str] = []
+
+        for i, (genome, (connections, layers)) in enumerate(zip(genomes, plans)):
+            weights, bias, response, depth, activation = arrays[group_of[i]]
+            g = index_in_group[i]
+            slots: Dict[int, int] = {key: slot for slot, key in enumerate(input_keys + output_keys)}
+            for layer in layers:
+                for node in layer:
+                    if node not in slots:
+                        slots[node] = len(slots)
+
+            for d, layer in enumerate(layers, start=1):
+                for node in layer:
+                    ng = genome.nodes[node]
+                    if ng.aggregation != 'sum':
+                        raise ValueError(f"BatchNetwork only supports 'sum' aggregation, got '{ng.aggregation}'")
+                    if ng.activation not in activation_names:
+                        activation_names.append(ng.activation)
+                    slot = slots[node]
+                    bias[g, slot] = ng.bias
+                    response[g, slot] = ng.response
+                    depth[g, slot] = d
+                    activation[g, slot] = activation_names.index(ng.activation)
+
+            for inode, onode in connections:
+                if onode in slots and inode in slots and depth[g, slots[onode]] > 0:
+                    weights[g, slots[onode], slots[inode]] += genome.connections[(inode, onode)].weight
+
+        activation_functions = []
+        for name in activation_names:
+            function = NUMPY_ACTIVATIONS.get(name)
+            if function is None:
+                # Fall back to neat's scalar implementation for less common activations
+                function = np.vectorize(genome_config.activation_defs.get(name), otypes=[np.float64])
+            activation_functions.append(function)
+
+        return BatchNetwork([NetworkGroup(*group) for group in arrays], group_of, index_in_group,
+                            activation_functions, len(input_keys), len(output_keys))
+
+    def _select(self, rows: np.ndarray) -> List[Tuple[np.ndarray, NetworkGroup]]:
+        """
+        Split requested networks by group, compacting a group only if some of its networks are left out.
+
+        Args:
+            rows (np.ndarray): The requested networks.
+
+        Returns:
+            List[Tuple[np.ndarray, NetworkGroup]]: For each group in use, the positions of its networks
+            in rows and the group holding exactly those networks, in that order.
+        """
+        key = rows.tobytes()
+        selection = self._selections.get(key)
+        if selection is not None:
+            self._selections.move_to_end(key)
+            return selection
+
+        selection = []
+        groups_of_rows = self.group_of[rows]
+        for k, group in enumerate(self.groups):
+            positions = np.flatnonzero(groups_of_rows == k) if len(self.groups) > 1 else np.arange(len(rows))
+            if not len(positions):
+                continue
+            local = self.index_in_group[rows[positions]]
+            whole = len(local) == len(group) and np.array_equal(local, np.arange(len(group)))
+            selection.append((positions, group if whole else group.take(local)))
+        self._selections[key] = selection
+        if len(self._selections) > SELECTION_CACHE_SIZE:
+            self._selections.popitem(last=False)
+        return selection
+
+    def activate(self, inputs: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate many networks at once.
+
+        Args:
+            inputs (np.ndarray): One row of inputs per evaluated network, shaped (len(rows), num_inputs).
+            rows (Optional[np.ndarray]): Which networks the input rows belong to. Defaults to all networks.
+
+        Returns:
+            np.ndarray: The network outputs, shaped (len(rows), num_outputs).
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        selection = self._select(rows)
+        if len(selection) == 1 and len(selection[0][0]) == len(rows):
+            return selection[0][1].activate(inputs, self.num_inputs, self.num_outputs, self.activation_functions)
+        outputs = np.empty((len(rows), self.num_outputs))
+        for positions, group in selection:
+            outputs[positions] = group.activate(inputs[positions], self.num_inputs, self.num_outputs,
+                                                self.activation_functions)
+        return outputs
@@ -1,5 +1,6 @@
 import pygame
 import random
+from components.assets import assets
 from typing import Tuple
 
 # Game variables
@@ -11,12 +12,17 @@ SCREEN_WIDTH: int = 800
 class Bird(pygame.sprite.Sprite):
     """Class to represent the Bird character in the game."""
 
-    def __init__(self) -> None:
-        """Initialize the Bird."""
+    def __init__(self, rng: random.Random = random) -> None:
+        """
+        Initialize the Bird.
+
+        Args:
+            rng (random.Random): The random number generator that picks the bird's color.
+        """
         super().__init__()
         
         # Generate a random dark color for the bird
-        self.color: Tuple[int, int, int] = (random.randint(0, 100), random.randint(0, 100), random.randint(0, 100))
+        self.color: Tuple[int, int, int] = (rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100))
         
         self.image: pygame.Surface = pygame.Surface((30, 30), pygame.SRCALPHA)
         self.image.fill(self.color)
@@ -48,7 +54,7 @@ class Bird(pygame.sprite.Sprite):
 
         # Rotate the bird
         self.angle = min(max(self.velocity * -5, -90), 90)
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
+        self.image = assets.bird_frame(self.original_image, self.color, self.angle)
         self.rect = self.image.get_rect(center=self.rect.center)
 
         # Update hitbox position
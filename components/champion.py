@@ -0,0 +1,260 @@
+import json
+import keyword
+import math
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import neat
+
+# The exported network is plain JSON, so loading it needs neither pickle nor neat
+FORMAT: str = 'flappy-bird-champion'
+VERSION: int = 1
+JUMP_THRESHOLD: float = 0.5  # A bird jumps when the network output is above this, as in Simulation.step
+
+# The activation functions of neat.activations, written out so compiled networks give the same results
+ACTIVATION_SOURCES: Dict[str, str] = {
+    'sigmoid': "def sigmoid(z):\n    z = max(-60.0, min(60.0, 5.0 * z))\n    return 1.0 / (1.0 + math.exp(-z))\n",
+    'tanh': "def tanh(z):\n    z = max(-60.0, min(60.0, 2.5 * z))\n    return math.tanh(z)\n",
+    'sin': "def sin(z):\n    z = max(-60.0, min(60.0, 5.0 * z))\n    return math.sin(z)\n",
+    'gauss': "def gauss(z):\n    z = max(-3.4, min(3.4, z))\n    return math.exp(-5.0 * z**2)\n",
+    'relu': "def relu(z):\n    return z if z > 0.0 else 0.0\n",
+    'softplus': "def softplus(z):\n    z = max(-60.0, min(60.0, 5.0 * z))\n    return 0.2 * math.log(1 + math.exp(z))\n",
+    'identity': "def identity(z):\n    return z\n",
+    'clamped': "def clamped(z):\n    return max(-1.0, min(1.0, z))\n",
+    'log': "def log(z):\n    z = max(1e-7, z)\n    return math.log(z)\n",
+    'exp': "def exp(z):\n    z = max(-60.0, min(60.0, z))\n    return math.exp(z)\n",
+    'abs': "def abs_(z):\n    return abs(z)\n",
+    'hat': "def hat(z):\n    return max(0.0, 1 - abs(z))\n",
+    'square': "def square(z):\n    return z ** 2\n",
+    'cube': "def cube(z):\n    return z ** 3\n",
+}
+
+
+def export_champion(genome: 'neat.DefaultGenome', config: 'neat.Config') -> Dict[str, object]:
+    """
+    Flatten a genome's feed-forward network into an evaluation order with only the connections that matter.
+
+    Disabled connections, nodes that do not lead to an output and nodes that cannot be reached from
+    the inputs are left out, exactly as neat.nn.FeedForwardNetwork.create leaves them out. Values are
+    numbered in evaluation order: the inputs first, then each node after the values it reads.
+
+    Args:
+        genome (neat.DefaultGenome): The genome, for example the winner of a run.
+        config (neat.Config): The NEAT configuration the genome was trained with.
+
+    Returns:
+        Dict[str, object]: The exported network, ready to be written as JSON.
+
+    Raises:
+        ValueError: If a node uses an aggregation other than 'sum' or an unknown activation.
+    """
+    # Only exporting needs neat; loading and evaluating the result does not
+    from neat.graphs import feed_forward_layers
+
+    input_keys: List[int] = list(config.genome_config.input_keys)
+    output_keys: List[int] = list(config.genome_config.output_keys)
+    connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+    layers = feed_forward_layers(input_keys, output_keys, connections)
+
+    slots: Dict[int, int] = {key: slot for slot, key in enumerate(input_keys)}
+    nodes: List[Dict[str, object]] = []
+    for layer in layers:
+        for node in sorted(layer):
+            ng = genome.nodes[node]
+            if ng.aggregation != 'sum':
+                raise ValueError(f"Only 'sum' aggregation can be exported, got '{ng.aggregation}'")
+            if ng.activation not in ACTIVATION_SOURCES:
+                raise ValueError(f"Unknown activation '{ng.activation}'")
+            # Keep the connection order of FeedForwardNetwork, since it decides the order of the sum
+            links = [[slots[inode], genome.connections[(inode, onode)].weight]
+                     for inode, onode in connections if onode == node]
+            nodes.append({'key': node, 'activation': ng.activation, 'bias': ng.bias, 'response': ng.response,
+                          'links': links})
+            slots[node] = len(slots)
+
+    return {
+        'format': FORMAT,
+        'version': VERSION,
+        'genome': genome.key,
+        'fitness': genome.fitness,
+        'num_inputs': len(input_keys),
+        'nodes': nodes,
+        'outputs': [slots.get(key) for key in output_keys],  # None for outputs no node leads to
+    }
+
+
+def save_champion(genome: 'neat.DefaultGenome', config: 'neat.Config', path: str) -> Dict[str, object]:
+    """
+    Export a genome and write it as JSON.
+
+    Args:
+        genome (neat.DefaultGenome): The genome.
+        config (neat.Config): The NEAT configuration the genome was trained with.
+        path (str): The file to write.
+
+    Returns:
+        Dict[str, object]: The exported network.
+    """
+    data = export_champion(genome, config)
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    return data
+
+
+def _is_int(value: object) -> bool:
+    """Return True for an int that is not a bool."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value: object) -> bool:
+    """Return True for a finite int or float that is not a bool, which repr writes as a Python literal."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def validate_champion(data: Dict[str, object]) -> None:
+    """
+    Check that an exported network is well formed before source code is generated from it.
+
+    Every value that ends up in the generated source is checked, so a damaged or hand-edited file
+    is rejected with a clear message instead of failing while compiling or running.
+
+    Args:
+        data (Dict[str, object]): The exported network.
+
+    Raises:
+        ValueError: If num_inputs is not a non-negative int, a node is malformed, uses an unknown
+            activation or reads a value that is not computed before it, a weight, bias or response is
+            not a finite number, or an output is neither None nor the slot of a value.
+    """
+    num_inputs = data.get('num_inputs')
+    if not _is_int(num_inputs) or num_inputs < 0:
+        raise ValueError(f"num_inputs must be a non-negative int, got {num_inputs!r}")
+    nodes = data.get('nodes')
+    if not isinstance(nodes, list):
+        raise ValueError("nodes must be a list")
+    for slot, node in enumerate(nodes, start=num_inputs):
+        if not isinstance(node, dict):
+            raise ValueError(f"Node {slot} must be an object")
+        activation = node.get('activation')
+        if not isinstance(activation, str) or activation not in ACTIVATION_SOURCES:
+            raise ValueError(f"Node {slot} has unknown activation {activation!r}")
+        for field in ('bias', 'response'):
+            if not _is_number(node.get(field)):
+                raise ValueError(f"Node {slot} {field} must be a finite number, got {node.get(field)!r}")
+        links = node.get('links')
+        if not isinstance(links, list):
+            raise ValueError(f"Node {slot} links must be a list")
+        for link in links:
+            if not isinstance(link, list) or len(link) != 2:
+                raise ValueError(f"Node {slot} has a malformed link {link!r}")
+            source, weight = link
+            # Values are numbered in evaluation order, so a node can only read the values before it
+            if not _is_int(source) or not 0 <= source < slot:
+                raise ValueError(f"Node {slot} reads from invalid slot {source!r}")
+            if not _is_number(weight):
+                raise ValueError(f"Node {slot} has a weight that is not a finite number: {weight!r}")
+    outputs = data.get('outputs')
+    if not isinstance(outputs, list) or not outputs:
+        raise ValueError("outputs must be a non-empty list")
+    for output in outputs:
+        if output is not None and (not _is_int(output) or not 0 <= output < num_inputs + len(nodes)):
+            raise ValueError(f"Invalid output slot {output!r}")
+
+
+def champion_source(data: Dict[str, object], name: str = 'activate') -> str:
+    """
+    Generate a straight-line Python function that evaluates an exported network.
+
+    The function takes a sequence of inputs and returns the list of outputs. Weights are written
+    with repr, which round-trips floats exactly, and every sum adds its terms in the same order as
+    neat, so the results are bit-for-bit the same as neat.nn.FeedForwardNetwork.activate.
+
+    Args:
+        data (Dict[str, object]): The exported network.
+        name (str): The name of the generated function.
+
+    Returns:
+        str: Python source that only needs the math module.
+
+    Raises:
+        ValueError: If the name is not a valid function name or the data fails validate_champion.
+    """
+    if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name):
+        raise ValueError(f"Invalid function name {name!r}")
+    validate_champion(data)
+    num_inputs: int = data['num_inputs']
+    used = sorted({node['activation'] for node in data['nodes']})
+    function_names = {activation: ACTIVATION_SOURCES[activation].split('(')[0][4:] for activation in used}
+
+    lines: List[str] = ["import math", ""]
+    for activation in used:
+        lines.append(ACTIVATION_SOURCES[activation])
+    lines.append(f"def {name}(inputs):")
+    lines.append(f"    if len(inputs) != {num_inputs}:")
+    lines.append(f"        raise ValueError(f\"Expected {num_inputs} inputs, got {{len(inputs)}}\")")
+    if num_inputs:
+        lines.append(f"    {', '.join(f'v{slot}' for slot in range(num_inputs))}, = inputs")
+    for slot, node in enumerate(data['nodes'], start=num_inputs):
+        # sum() starts from 0, which only matters for the sign of a zero, but keeps the results bit-for-bit equal
+        terms = " + ".join(["0"] + [f"v{source} * {weight!r}" for source, weight in node['links']])
+        lines.append(f"    v{slot} = {function_names[node['activation']]}"
+                     f"({node['bias']!r} + {node['response']!r} * ({terms}))")
+    outputs = ", ".join("0.0" if slot is None else f"v{slot}" for slot in data['outputs'])
+    lines.append(f"    return [{outputs}]")
+    return "\n".join(lines) + "\n"
+
+
+class Champion:
+    """
+    A loaded champion network, compiled into a single Python function.
+
+    Loading parses a small JSON file and compiles a few lines of Python, which takes well under a
+    millisecond, and a decision is one call of the compiled function.
+    """
+
+    def __init__(self, data: Dict[str, object]) -> None:
+        """
+        Initialize the Champion.
+
+        Args:
+            data (Dict[str, object]): The exported network.
+
+        Raises:
+            ValueError: If the data is not a supported champion export or is malformed.
+        """
+        if not isinstance(data, dict) or data.get('format') != FORMAT or data.get('version') != VERSION:
+            raise ValueError(f"Not a version {VERSION} champion export")
+        self.data: Dict[str, object] = data
+        self.source: str = champion_source(data)
+        self.genome: Optional[int] = data.get('genome')
+        self.fitness: Optional[float] = data.get('fitness')
+        self.num_inputs: int = data['num_inputs']
+        namespace: Dict[str, object] = {'math': math}
+        exec(compile(self.source, f"<champion {self.genome}>", 'exec'), namespace)
+        self.activate: Callable[[Sequence[float]], List[float]] = namespace['activate']
+
+    def decide(self, inputs: Sequence[float]) -> bool:
+        """
+        Decide whether the bird jumps.
+
+        Args:
+            inputs (Sequence[float]): The network inputs, as built by Simulation.observe.
+
+        Returns:
+            bool: True if the bird should jump.
+        """
+        return self.activate(inputs)[0] > JUMP_THRESHOLD
+
+
+def load_champion(path: str) -> Champion:
+    """
+    Load an exported champion.
+
+    Args:
+        path (str): The JSON file written by save_champion.
+
+    Returns:
+        Champion: The compiled network.
+    """
+    with open(path) as f:
+        return Champion(json.load(f))
@@ -0,0 +1,260 @@
+import glob
+import gzip
+import os
+import pickle
+import random
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from typing import Dict, List, Optional
+import neat
+from components.simulation import EpisodeBudget
+
+# Checkpoint files are named after the generation they resume at
+CHECKPOINT_PATTERN: str = "checkpoint-{generation}.pkl.gz"
+BEST_GENOME_FILE: str = "best-genome.pkl"
+
+
+def checkpoint_generation(path: str) -> int:
+    """
+    Get the generation a checkpoint file resumes at from its name.
+
+    Args:
+        path (str): Path to a checkpoint file.
+
+    Returns:
+        int: The generation, or -1 if the name is not a checkpoint name.
+    """
+    match = re.fullmatch(r"checkpoint-(\d+)\.pkl\.gz", os.path.basename(path))
+    return int(match.group(1)) if match else -1
+
+
+def list_checkpoints(directory: str) -> List[str]:
+    """
+    List the checkpoint files in a directory.
+
+    Args:
+        directory (str): The checkpoint directory.
+
+    Returns:
+        List[str]: Paths of the checkpoints, oldest generation first.
+    """
+    paths = [path for path in glob.glob(os.path.join(directory, "checkpoint-*.pkl.gz"))
+             if checkpoint_generation(path) >= 0]
+    return sorted(paths, key=checkpoint_generation)
+
+
+def latest_checkpoint(directory: str) -> Optional[str]:
+    """
+    Find the newest checkpoint in a directory.
+
+    Args:
+        directory (str): The checkpoint directory.
+
+    Returns:
+        Optional[str]: Path of the checkpoint with the highest generation, or None if there is none.
+    """
+    paths = list_checkpoints(directory)
+    return paths[-1] if paths else None
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file so that readers see either the old or the new contents, never a partial file.
+
+    Args:
+        path (str): The file to write.
+        data (bytes): The new contents.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class Checkpointer(neat.reporting.BaseReporter):
+    """
+    A NEAT reporter that periodically saves the run so it can be resumed after a crash or preemption.
+
+    A checkpoint is written at the end of a generation once either interval has passed. The state is
+    pickled on the training thread, which takes a few milliseconds, while compressing and writing it
+    happen on a background thread so the next generation starts right away. Files are replaced
+    atomically, only the newest few checkpoints are kept, and the best genome so far is saved next to
+    them as a plain pickle like winner.pkl. The background thread never prints; a finished checkpoint
+    is announced on the training thread when the next generation starts, unless quiet.
+
+    Unlike neat.Checkpointer, the checkpoint resumes at the generation that follows the saved one and
+    keeps the genome and species counters, so resumed runs do not reuse genome keys.
+    """
+
+    def __init__(self, directory: str = "checkpoints", generation_interval: Optional[int] = 5,
+                 time_interval: Optional[float] = 300.0, keep: int = 3, compress_level: int = 5,
+                 budget: Optional[EpisodeBudget] = None, quiet: bool = False) -> None:
+        """
+        Initialize the Checkpointer.
+
+        Args:
+            directory (str): The directory the checkpoints are written to.
+            generation_interval (Optional[int]): Save at least every this many generations. None disables it.
+            time_interval (Optional[float]): Save at least every this many seconds. None disables it.
+            keep (int): The number of checkpoints to keep; older ones are deleted.
+            compress_level (int): The gzip compression level.
+            budget (Optional[EpisodeBudget]): The episode budget, whose frame limit is saved so a run whose
+                limit grows with a Curriculum resumes at the limit it reached.
+            quiet (bool): Do not announce saved checkpoints.
+        """
+        self.directory: str = directory
+        self.generation_interval: Optional[int] = generation_interval
+        self.time_interval: Optional[float] = time_interval
+        self.keep: int = max(1, keep)
+        self.compress_level: int = compress_level
+        self.budget: Optional[EpisodeBudget] = budget
+        self.quiet: bool = quiet
+        self.generation: int = 0
+        self.last_generation: Optional[int] = None
+        self.last_time: float = time.time()
+        self.best_genome: Optional[neat.DefaultGenome] = None
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Optional[Future] = None
+
+    def start_generation(self, generation: int) -> None:
+        """Remember the generation being evaluated and announce a checkpoint written since the last one."""
+        self._collect(block=False)
+        self.generation = generation
+        if self.last_generation is None:
+            self.last_generation = generation - 1
+
+    def post_evaluate(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                      species: neat.DefaultSpeciesSet, best_genome: neat.DefaultGenome) -> None:
+        """Keep track of the best genome of the run."""
+        if self.best_genome is None or best_genome.fitness > self.best_genome.fitness:
+            self.best_genome = best_genome
+
+    def end_generation(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                       species_set: neat.DefaultSpeciesSet) -> None:
+        """Save a checkpoint if one of the intervals has passed."""
+        due = (
+            (self.generation_interval is not None
+             and self.generation - self.last_generation >= self.generation_interval)
+            or (self.time_interval is not None and time.time() - self.last_time >= self.time_interval)
+        )
+        if due:
+            self.save(population, species_set, self.generation + 1)
+
+    def save(self, population: Dict[int, neat.DefaultGenome], species_set: neat.DefaultSpeciesSet,
+             generation: int) -> None:
+        """
+        Save a checkpoint of the population that is about to be evaluated.
+
+        Args:
+            population (Dict[int, neat.DefaultGenome]): The genomes of the next generation.
+            species_set (neat.DefaultSpeciesSet): The species of the next generation.
+            generation (int): The generation the checkpoint resumes at.
+        """
+        # Peek at the species counter without changing the ids the run will hand out
+        next_species_id = next(species_set.indexer)
+        species_set.indexer = count(next_species_id)
+
+        state = {
+            'generation': generation,
+            'population': population,
+            'species': species_set.species,
+            'genome_to_species': species_set.genome_to_species,
+            'next_species_id': next_species_id,
+            'next_genome_id': max(population) + 1,
+            'best_genome': self.best_genome,
+            'random_state': random.getstate(),
+            'max_frames': self.budget.max_frames if self.budget is not None else None,
+        }
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        best = pickle.dumps(self.best_genome) if self.best_genome is not None else None
+
+        # Let a slow disk delay at most one checkpoint instead of piling them up
+        self.wait()
+        self._pending = self._executor.submit(self._write, data, best, generation)
+        self.last_generation = generation - 1
+        self.last_time = time.time()
+
+    def _write(self, data: bytes, best: Optional[bytes], generation: int) -> str:
+        """
+        Compress and write a checkpoint, then delete the oldest ones. Runs on the background thread.
+
+        Args:
+            data (bytes): The pickled state.
+            best (Optional[bytes]): The pickled best genome.
+            generation (int): The generation the checkpoint resumes at.
+
+        Returns:
+            str: The path of the checkpoint.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CHECKPOINT_PATTERN.format(generation=generation))
+        write_atomic(path, gzip.compress(data, compresslevel=self.compress_level))
+        if best is not None:
+            write_atomic(os.path.join(self.directory, BEST_GENOME_FILE), best)
+        for old in list_checkpoints(self.directory)[:-self.keep]:
+            os.remove(old)
+        return path
+
+    def _collect(self, block: bool) -> None:
+        """
+        Announce the checkpoint being written once it is on disk, on the calling thread.
+
+        Args:
+            block (bool): Wait for the checkpoint instead of leaving it pending if it is not written yet.
+        """
+        if self._pending is None or not (block or self._pending.done()):
+            return
+        path = self._pending.result()
+        self._pending = None
+        if not self.quiet:
+            print(f"Saved checkpoint {path}")
+
+    def wait(self) -> None:
+        """Wait until the checkpoint being written, if any, is on disk."""
+        self._collect(block=True)
+
+    def close(self) -> None:
+        """Finish writing and stop the background thread."""
+        self.wait()
+        self._executor.shutdown()
+
+
+def restore_checkpoint(path: str, config: neat.Config, budget: Optional[EpisodeBudget] = None) -> neat.Population:
+    """
+    Create a population from a checkpoint, continuing the run where it was saved.
+
+    The population uses the given configuration, so a run can be resumed with changed settings.
+    Add reporters, including a new Checkpointer, after restoring.
+
+    Args:
+        path (str): Path to the checkpoint file.
+        config (neat.Config): The NEAT configuration.
+        budget (Optional[EpisodeBudget]): If given, its frame limit is set to the one the saved run had
+            reached, for runs whose limit grows with a Curriculum. Checkpoints from before the limit was
+            saved leave it unchanged.
+
+    Returns:
+        neat.Population: The restored population. Its best_genome is the best genome of the saved run.
+    """
+    with gzip.open(path, 'rb') as f:
+        state = pickle.load(f)
+
+    population = neat.Population(config, initial_state=(
+        state['population'],
+        config.species_set_type(config.species_set_config, None),
+        state['generation']
+    ))
+    population.species.reporters = population.reporters
+    population.species.species = state['species']
+    population.species.genome_to_species = state['genome_to_species']
+    population.species.indexer = count(state['next_species_id'])
+    population.reproduction.genome_indexer = count(state['next_genome_id'])
+    population.best_genome = state['best_genome']
+    random.setstate(state['random_state'])
+    if budget is not None and state.get('max_frames') is not None:
+        budget.max_frames = state['max_frames']
+    return population
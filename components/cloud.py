@@ -10,19 +10,25 @@ WHITE: Tuple[int, int, int] = (255, 255, 255)
 class Cloud:
     """Class to represent a cloud in the sky."""
 
-    def __init__(self) -> None:
-        """Initialize the Cloud."""
-        self.x: int = random.randint(0, SCREEN_WIDTH * 2)  # Scattered across twice the screen width
-        self.y: int = random.randint(50, 200)
+    def __init__(self, rng: random.Random = random) -> None:
+        """
+        Initialize the Cloud.
+
+        Args:
+            rng (random.Random): The random number generator that places the cloud.
+        """
+        self.rng: random.Random = rng
+        self.x: int = rng.randint(0, SCREEN_WIDTH * 2)  # Scattered across twice the screen width
+        self.y: int = rng.randint(50, 200)
         self.speed: int = CLOUD_SPEED
-        self.size: int = random.randint(20, 40)  # Random size for variety
+        self.size: int = rng.randint(20, 40)  # Random size for variety
 
     def update(self) -> None:
         """Update the Cloud's position."""
         self.x += self.speed
         if self.x < -self.size * 2:
-            self.x = random.randint(SCREEN_WIDTH, SCREEN_WIDTH * 2)
-            self.y = random.randint(50, 200)
+            self.x = self.rng.randint(SCREEN_WIDTH, SCREEN_WIDTH * 2)
+            self.y = self.rng.randint(50, 200)
 
     def draw(self, screen: pygame.Surface) -> None:
         """Draw the Cloud."""
@@ -0,0 +1,47 @@
+from typing import Optional, Sequence
+from components.simulation import EpisodeBudget
+
+
+class Curriculum:
+    """
+    Grows the frame limit of the episodes as the population improves.
+
+    Early generations are cut short, which is cheap and enough to separate genomes that crash into the
+    first pipes. Once enough genomes fly until the limit, they can no longer be told apart by it, so
+    the limit is raised and the next generations are ranked on longer flights.
+    """
+
+    def __init__(self, budget: EpisodeBudget, start_frames: int = 1000, growth: float = 2.0,
+                 limit: Optional[int] = None, promote_fraction: float = 0.1) -> None:
+        """
+        Initialize the Curriculum and set the budget's starting frame limit.
+
+        Args:
+            budget (EpisodeBudget): The budget whose frame limit is managed.
+            start_frames (int): The frame limit of the first generation.
+            growth (float): The factor the limit grows by.
+            limit (Optional[int]): The largest frame limit. Defaults to growing without bound.
+            promote_fraction (float): The fraction of genomes that must fly until the limit for it to grow.
+        """
+        self.budget: EpisodeBudget = budget
+        self.growth: float = growth
+        self.limit: Optional[int] = limit
+        self.promote_fraction: float = promote_fraction
+        budget.max_frames = start_frames if limit is None else min(start_frames, limit)
+
+    def update(self, frames: Sequence[int]) -> None:
+        """
+        Raise the frame limit if enough genomes of the evaluated generation reached it.
+
+        Args:
+            frames (Sequence[int]): The frames each genome flew in the generation.
+        """
+        max_frames = self.budget.max_frames
+        if not frames or (self.limit is not None and max_frames >= self.limit):
+            return
+        reached = sum(1 for flown in frames if flown >= max_frames)
+        if reached >= self.promote_fraction * len(frames):
+            grown = max(max_frames + 1, int(max_frames * self.growth))
+            self.budget.max_frames = grown if self.limit is None else min(grown, self.limit)
+            print(f"Curriculum: {reached} of {len(frames)} genomes flew {max_frames} frames, "
+                  f"episodes now last up to {self.budget.max_frames} frames")
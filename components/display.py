@@ -0,0 +1,64 @@
+import pygame
+from typing import Dict, Optional, Tuple
+
+
+class Display:
+    """
+    The game window, frame clock and fonts, each created the first time it is used.
+
+    Creating a Display does nothing, so importing the game, training headless or starting a worker
+    process never initializes pygame or opens a window, and works on machines without a display.
+    """
+
+    def __init__(self, size: Tuple[int, int], caption: str) -> None:
+        """
+        Initialize the Display.
+
+        Args:
+            size (Tuple[int, int]): The window width and height in pixels.
+            caption (str): The window title.
+        """
+        self.size: Tuple[int, int] = size
+        self.caption: str = caption
+        self._screen: Optional[pygame.Surface] = None
+        self._clock: Optional[pygame.time.Clock] = None
+        self._fonts: Dict[int, pygame.font.Font] = {}
+
+    @property
+    def opened(self) -> bool:
+        """bool: True once the window has been created."""
+        return self._screen is not None
+
+    @property
+    def screen(self) -> pygame.Surface:
+        """pygame.Surface: The window surface, initializing pygame and opening the window on first use."""
+        if self._screen is None:
+            pygame.init()
+            self._screen = pygame.display.set_mode(self.size)
+            pygame.display.set_caption(self.caption)
+        return self._screen
+
+    @property
+    def clock(self) -> pygame.time.Clock:
+        """pygame.time.Clock: The clock that limits the frame rate."""
+        if self._clock is None:
+            self._clock = pygame.time.Clock()
+        return self._clock
+
+    def font(self, size: int) -> pygame.font.Font:
+        """
+        Get the default font at a size, loading it on first use.
+
+        Args:
+            size (int): The font size.
+
+        Returns:
+            pygame.font.Font: The font. It is shared by every caller asking for this size.
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
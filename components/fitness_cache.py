@@ -0,0 +1,123 @@
+import hashlib
+from collections import OrderedDict
+import neat
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# The fitness, final score and frames flown of one evaluated genome
+Result = Tuple[float, int, int]
+
+
+def genome_key(genome: neat.DefaultGenome, course: Hashable) -> bytes:
+    """
+    Compute a canonical hash of everything that decides how a genome plays on a given course.
+
+    Two genomes with the same enabled connections, weights, node biases, responses, activations and
+    aggregations behave identically, so they share a key even if their genome IDs differ.
+
+    Args:
+        genome (neat.DefaultGenome): The genome to hash.
+        course (Hashable): The seed of the course the genome is evaluated on, together with anything
+            else that changes the result, such as the frame limit.
+
+    Returns:
+        bytes: The cache key.
+    """
+    nodes = sorted(
+        (key, ng.bias, ng.response, ng.activation, ng.aggregation) for key, ng in genome.nodes.items()
+    )
+    connections = sorted((key, cg.weight) for key, cg in genome.connections.items() if cg.enabled)
+    return hashlib.sha1(repr((course, nodes, connections)).encode()).digest()
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of evaluation results keyed by genome content and course.
+
+    Elites carried over unchanged by the reproduction step and offspring that are exact duplicates
+    of another genome are looked up instead of being simulated again.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """
+        Initialize the FitnessCache.
+
+        Args:
+            max_size (int): The maximum number of results to keep.
+        """
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._results: 'OrderedDict[bytes, Result]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._results)
+
+    def get(self, key: bytes) -> Optional[Result]:
+        """
+        Look up a result and mark it as recently used.
+
+        Args:
+            key (bytes): The cache key.
+
+        Returns:
+            Optional[Result]: The cached fitness, score and frames, or None.
+        """
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def put(self, key: bytes, result: Result) -> None:
+        """
+        Store a result, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (bytes): The cache key.
+            result (Result): The fitness, score and frames to store.
+        """
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def evaluate(self, genomes: Sequence[neat.DefaultGenome], course: Hashable,
+                 simulate: Callable[[List[neat.DefaultGenome]], Tuple[List[float], List[int], List[int]]]
+                 ) -> List[Result]:
+        """
+        Assign fitness to genomes, simulating only the ones whose result is not cached.
+
+        Genomes that share a key are simulated once and all receive the same result.
+
+        Args:
+            genomes (Sequence[neat.DefaultGenome]): The genomes to evaluate.
+            course (Hashable): The seed of the course, together with anything else that changes the result.
+            simulate (Callable): Evaluates a list of genomes and returns their fitness, scores and frames flown.
+
+        Returns:
+            List[Result]: The fitness, final score and frames flown of each genome, in order.
+        """
+        keys: List[bytes] = [genome_key(genome, course) for genome in genomes]
+        results: Dict[bytes, Result] = {}
+        pending: Dict[bytes, neat.DefaultGenome] = {}
+        for genome, key in zip(genomes, keys):
+            if key in results or key in pending:
+                continue
+            cached = self.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = genome
+
+        self.hits += len(genomes) - len(pending)
+        self.misses += len(pending)
+
+        if pending:
+            for key, result in zip(pending, zip(*simulate(list(pending.values())))):
+                results[key] = result
+                self.put(key, result)
+
+        ordered: List[Result] = [results[key] for key in keys]
+        for genome, result in zip(genomes, ordered):
+            genome.fitness = result[0]
+        return ordered
@@ -0,0 +1,396 @@
+import asyncio
+import json
+import pickle
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import neat
+from components.batch_net import BatchNetwork
+from components.simulation import EpisodeBudget, Simulation
+
+# Requests are answered over localhost as newline-delimited JSON
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+JUMP_THRESHOLD: float = 0.5  # A bird jumps when the network output is above this, as in Simulation.step
+LATENCY_WINDOW: int = 10000  # The number of recent requests the latency percentiles cover
+
+
+def load_network(genome_path: str, config: neat.Config) -> BatchNetwork:
+    """
+    Load a pickled genome, such as winner.pkl, and compile its network.
+
+    Args:
+        genome_path (str): The pickled genome.
+        config (neat.Config): The NEAT configuration the genome was trained with.
+
+    Returns:
+        BatchNetwork: The compiled network of the genome.
+    """
+    with open(genome_path, 'rb') as f:
+        genome = pickle.load(f)
+    return BatchNetwork.create([genome], config)
+
+
+class InferenceStats:
+    """Request, batch and latency counters of an inference server."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        """
+        Initialize the InferenceStats.
+
+        Args:
+            window (int): The number of recent requests the latency percentiles cover.
+        """
+        self.started: float = time.perf_counter()
+        self.requests: int = 0
+        self.batches: int = 0
+        self.largest_batch: int = 0
+        self.errors: int = 0
+        self.connections: int = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def record_batch(self, latencies: Sequence[float]) -> None:
+        """
+        Count an evaluated batch.
+
+        Args:
+            latencies (Sequence[float]): The time in seconds each request of the batch waited for its answer.
+        """
+        self.requests += len(latencies)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(latencies))
+        self.latencies.extend(latencies)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get the counters.
+
+        Returns:
+            Dict[str, float]: Totals since the server started, the mean batch size, the throughput and the
+            median, 99th percentile and maximum latency of the recent requests in milliseconds.
+        """
+        uptime = time.perf_counter() - self.started
+        stats = {
+            'uptime': uptime,
+            'connections': self.connections,
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'requests_per_second': self.requests / uptime if uptime > 0 else 0.0,
+        }
+        if self.latencies:
+            ms = np.fromiter(self.latencies, dtype=np.float64) * 1000
+            p50, p99 = np.percentile(ms, [50, 99])
+            stats.update(latency_p50_ms=float(p50), latency_p99_ms=float(p99), latency_max_ms=float(ms.max()))
+        return stats
+
+
+class MicroBatcher:
+    """
+    Collects concurrent observations and evaluates them in one network call.
+
+    The first request of a batch opens a window; the batch is evaluated when the window closes or as
+    soon as it is full. A request therefore waits at most the window plus one batched activation, which
+    keeps the tail latency bounded under load, while a busy server answers hundreds of requests with a
+    single call to BatchNetwork.activate.
+    """
+
+    def __init__(self, net: BatchNetwork, window: float = 0.002, max_batch: int = 256,
+                 stats: Optional[InferenceStats] = None) -> None:
+        """
+        Initialize the MicroBatcher. Call start() from the event loop before submitting.
+
+        Args:
+            net (BatchNetwork): The compiled network of a single genome.
+            window (float): The longest time in seconds a request waits for others to join its batch.
+            max_batch (int): The largest number of requests evaluated together.
+            stats (Optional[InferenceStats]): The counters to update. Defaults to new counters.
+        """
+        self.net: BatchNetwork = net
+        self.window: float = window
+        self.max_batch: int = max(1, max_batch)
+        self.stats: InferenceStats = stats if stats is not None else InferenceStats()
+        self._pending: List[Tuple[Sequence[float], asyncio.Future, float]] = []
+        self._ready: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start evaluating batches in the running event loop."""
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop evaluating batches."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, observation: Sequence[float]) -> float:
+        """
+        Evaluate one observation.
+
+        Args:
+            observation (Sequence[float]): The network inputs, as built by Simulation.observe.
+
+        Returns:
+            float: The network output.
+
+        Raises:
+            ValueError: If the observation does not have one value per network input, or its batch could
+                not be evaluated.
+        """
+        if len(observation) != self.net.num_inputs:
+            raise ValueError(f"Expected {self.net.num_inputs} inputs, got {len(observation)}")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((observation, future, time.perf_counter()))
+        self._ready.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        """Wait for requests, gather a batch and answer it, forever."""
+        while True:
+            await self._ready.wait()
+            if self.window > 0 and len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+            if not self._pending:
+                self._ready.clear()
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            try:
+                self._evaluate(batch)
+            except Exception as e:
+                # Fail this batch's requests instead of the batcher, so later requests are still answered
+                error = ValueError(f"Evaluation failed: {type(e).__name__}: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            # Let the answered sessions send their next requests before the next window opens
+            await asyncio.sleep(0)
+
+    def _evaluate(self, batch: List[Tuple[Sequence[float], asyncio.Future, float]]) -> None:
+        """
+        Evaluate a batch and resolve its futures.
+
+        Args:
+            batch (List[Tuple[Sequence[float], asyncio.Future, float]]): The observations, their futures and
+                the times they arrived.
+        """
+        inputs = np.array([observation for observation, _, _ in batch], dtype=np.float64)
+        output = self.net.activate(inputs, np.zeros(len(batch), dtype=np.int64))[:, 0]
+        now = time.perf_counter()
+        for (_, future, _), value in zip(batch, output.tolist()):
+            if not future.cancelled():
+                future.set_result(value)
+        self.stats.record_batch([now - arrived for _, _, arrived in batch])
+
+
+class InferenceServer:
+    """
+    Serves the decisions of a trained genome to many game sessions over a local socket.
+
+    Each line a client sends is a JSON request and is answered with one JSON line, in order:
+
+    - {"obs": [y, pipe_top, gap_top, pipe_x]} is answered with {"jump": true, "output": 0.93}. The four
+      values are the network inputs built by Simulation.observe.
+    - {"stats": true} is answered with the counters of InferenceStats.snapshot.
+
+    Malformed requests are answered with {"error": "..."} and the connection stays open.
+    """
+
+    def __init__(self, net: BatchNetwork, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 window: float = 0.002, max_batch: int = 256, report_interval: Optional[float] = 10.0) -> None:
+        """
+        Initialize the InferenceServer.
+
+        Args:
+            net (BatchNetwork): The compiled network of the genome.
+            host (str): The address to listen on.
+            port (int): The port to listen on. 0 picks a free port.
+            window (float): The micro-batching window in seconds.
+            max_batch (int): The largest number of requests evaluated together.
+            report_interval (Optional[float]): Print the counters every this many seconds. None disables it.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.report_interval: Optional[float] = report_interval
+        self.stats: InferenceStats = InferenceStats()
+        self.batcher: MicroBatcher = MicroBatcher(net, window, max_batch, self.stats)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening. The chosen port is stored in self.port."""
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and stop the batcher."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """Start the server and answer requests until cancelled."""
+        await self.start()
+        print(f"Serving on {self.host}:{self.port} (window {self.batcher.window * 1000:g} ms, "
+              f"batches of up to {self.batcher.max_batch})")
+        try:
+            if self.report_interval is None:
+                await asyncio.Future()
+            while True:
+                await asyncio.sleep(self.report_interval)
+                print(format_stats(self.stats.snapshot()))
+        finally:
+            await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of one connection.
+
+        Args:
+            reader (asyncio.StreamReader): The client's requests.
+            writer (asyncio.StreamWriter): The answers.
+        """
+        self.stats.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(await self._answer(line)).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes) -> Dict[str, object]:
+        """
+        Answer one request line.
+
+        Args:
+            line (bytes): The JSON request.
+
+        Returns:
+            Dict[str, object]: The response.
+        """
+        try:
+            request = json.loads(line)
+            if request.get('stats'):
+                return self.stats.snapshot()
+            output = await self.batcher.submit([float(value) for value in request['obs']])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.stats.errors += 1
+            return {'error': f"{type(e).__name__}: {e}"}
+        return {'jump': output > JUMP_THRESHOLD, 'output': output}
+
+
+def format_stats(stats: Dict[str, float]) -> str:
+    """
+    Format the counters of an inference server on one line.
+
+    Args:
+        stats (Dict[str, float]): The counters, as returned by InferenceStats.snapshot.
+
+    Returns:
+        str: The formatted counters.
+    """
+    text = (f"{stats['requests']} requests, {stats['requests_per_second']:.0f}/s, "
+            f"{stats['batches']} batches of {stats['mean_batch']:.1f} on average (largest {stats['largest_batch']})")
+    if 'latency_p50_ms' in stats:
+        text += (f", latency p50 {stats['latency_p50_ms']:.2f} ms p99 {stats['latency_p99_ms']:.2f} ms "
+                 f"max {stats['latency_max_ms']:.2f} ms")
+    return text
+
+
+async def play_session(host: str, port: int, seed: int, max_frames: Optional[int]) -> Tuple[int, int, List[float]]:
+    """
+    Play one game whose bird is controlled by an inference server.
+
+    Args:
+        host (str): The server's address.
+        port (int): The server's port.
+        seed (int): The seed of the course.
+        max_frames (Optional[int]): End the game after this many frames.
+
+    Returns:
+        Tuple[int, int, List[float]]: The score, the frames flown and the round-trip time of each request in seconds.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    simulation = Simulation([None], None, seed, budget=EpisodeBudget(max_frames=max_frames))
+    latencies: List[float] = []
+    try:
+        while not simulation.done:
+            rows, inputs = simulation.observe()
+            decisions = np.zeros(len(rows), dtype=bool)
+            if len(rows):
+                sent = time.perf_counter()
+                writer.write(json.dumps({'obs': inputs[0].tolist()}).encode() + b'\n')
+                response = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - sent)
+                decisions[0] = response['jump']
+            simulation.act(decisions)
+    finally:
+        writer.close()
+    _, scores, frames = simulation.results()
+    return scores[0], frames[0], latencies
+
+
+async def generate_load(host: str, port: int, sessions: int = 100, seed: int = 0,
+                        max_frames: Optional[int] = 2000) -> Dict[str, float]:
+    """
+    Play many concurrent games against an inference server and measure it.
+
+    Every session flies its own course, seeded with seed plus its number, and keeps one request in
+    flight at a time like a real game would.
+
+    Args:
+        host (str): The server's address.
+        port (int): The server's port.
+        sessions (int): The number of concurrent games.
+        seed (int): The seed of the first game's course.
+        max_frames (Optional[int]): End each game after this many frames.
+
+    Returns:
+        Dict[str, float]: The client-side throughput and round-trip latencies, the mean score, and the
+        server's counters under 'server'.
+    """
+    started = time.perf_counter()
+    games = await asyncio.gather(*(play_session(host, port, seed + k, max_frames) for k in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for _, _, game in games for latency in game]) * 1000
+    report: Dict[str, float] = {
+        'sessions': sessions,
+        'seconds': elapsed,
+        'requests': len(latencies),
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'mean_score': float(np.mean([score for score, _, _ in games])),
+        'mean_frames': float(np.mean([frames for _, frames, _ in games])),
+    }
+    if len(latencies):
+        p50, p99 = np.percentile(latencies, [50, 99])
+        report.update(latency_p50_ms=float(p50), latency_p99_ms=float(p99), latency_max_ms=float(latencies.max()))
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"stats": true}\n')
+    report['server'] = json.loads(await reader.readline())
+    writer.close()
+    return report
@@ -0,0 +1,151 @@
+import multiprocessing
+import random
+import numpy as np
+import neat
+from typing import List, Optional, Sequence, Tuple
+from components.simulation import DecisionSchedule, EpisodeBudget, Simulation
+from components.fitness_cache import FitnessCache
+from components.curriculum import Curriculum
+from components.replay import ReplayWriter
+from components.vector_env import course_seeds, evaluate_courses
+
+# Each worker gets several smaller chunks so fast and slow episodes even out across the pool
+CHUNKS_PER_WORKER: int = 4
+
+# The NEAT configuration and decision schedule, sent to each worker once when the pool starts
+_worker_config: Optional[neat.Config] = None
+_worker_schedule: Optional[DecisionSchedule] = None
+
+
+def _init_worker(config: neat.Config, schedule: Optional[DecisionSchedule]) -> None:
+    """
+    Store the NEAT configuration and decision schedule in a worker process.
+
+    Args:
+        config (neat.Config): The NEAT configuration.
+        schedule (Optional[DecisionSchedule]): How often the networks decide.
+    """
+    global _worker_config, _worker_schedule
+    _worker_config = config
+    _worker_schedule = schedule
+
+
+def _simulate_chunk(genomes: List[neat.DefaultGenome], seeds: List[int], budget: EpisodeBudget,
+                    record: bool) -> Tuple[Tuple[List[float], List[int], List[int]], Optional[List[np.ndarray]]]:
+    """
+    Evaluate a chunk of genomes inside a worker process.
+
+    Args:
+        genomes (List[neat.DefaultGenome]): The genomes to evaluate.
+        seeds (List[int]): The seeds of the courses shared by every chunk of the generation. With more
+            than one, the results are averaged over the courses by evaluate_courses.
+        budget (EpisodeBudget): Limits on the episode length.
+        record (bool): Also return the jump decisions of every bird. Only used with a single course.
+
+    Returns:
+        Tuple: The fitness, final score and frames flown of each genome, and their jump streams if recorded.
+    """
+    if len(seeds) > 1:
+        return evaluate_courses(genomes, _worker_config, seeds, budget), None
+    seed = seeds[0]
+    simulation = Simulation(genomes, _worker_config, seed, budget=budget, record=record, schedule=_worker_schedule)
+    simulation.run()
+    return simulation.results(), simulation.jump_streams() if record else None
+
+
+class ParallelEvaluator:
+    """Evaluate a generation's genomes across a pool of worker processes."""
+
+    def __init__(self, num_workers: int, config: neat.Config, cache: Optional[FitnessCache] = None,
+                 budget: Optional[EpisodeBudget] = None, curriculum: Optional[Curriculum] = None,
+                 recorder: Optional[ReplayWriter] = None, schedule: Optional[DecisionSchedule] = None,
+                 courses: int = 1) -> None:
+        """
+        Initialize the ParallelEvaluator and start its worker processes.
+
+        Args:
+            num_workers (int): The number of worker processes.
+            config (neat.Config): The NEAT configuration.
+            cache (Optional[FitnessCache]): If given, genomes already evaluated on a course are not simulated
+                again. It is only used while the budget is reproducible.
+            budget (Optional[EpisodeBudget]): Limits on the episode length. With stop_when_decided, each chunk
+                stops on its own.
+            curriculum (Optional[Curriculum]): If given, grows the budget's frame limit after each generation.
+            recorder (Optional[ReplayWriter]): If given, every simulated episode is recorded to it.
+            schedule (Optional[DecisionSchedule]): How often the networks decide. Defaults to every frame.
+                Only used with a single course.
+            courses (int): The number of courses each genome flies per generation; its fitness is the mean.
+                With more than one, episodes are not recorded.
+        """
+        self.num_workers: int = num_workers
+        self.cache: Optional[FitnessCache] = cache
+        self.budget: EpisodeBudget = budget if budget is not None else EpisodeBudget()
+        self.curriculum: Optional[Curriculum] = curriculum
+        self.recorder: Optional[ReplayWriter] = recorder if courses == 1 else None
+        self.courses: int = courses
+        self.pool = multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(config, schedule))
+        self.best_score: int = 0
+
+    def evaluate(self, genomes: Sequence[Tuple[int, neat.DefaultGenome]], config: neat.Config,
+                 seed: Optional[int] = None) -> None:
+        """
+        Evaluate genomes in parallel and store their fitness, as eval_genomes does.
+
+        Every chunk is simulated on the same course, so the fitness of genomes in different workers
+        stays comparable.
+
+        Args:
+            genomes (Sequence[Tuple[int, neat.DefaultGenome]]): The genome IDs and genomes to evaluate.
+            config (neat.Config): The NEAT configuration (already sent to the workers).
+            seed (Optional[int]): The seed of the course. Defaults to a random seed.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+
+        ge: List[neat.DefaultGenome] = [genome for genome_id, genome in genomes]
+        if self.cache is not None and self.budget.reproducible:
+            results = self.cache.evaluate(ge, (seed, self.budget.max_frames, self.courses),
+                                          lambda pending: self.simulate(pending, seed))
+            scores = [score for _, score, _ in results]
+            frames = [flown for _, _, flown in results]
+        else:
+            fitness, scores, frames = self.simulate(ge, seed)
+            for genome, genome_fitness in zip(ge, fitness):
+                genome.fitness = genome_fitness
+        self.best_score = max([self.best_score] + scores)
+        if self.curriculum is not None:
+            self.curriculum.update(frames)
+
+    def simulate(self, genomes: List[neat.DefaultGenome], seed: int) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Simulate genomes on the worker processes.
+
+        Args:
+            genomes (List[neat.DefaultGenome]): The genomes to simulate.
+            seed (int): The seed of the course, from which the seeds of the other courses are derived.
+
+        Returns:
+            Tuple[List[float], List[int], List[int]]: The fitness, final score and frames flown of each genome, in order.
+        """
+        num_chunks = max(1, min(len(genomes), self.num_workers * CHUNKS_PER_WORKER))
+        chunks = [genomes[k::num_chunks] for k in range(num_chunks)]
+        record = self.recorder is not None
+        seeds = course_seeds(seed, self.courses)
+        results = self.pool.starmap(_simulate_chunk, [(chunk, seeds, self.budget, record) for chunk in chunks])
+
+        fitness: List[float] = [0.0] * len(genomes)
+        scores: List[int] = [0] * len(genomes)
+        frames: List[int] = [0] * len(genomes)
+        for k, ((chunk_fitness, chunk_scores, chunk_frames), streams) in enumerate(results):
+            fitness[k::num_chunks] = chunk_fitness
+            scores[k::num_chunks] = chunk_scores
+            frames[k::num_chunks] = chunk_frames
+            if record:
+                for genome, genome_fitness, score, jumps in zip(chunks[k], chunk_fitness, chunk_scores, streams):
+                    self.recorder.write(genome.key, seed, score, genome_fitness, jumps)
+        return fitness, scores, frames
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.pool.close()
+        self.pool.join()
@@ -1,4 +1,5 @@
 import pygame
+from components.assets import assets
 
 # Game variables
 PIPE_WIDTH = 80
@@ -20,12 +21,11 @@ class Pipe(pygame.sprite.Sprite):
             is_top (bool): Whether the pipe is the top pipe.
         """
         super().__init__()
-        # Create the pipe surface
-        self.image = pygame.Surface((PIPE_WIDTH, PIPE_HEIGHT))
-        self.image.fill((0, 255, 0))
-        # Create the edge of the pipe
-        self.edge_image = pygame.Surface((PIPE_WIDTH + EDGE_OVERHANG, 20))
-        self.edge_image.fill((0, 200, 0))
+        # Use the pipe surfaces shared by every pipe
+        self.image = assets.pipe_body()
+        self.mask = assets.pipe_mask()
+        # The edge of the pipe
+        self.edge_image = assets.pipe_edge()
         if is_top:
             self.rect = self.image.get_rect(midbottom=(x, y))
             self.edge_rect = self.edge_image.get_rect(midbottom=(x, y))
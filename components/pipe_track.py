@@ -0,0 +1,175 @@
+import random
+import numpy as np
+from typing import Dict, List, Optional
+from components.pipe import Pipe, PIPE_WIDTH, PIPE_VELOCITY
+from components.population import BirdPopulation
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+SCREEN_HEIGHT: int = 600
+
+# Game variables
+PIPE_OFFSET: int = 100  # Distance from the right edge of the screen to generate pipes
+PIPE_GAP: int = 150  # Gap between the top and bottom pipes
+PIPE_SPAWN_X: int = SCREEN_WIDTH + PIPE_OFFSET - PIPE_WIDTH // 2  # rect.x of a newly created pipe
+
+
+def collide_gaps(population: BirdPopulation, birds: np.ndarray, ahead: np.ndarray, pipe_x: np.ndarray,
+                 gap_top: np.ndarray) -> np.ndarray:
+    """
+    Test which birds touch the pipe pair in front of them.
+
+    Bounding boxes are compared for all birds at once, and only birds whose box touches a pipe have
+    their rotated pixel mask checked against the pipe rectangle.
+
+    Args:
+        population (BirdPopulation): The birds.
+        birds (np.ndarray): Indices of the birds to test.
+        ahead (np.ndarray): Whether each tested bird has a pair in front of it.
+        pipe_x (np.ndarray): The rect.x of each tested bird's pair. Ignored where ahead is False.
+        gap_top (np.ndarray): The bottom of the top pipe of each tested bird's pair. Ignored where ahead is False.
+
+    Returns:
+        np.ndarray: A boolean array that is True for birds touching a pipe.
+    """
+    hit = np.zeros(len(birds), dtype=bool)
+    if not ahead.any():
+        return hit
+
+    left = population.left[birds]
+    top = population.y[birds]
+    bottom = top + population.extent[birds]
+    gap_bottom = gap_top + PIPE_GAP
+
+    # The top pipe always reaches above the screen and the bottom pipe below it
+    overlaps_x = ahead & (pipe_x < left + population.extent[birds]) & (pipe_x + PIPE_WIDTH > left)
+    touches_top = overlaps_x & (top < gap_top)
+    touches_bottom = overlaps_x & (bottom > gap_bottom)
+
+    for k in np.flatnonzero(touches_top | touches_bottom).tolist():
+        i = int(birds[k])
+        column_top, column_bottom = population.profile(i)
+        first = max(0, int(pipe_x[k] - left[k]))
+        last = min(len(column_top), int(pipe_x[k] + PIPE_WIDTH - left[k]))
+        hit[k] = bool(
+            (touches_top[k] and column_top[first:last].min() < gap_top[k] - top[k])
+            or (touches_bottom[k] and column_bottom[first:last].max() >= gap_bottom[k] - top[k])
+        )
+    return hit
+
+
+class PipeTrack:
+    """
+    The pipe pairs of a course, stored as arrays ordered by x.
+
+    Birds and pipes are boxes, and the bird's pixel mask is only needed once a bounding box actually
+    touches a pipe, so nearest-pipe queries and collisions are answered with arithmetic on the gap
+    positions for the whole population at once. The results match the old per-bird scan of the pipe
+    group and pygame.sprite.collide_mask. Pipe sprites are only built when the track is drawn.
+    """
+
+    def __init__(self, rng: random.Random = random) -> None:
+        """
+        Initialize the PipeTrack.
+
+        Args:
+            rng (random.Random): The random number generator that picks the gap heights.
+        """
+        self.rng: random.Random = rng
+        self.x: np.ndarray = np.zeros(0, dtype=np.int64)  # rect.x of each pair
+        self.gap_top: np.ndarray = np.zeros(0, dtype=np.int64)  # bottom of the top pipe
+        self.number: np.ndarray = np.zeros(0, dtype=np.int64)  # running count of pairs created
+        self.created: int = 0
+        self._sprites: Dict[int, List[Pipe]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pipe pairs on the track."""
+        return len(self.x)
+
+    @property
+    def right(self) -> np.ndarray:
+        """np.ndarray: The right edge of each pair."""
+        return self.x + PIPE_WIDTH
+
+    @property
+    def gap_bottom(self) -> np.ndarray:
+        """np.ndarray: The top of each bottom pipe."""
+        return self.gap_top + PIPE_GAP
+
+    def spawn(self, distance: int) -> None:
+        """
+        Add a pipe pair at the right edge once the last pair has moved far enough.
+
+        Args:
+            distance (int): How far the last pair must be from the right edge of the screen.
+        """
+        if len(self.x) == 0 or self.x[-1] < SCREEN_WIDTH - distance:
+            pipe_height: int = self.rng.randint(100, SCREEN_HEIGHT - PIPE_GAP - 100)
+            self.x = np.append(self.x, PIPE_SPAWN_X)
+            self.gap_top = np.append(self.gap_top, pipe_height)
+            self.number = np.append(self.number, self.created)
+            self.created += 1
+
+    def update(self) -> None:
+        """Move every pair, removing the ones that have left the screen."""
+        self.x += PIPE_VELOCITY
+        if len(self.x) and self.x[0] + PIPE_WIDTH < 0:
+            gone = self.x + PIPE_WIDTH < 0
+            for number in self.number[gone].tolist():
+                self._sprites.pop(number, None)
+            keep = ~gone
+            self.x, self.gap_top, self.number = self.x[keep], self.gap_top[keep], self.number[keep]
+
+    def nearest(self, left: np.ndarray) -> np.ndarray:
+        """
+        Find the next gap ahead of each bird.
+
+        Args:
+            left (np.ndarray): The left edge of each bird.
+
+        Returns:
+            np.ndarray: The index of the first pair whose right edge is past each bird, or len(self) if there is none.
+        """
+        return np.searchsorted(self.right, left, side='right')
+
+    def collides(self, population: BirdPopulation, birds: np.ndarray, nearest: np.ndarray) -> np.ndarray:
+        """
+        Test which birds touch a pipe.
+
+        Pairs are far enough apart that a bird can only overlap the pair nearest to it, so each bird is
+        tested against that pair with collide_gaps.
+
+        Args:
+            population (BirdPopulation): The birds.
+            birds (np.ndarray): Indices of the birds to test.
+            nearest (np.ndarray): The nearest pair of each tested bird, as returned by nearest().
+
+        Returns:
+            np.ndarray: A boolean array that is True for birds touching a pipe.
+        """
+        ahead = nearest < len(self.x)
+        if not ahead.any():
+            return np.zeros(len(birds), dtype=bool)
+        pair = np.where(ahead, nearest, 0)
+        return collide_gaps(population, birds, ahead, self.x[pair], self.gap_top[pair])
+
+    def sprites(self) -> List[Pipe]:
+        """
+        Get Pipe sprites for drawing, building each pair on first use.
+
+        Returns:
+            List[Pipe]: The top and bottom pipe of every pair, in order.
+        """
+        pipes: List[Pipe] = []
+        for x, gap_top, number in zip(self.x.tolist(), self.gap_top.tolist(), self.number.tolist()):
+            pair: Optional[List[Pipe]] = self._sprites.get(number)
+            if pair is None:
+                pair = [Pipe(SCREEN_WIDTH + PIPE_OFFSET, gap_top, True),
+                        Pipe(SCREEN_WIDTH + PIPE_OFFSET, gap_top + PIPE_GAP, False)]
+                self._sprites[number] = pair
+            for pipe in pair:
+                shift = x - pipe.rect.x
+                pipe.rect.x += shift
+                pipe.edge_rect.x += shift
+            pipes.extend(pair)
+        return pipes
@@ -0,0 +1,149 @@
+import random
+from typing import Dict
+import pygame
+from components.bird import Bird
+from components.pipe import Pipe, PIPE_VELOCITY
+from components.simulation import create_pipe
+from components.profiler import Profiler, NULL_PROFILER
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+SCREEN_HEIGHT: int = 600
+
+# Game variables
+TICK_RATE: int = 60  # Simulation ticks per second, the speed the game was tuned for
+PLAY_PIPE_DISTANCE: int = 450  # Distance in pixels between pipes, 1.5 seconds of scrolling at the tick rate
+MAX_FRAME_TIME: float = 0.25  # Longer pauses between frames are not caught up, so the game does not jump ahead
+
+
+class FixedTimestep:
+    """
+    Converts the real time between rendered frames into a whole number of simulation ticks.
+
+    Elapsed time is added to an accumulator and every full tick in it is simulated, so a slow frame is
+    caught up with several ticks and a fast frame may simulate none. The time left over, as a fraction
+    of a tick, tells the renderer how far to interpolate between the last two simulated states.
+    """
+
+    def __init__(self, tick_rate: int = TICK_RATE, max_frame_time: float = MAX_FRAME_TIME) -> None:
+        """
+        Initialize the FixedTimestep.
+
+        Args:
+            tick_rate (int): Simulation ticks per second.
+            max_frame_time (float): The most real time in seconds one frame can add to the accumulator.
+        """
+        self.dt: float = 1.0 / tick_rate
+        self.max_frame_time: float = max_frame_time
+        self.accumulator: float = 0.0
+
+    def advance(self, elapsed: float) -> int:
+        """
+        Add the real time of a frame and take the ticks that are due.
+
+        Args:
+            elapsed (float): Seconds since the previous frame.
+
+        Returns:
+            int: The number of ticks to simulate.
+        """
+        self.accumulator += min(elapsed, self.max_frame_time)
+        ticks = int(self.accumulator / self.dt)
+        self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """float: How far the current frame lies between the last two ticks, from 0 to 1."""
+        return self.accumulator / self.dt
+
+
+class PlayGame:
+    """
+    A played game that advances in fixed ticks, so it plays the same however fast frames are drawn.
+
+    Every tick moves the bird and the pipes by the same amount. Pipes are spawned by the distance the
+    course has scrolled, like in training, instead of by wall-clock time, so the same jumps on the same
+    seed always give the same game. Drawing interpolates between the last two ticks, which keeps the
+    motion smooth when the display runs at a different rate than the simulation.
+    """
+
+    def __init__(self, bird: Bird, pipes: pygame.sprite.Group, rng: random.Random = random) -> None:
+        """
+        Initialize the PlayGame.
+
+        Args:
+            bird (Bird): The player's bird.
+            pipes (pygame.sprite.Group): The group the pipes are added to.
+            rng (random.Random): The random number generator that picks the gap heights.
+        """
+        self.bird: Bird = bird
+        self.pipes: pygame.sprite.Group = pipes
+        self.rng: random.Random = rng
+        self.score: int = 0
+        self.ticks: int = 0
+        self.over: bool = False
+        self.scrolled: int = 0  # Distance scrolled since the last pipe was spawned
+        self.jump_requested: bool = False
+        self._previous_y: int = bird.rect.centery
+        self._previous_x: Dict[Pipe, int] = {}
+
+    def request_jump(self) -> None:
+        """Make the bird jump on the next tick."""
+        self.jump_requested = True
+
+    def tick(self, profiler: Profiler = NULL_PROFILER) -> None:
+        """
+        Advance the game by one tick: jump, spawn pipes, move everything, then check for a crash and score.
+
+        Args:
+            profiler (Profiler): Times the phases of the tick.
+        """
+        if self.over:
+            return
+        bird = self.bird
+        self.ticks += 1
+        if self.jump_requested:
+            bird.jump()
+            self.jump_requested = False
+
+        # Add a new pipe every time the course has scrolled the pipe distance
+        self.scrolled -= PIPE_VELOCITY
+        if self.scrolled >= PLAY_PIPE_DISTANCE:
+            self.scrolled -= PLAY_PIPE_DISTANCE
+            self.pipes.add(*create_pipe(self.rng))
+        profiler.mark('spawn')
+
+        self._previous_y = bird.rect.centery
+        self._previous_x = {pipe: pipe.rect.x for pipe in self.pipes}
+        bird.update()
+        self.pipes.update()
+        profiler.mark('physics')
+
+        # Check for collisions
+        if pygame.sprite.spritecollide(bird, self.pipes, False, pygame.sprite.collide_mask) or bird.rect.bottom >= SCREEN_HEIGHT:
+            self.over = True
+        profiler.mark('collision')
+
+        # Update score
+        for pipe in self.pipes:
+            if pipe.rect.centerx == bird.rect.centerx and pipe.rect.bottom >= SCREEN_HEIGHT:
+                self.score += 1
+        profiler.mark('scoring')
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> None:
+        """
+        Draw the bird and the pipes between their positions at the last two ticks.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            alpha (float): 0 draws the previous tick, 1 the latest.
+        """
+        bird = self.bird
+        y = round(self._previous_y + (bird.rect.centery - self._previous_y) * alpha)
+        screen.blit(bird.image, bird.image.get_rect(center=(bird.rect.centerx, y)))
+        for pipe in self.pipes:
+            previous_x = self._previous_x.get(pipe, pipe.rect.x)
+            offset = round((previous_x - pipe.rect.x) * (1.0 - alpha))
+            screen.blit(pipe.image, pipe.rect.move(offset, 0))
+            screen.blit(pipe.edge_image, pipe.edge_rect.move(offset, 0))
@@ -0,0 +1,300 @@
+import random
+import numpy as np
+import pygame
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from components.bird import Bird, GRAVITY, BIRD_JUMP, SCREEN_HEIGHT
+from components.assets import assets
+
+# Bird geometry, matching the surface and start position used by Bird
+BIRD_SIZE: int = 30
+BIRD_CENTER_X: int = 100
+BIRD_START_Y: int = SCREEN_HEIGHT // 2 - BIRD_SIZE // 2
+
+Indices = Union[int, Sequence[int], np.ndarray]
+
+
+def round_half_away(values: np.ndarray) -> np.ndarray:
+    """
+    Round values the way pygame.Rect does when a float is assigned to a coordinate.
+
+    Args:
+        values (np.ndarray): The values to round.
+
+    Returns:
+        np.ndarray: The rounded values as integers.
+    """
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+
+def rotated_extent(angles: np.ndarray) -> np.ndarray:
+    """
+    Compute the side length of the bird image after pygame.transform.rotate.
+
+    The bird image is a square, so the rotated surface is square as well. The formula mirrors the
+    one pygame uses to size the destination surface, including its special case for multiples of 90.
+
+    Args:
+        angles (np.ndarray): Rotation angles in degrees.
+
+    Returns:
+        np.ndarray: The width (and height) of the rotated image for each angle.
+    """
+    radians = angles * .01745329251994329
+    c = np.cos(radians) * BIRD_SIZE
+    s = np.sin(radians) * BIRD_SIZE
+    extent = np.maximum(np.abs(c + s), np.abs(c - s)).astype(np.int64)
+    return np.where(np.fmod(angles, 90.0) == 0, BIRD_SIZE, extent)
+
+
+class BirdShape:
+    """Lightweight stand-in for a Bird sprite, carrying only what pygame's mask collision needs."""
+
+    __slots__ = ('rect', 'mask')
+
+    def __init__(self, rect: pygame.Rect, mask: pygame.mask.Mask) -> None:
+        """
+        Initialize the BirdShape.
+
+        Args:
+            rect (pygame.Rect): The bird's bounding rectangle.
+            mask (pygame.mask.Mask): The bird's collision mask.
+        """
+        self.rect: pygame.Rect = rect
+        self.mask: pygame.mask.Mask = mask
+
+
+class BirdPopulation:
+    """
+    Struct-of-arrays physics engine for a whole population of birds.
+
+    Every bird's position, velocity, angle, score and alive flag live in NumPy arrays and are
+    advanced together in one call to update(). The results match Bird.update exactly, including
+    pygame's rounding of rect coordinates and the re-centering after rotation. Bird sprites are
+    only built when something needs to be rendered.
+    """
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None) -> None:
+        """
+        Initialize the population.
+
+        Args:
+            size (int): The number of birds.
+            rng (Optional[random.Random]): The random number generator that picks sprite colors.
+                Defaults to a private generator, so drawing never disturbs the global random state.
+        """
+        self.size: int = size
+        self.rng: random.Random = rng if rng is not None else random.Random()
+        self.y: np.ndarray = np.full(size, BIRD_START_Y, dtype=np.int64)  # rect.top
+        self.extent: np.ndarray = np.full(size, BIRD_SIZE, dtype=np.int64)  # rect width and height
+        self.velocity: np.ndarray = np.zeros(size, dtype=np.float64)
+        self.angle: np.ndarray = np.zeros(size, dtype=np.float64)
+        self.score: np.ndarray = np.zeros(size, dtype=np.int64)
+        self.alive: np.ndarray = np.ones(size, dtype=bool)
+        self.alive_indices: np.ndarray = np.arange(size)
+        self._sprites: Dict[int, Bird] = {}
+        self._masks: Dict[float, pygame.mask.Mask] = {}
+        self._profiles: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+        self._mask_image: Optional[pygame.Surface] = None
+
+    @property
+    def alive_count(self) -> int:
+        """int: The number of birds still alive."""
+        return len(self.alive_indices)
+
+    @property
+    def left(self) -> np.ndarray:
+        """np.ndarray: The left edge of every bird's rect."""
+        return BIRD_CENTER_X - self.extent // 2
+
+    @property
+    def right(self) -> np.ndarray:
+        """np.ndarray: The right edge of every bird's rect."""
+        return self.left + self.extent
+
+    @property
+    def bottom(self) -> np.ndarray:
+        """np.ndarray: The bottom edge of every bird's rect."""
+        return self.y + self.extent
+
+    def leading_score(self) -> int:
+        """
+        Get the highest score in the population.
+
+        Returns:
+            int: The leading bird's score, or 0 for an empty population.
+        """
+        return int(self.score.max()) if self.size else 0
+
+    def update(self) -> None:
+        """Advance every living bird by one frame, exactly as Bird.update does."""
+        idx = self.alive_indices
+        if len(idx) == 0:
+            return
+
+        velocity = self.velocity[idx] + GRAVITY
+        y = round_half_away(self.y[idx] + velocity)
+        extent = self.extent[idx]
+
+        # Prevent the birds from going off-screen
+        above = y < 0
+        y[above] = 0
+        velocity[above] = 0
+        below = y + extent > SCREEN_HEIGHT
+        y[below] = SCREEN_HEIGHT - extent[below]
+        velocity[below] = 0
+
+        # Rotate the birds, keeping the rect centered on the same point
+        angle = np.minimum(np.maximum(velocity * -5, -90), 90)
+        new_extent = rotated_extent(angle)
+        y = y + extent // 2 - new_extent // 2
+
+        self.y[idx] = y
+        self.velocity[idx] = velocity
+        self.angle[idx] = angle
+        self.extent[idx] = new_extent
+        self.score[idx] += 1
+
+    def jump(self, indices: Optional[Indices] = None) -> None:
+        """
+        Make birds jump.
+
+        Args:
+            indices (Optional[Indices]): The birds that jump. Defaults to every living bird.
+        """
+        idx = self.alive_indices if indices is None else np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        idx = idx[self.y[idx] > 0]  # Only jump if the bird is not at the ceiling
+        self.velocity[idx] = BIRD_JUMP
+
+    def kill(self, indices: Indices) -> None:
+        """
+        Mark birds as dead so they are skipped by every later update.
+
+        Args:
+            indices (Indices): The birds to kill.
+        """
+        idx = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        self.alive[idx] = False
+        self.alive_indices = np.flatnonzero(self.alive)
+
+    def reset(self, indices: Indices) -> None:
+        """
+        Put birds back at the start, alive and with a score of 0, as if they were just created.
+
+        Args:
+            indices (Indices): The birds to reset.
+        """
+        idx = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        self.y[idx] = BIRD_START_Y
+        self.extent[idx] = BIRD_SIZE
+        self.velocity[idx] = 0.0
+        self.angle[idx] = 0.0
+        self.score[idx] = 0
+        self.alive[idx] = True
+        self.alive_indices = np.flatnonzero(self.alive)
+
+    def rect(self, i: int) -> pygame.Rect:
+        """
+        Get the rect a Bird sprite would have.
+
+        Args:
+            i (int): The bird index.
+
+        Returns:
+            pygame.Rect: The bird's bounding rectangle.
+        """
+        extent = int(self.extent[i])
+        return pygame.Rect(BIRD_CENTER_X - extent // 2, int(self.y[i]), extent, extent)
+
+    def mask(self, i: int) -> pygame.mask.Mask:
+        """
+        Get the collision mask a Bird sprite would have, cached per rotation angle.
+
+        Args:
+            i (int): The bird index.
+
+        Returns:
+            pygame.mask.Mask: The mask of the rotated bird image.
+        """
+        angle = float(self.angle[i])
+        mask = self._masks.get(angle)
+        if mask is None:
+            if self._mask_image is None:
+                self._mask_image = pygame.Surface((BIRD_SIZE, BIRD_SIZE), pygame.SRCALPHA)
+                self._mask_image.fill((0, 0, 0))
+            mask = pygame.mask.from_surface(pygame.transform.rotate(self._mask_image, angle))
+            self._masks[angle] = mask
+        return mask
+
+    def profile(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the first and last solid row of each column of a bird's mask, cached per rotation angle.
+
+        Empty columns get a first row past the bottom and a last row of -1, so they never collide.
+
+        Args:
+            i (int): The bird index.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The first and last solid row of each column.
+        """
+        angle = float(self.angle[i])
+        profile = self._profiles.get(angle)
+        if profile is None:
+            mask = self.mask(i)
+            width, height = mask.get_size()
+            solid = np.array([[mask.get_at((x, y)) for x in range(width)] for y in range(height)], dtype=bool)
+            rows = np.arange(height)[:, None]
+            column_top = np.where(solid, rows, height).min(axis=0)
+            column_bottom = np.where(solid, rows, -1).max(axis=0)
+            profile = (column_top, column_bottom)
+            self._profiles[angle] = profile
+        return profile
+
+    def shape(self, i: int) -> BirdShape:
+        """
+        Get an object that pygame.sprite.collide_mask can test against other sprites.
+
+        Args:
+            i (int): The bird index.
+
+        Returns:
+            BirdShape: The bird's rect and mask.
+        """
+        return BirdShape(self.rect(i), self.mask(i))
+
+    def sprite(self, i: int) -> Bird:
+        """
+        Get a Bird sprite that mirrors the state of one bird, building it on first use.
+
+        Args:
+            i (int): The bird index.
+
+        Returns:
+            Bird: The synchronized sprite.
+        """
+        bird = self._sprites.get(i)
+        if bird is None:
+            bird = Bird(self.rng)
+            self._sprites[i] = bird
+        bird.velocity = float(self.velocity[i])
+        bird.score = int(self.score[i])
+        bird.alive = bool(self.alive[i])
+        if bird.angle != self.angle[i]:
+            bird.angle = float(self.angle[i])
+            bird.image = assets.bird_frame(bird.original_image, bird.color, bird.angle)
+        bird.rect = self.rect(i)
+        bird.hitbox_rect.center = bird.rect.center
+        return bird
+
+    def sprites(self, indices: Optional[Indices] = None) -> List[Bird]:
+        """
+        Get Bird sprites for rendering.
+
+        Args:
+            indices (Optional[Indices]): The birds to build sprites for. Defaults to every living bird.
+
+        Returns:
+            List[Bird]: The synchronized sprites.
+        """
+        idx = self.alive_indices if indices is None else np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        return [self.sprite(int(i)) for i in idx]
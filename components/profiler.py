@@ -0,0 +1,211 @@
+import csv
+import json
+import os
+import time
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import numpy as np
+import neat
+
+
+def summarize(samples: np.ndarray) -> Dict[str, float]:
+    """
+    Summarize phase durations.
+
+    Args:
+        samples (np.ndarray): Durations in nanoseconds.
+
+    Returns:
+        Dict[str, float]: The sample count and the total, mean, median and 99th percentile in milliseconds.
+    """
+    ms = samples / 1e6
+    p50, p99 = np.percentile(ms, [50, 99])
+    return {'count': int(len(ms)), 'total': float(ms.sum()), 'mean': float(ms.mean()),
+            'p50': float(p50), 'p99': float(p99)}
+
+
+class Profiler:
+    """
+    Times the phases of a frame loop.
+
+    Call start_frame() at the top of the loop, mark(phase) after each phase and end_frame() at the
+    bottom. mark() charges the time since the previous mark to the phase, so instrumenting a loop adds
+    one clock read per phase and no nesting. Phases that are marked several times in a frame add up,
+    and phases that are skipped in a frame, like drawing when frames are skipped, get no sample.
+
+    Durations are kept for the current generation, for per-generation statistics, and for the most
+    recent frames, for live numbers. A frame's total time is recorded as the phase 'frame'.
+    """
+
+    enabled: bool = True
+
+    def __init__(self, window: int = 600) -> None:
+        """
+        Initialize the Profiler.
+
+        Args:
+            window (int): The number of recent frames the rolling statistics cover.
+        """
+        self.window: int = window
+        self.phases: List[str] = []
+        self._generation: Dict[str, array] = {}
+        self._recent: Dict[str, Deque[int]] = {}
+        self._current: Dict[str, int] = {}
+        self._frame_start: int = 0
+        self._last: int = 0
+
+    def start_frame(self) -> None:
+        """Start timing a frame."""
+        self._frame_start = self._last = time.perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        """
+        Charge the time since the previous mark to a phase.
+
+        Args:
+            phase (str): The phase that just finished.
+        """
+        now = time.perf_counter_ns()
+        self._current[phase] = self._current.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        """Finish the frame and record its phase durations."""
+        self._current['frame'] = time.perf_counter_ns() - self._frame_start
+        for phase, duration in self._current.items():
+            samples = self._generation.get(phase)
+            if samples is None:
+                samples = self._generation[phase] = array('q')
+                if phase not in self._recent:
+                    self.phases.append(phase)
+                    self._recent[phase] = deque(maxlen=self.window)
+            samples.append(duration)
+            self._recent[phase].append(duration)
+        self._current = {}
+
+    def rolling(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get statistics of the most recent frames.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The summary of each phase, in the order the phases first ran.
+        """
+        return {phase: summarize(np.fromiter(self._recent[phase], dtype=np.int64))
+                for phase in self.phases if self._recent[phase]}
+
+    def generation(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get statistics of the frames since the last reset.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The summary of each phase, in the order the phases first ran.
+        """
+        return {phase: summarize(np.frombuffer(self._generation[phase], dtype=np.int64))
+                for phase in self.phases if len(self._generation.get(phase, ()))}
+
+    def reset_generation(self) -> None:
+        """Start collecting the statistics of a new generation."""
+        self._generation = {}
+
+
+class NullProfiler(Profiler):
+    """A Profiler that records nothing, used when profiling is off so instrumented loops cost one no-op call per phase."""
+
+    enabled: bool = False
+
+    def start_frame(self) -> None:
+        """Do nothing."""
+
+    def mark(self, phase: str) -> None:
+        """Do nothing."""
+
+    def end_frame(self) -> None:
+        """Do nothing."""
+
+
+# The profiler used by loops that are not being profiled
+NULL_PROFILER: NullProfiler = NullProfiler()
+
+
+# Label columns of exported statistics. Training and play records share one file, told apart by mode,
+# and leave the labels of the other mode empty
+LABEL_FIELDS: List[str] = ['mode', 'generation', 'population', 'game', 'score']
+STAT_FIELDS: List[str] = ['phase', 'count', 'total_ms', 'mean_ms', 'p50_ms', 'p99_ms']
+
+
+def export_stats(path: str, stats: Dict[str, Dict[str, float]], mode: str, **labels: object) -> None:
+    """
+    Append phase statistics to a file: one row per phase if the path ends in .csv, otherwise one JSON line.
+
+    Every record has the same label fields, LABEL_FIELDS, so records of training and of played games
+    can share a file.
+
+    Args:
+        path (str): The file to append to.
+        stats (Dict[str, Dict[str, float]]): The summary of each phase.
+        mode (str): What was profiled, 'train' or 'play'.
+        **labels (object): Fields that identify the record, such as the generation.
+
+    Raises:
+        ValueError: If a label is not one of LABEL_FIELDS, or an existing CSV file has other columns.
+    """
+    unknown = set(labels) - set(LABEL_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown profile labels: {', '.join(sorted(unknown))}")
+    record = {field: labels.get(field) for field in LABEL_FIELDS}
+    record['mode'] = mode
+    if path.endswith('.csv'):
+        header = LABEL_FIELDS + STAT_FIELDS
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            with open(path, newline='') as f:
+                if next(csv.reader(f), None) != header:
+                    raise ValueError(f"{path} has different columns; export the statistics to a new file")
+        with open(path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(header)
+            labels_row = ['' if value is None else value for value in record.values()]
+            for phase, summary in stats.items():
+                writer.writerow(labels_row + [phase, summary['count'], f"{summary['total']:.4f}",
+                                              f"{summary['mean']:.4f}", f"{summary['p50']:.4f}",
+                                              f"{summary['p99']:.4f}"])
+    else:
+        with open(path, 'a') as f:
+            f.write(json.dumps({**record, 'phases': stats}) + '\n')
+
+
+class ProfileReporter(neat.reporting.BaseReporter):
+    """A NEAT reporter that exports the phase statistics of each generation and prints a short summary."""
+
+    def __init__(self, profiler: Profiler, path: Optional[str] = None, show: bool = True) -> None:
+        """
+        Initialize the ProfileReporter.
+
+        Args:
+            profiler (Profiler): The profiler of the training loop.
+            path (Optional[str]): The .jsonl or .csv file the statistics are appended to.
+            show (bool): Print the mean time of each phase after every generation.
+        """
+        self.profiler: Profiler = profiler
+        self.path: Optional[str] = path
+        self.show: bool = show
+        self.generation: int = 0
+
+    def start_generation(self, generation: int) -> None:
+        """Start collecting the statistics of a generation."""
+        self.generation = generation
+        self.profiler.reset_generation()
+
+    def post_evaluate(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                      species: neat.DefaultSpeciesSet, best_genome: neat.DefaultGenome) -> None:
+        """Export the statistics of the evaluated generation."""
+        stats = self.profiler.generation()
+        if not stats:
+            return
+        if self.path is not None:
+            export_stats(self.path, stats, 'train', generation=self.generation, population=len(population))
+        if self.show:
+            print("Frame phases (mean ms): " + "  ".join(f"{phase} {summary['mean']:.3f}"
+                                                        for phase, summary in stats.items()))
@@ -0,0 +1,366 @@
+import os
+import random
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import neat
+import pygame
+from components.bird import Bird
+from components.pipe import Pipe
+from components.simulation import Simulation, PIPE_DISTANCE, create_pipe
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+SCREEN_HEIGHT: int = 600
+
+# File layout: a header, then one record per episode, then an index of the records and a trailer.
+# A file whose writer did not finish has no index; it is rebuilt by scanning the records.
+MAGIC: bytes = b'FBRP'
+INDEX_MAGIC: bytes = b'FBRI'
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct('<4sH')
+RECORD: struct.Struct = struct.Struct('<IqQIIdI')  # generation, genome id, seed, frames, score, fitness, data length
+INDEX_ENTRY: struct.Struct = struct.Struct('<IqQ')  # generation, genome id, record offset
+TRAILER: struct.Struct = struct.Struct('<QI4s')  # index offset, entry count, index magic
+
+
+class Replay:
+    """One recorded episode of one genome: the course seed and the bird's jump decision on every frame."""
+
+    def __init__(self, generation: int, genome_id: int, seed: int, frames: int, score: int, fitness: float,
+                 jumps: np.ndarray) -> None:
+        """
+        Initialize the Replay.
+
+        Args:
+            generation (int): The generation the episode belongs to.
+            genome_id (int): The genome that flew.
+            seed (int): The seed of the course.
+            frames (int): The number of frames the bird flew.
+            score (int): The bird's final score.
+            fitness (float): The genome's fitness.
+            jumps (np.ndarray): For each frame, whether the network decided to jump.
+        """
+        self.generation: int = generation
+        self.genome_id: int = genome_id
+        self.seed: int = seed
+        self.frames: int = frames
+        self.score: int = score
+        self.fitness: float = fitness
+        self.jumps: np.ndarray = jumps
+
+
+class ReplayWriter(neat.reporting.BaseReporter):
+    """
+    Appends recorded episodes to a replay file as they are evaluated.
+
+    Each record stores the course seed and the bird's jump decisions packed into one bit per frame, so an
+    episode of a thousand frames takes about 160 bytes. As a NEAT reporter, the writer labels records with
+    the current generation.
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        """
+        Initialize the ReplayWriter, creating or truncating the file unless appending to it.
+
+        When appending, the index and trailer of the existing file are dropped and the new records are
+        written after the old ones, so close() writes one index covering both. Resumed runs append, so
+        the episodes recorded before the checkpoint stay in the file.
+
+        Args:
+            path (str): The replay file.
+            append (bool): Keep the episodes already in the file and add the new ones after them.
+
+        Raises:
+            ValueError: If appending to a file that is not a replay file.
+        """
+        self.path: str = path
+        self.generation: int = 0
+        self._index: List[Tuple[int, int, int]] = []
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file: BinaryIO = open(path, 'r+b')
+            header = self._file.read(HEADER.size)
+            if len(header) != HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION):
+                self._file.close()
+                raise ValueError(f"{path} is not a version {VERSION} replay file")
+            index = ReplayFile._read_index(self._file)
+            end = HEADER.size
+            for (generation, genome_id), offset in sorted(index.items(), key=lambda item: item[1]):
+                self._index.append((generation, genome_id, offset))
+                self._file.seek(offset)
+                length = RECORD.unpack(self._file.read(RECORD.size))[-1]
+                end = max(end, offset + RECORD.size + length)
+            # Cut off the old index, or a record left unfinished by a crash
+            self._file.seek(end)
+            self._file.truncate()
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def start_generation(self, generation: int) -> None:
+        """Label the following records with the generation."""
+        self.generation = generation
+
+    def end_generation(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                       species_set: neat.DefaultSpeciesSet) -> None:
+        """Flush the generation's records, so they survive a crash."""
+        self._file.flush()
+
+    def write(self, genome_id: int, seed: int, score: int, fitness: float, jumps: np.ndarray) -> None:
+        """
+        Append one episode.
+
+        Args:
+            genome_id (int): The genome that flew.
+            seed (int): The seed of the course.
+            score (int): The bird's final score.
+            fitness (float): The genome's fitness.
+            jumps (np.ndarray): For each frame the bird flew, whether it decided to jump.
+        """
+        data = np.packbits(jumps).tobytes()
+        self._index.append((self.generation, genome_id, self._file.tell()))
+        self._file.write(RECORD.pack(self.generation, genome_id, seed, len(jumps), score, fitness, len(data)))
+        self._file.write(data)
+
+    def write_simulation(self, genomes: Sequence[neat.DefaultGenome], seed: int, simulation: Simulation) -> None:
+        """
+        Append the episodes of a finished simulation that recorded its jumps.
+
+        Args:
+            genomes (Sequence[neat.DefaultGenome]): The simulated genomes, in order.
+            seed (int): The seed of the course.
+            simulation (Simulation): The simulation.
+        """
+        fitness, scores, _ = simulation.results()
+        for genome, genome_fitness, score, jumps in zip(genomes, fitness, scores, simulation.jump_streams()):
+            self.write(genome.key, seed, score, genome_fitness, jumps)
+
+    def close(self) -> None:
+        """Write the index and close the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(TRAILER.pack(index_offset, len(self._index), INDEX_MAGIC))
+        self._file.close()
+
+
+class ReplayFile:
+    """Reads episodes from a replay file, looked up by generation and genome."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a replay file and load its index.
+
+        Args:
+            path (str): The replay file.
+
+        Raises:
+            ValueError: If the file is not a replay file.
+        """
+        self.path: str = path
+        with open(path, 'rb') as f:
+            magic, version = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} replay file")
+            self.index: Dict[Tuple[int, int], int] = self._read_index(f)
+
+    @staticmethod
+    def _read_index(f: BinaryIO) -> Dict[Tuple[int, int], int]:
+        """
+        Load the index from the end of the file, or rebuild it from the records if the file is unfinished.
+
+        Args:
+            f (BinaryIO): The open file.
+
+        Returns:
+            Dict[Tuple[int, int], int]: The record offset of each (generation, genome id).
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size >= HEADER.size + TRAILER.size:
+            f.seek(size - TRAILER.size)
+            index_offset, count, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic == INDEX_MAGIC and index_offset + count * INDEX_ENTRY.size + TRAILER.size == size:
+                f.seek(index_offset)
+                entries = (INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size)) for _ in range(count))
+                return {(generation, genome_id): offset for generation, genome_id, offset in entries}
+
+        index: Dict[Tuple[int, int], int] = {}
+        offset = f.seek(HEADER.size)
+        while offset + RECORD.size <= size:
+            generation, genome_id, _, _, _, _, length = RECORD.unpack(f.read(RECORD.size))
+            if offset + RECORD.size + length > size:
+                break  # The last record was cut off
+            index[(generation, genome_id)] = offset
+            offset = f.seek(length, os.SEEK_CUR)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of episodes in the file."""
+        return len(self.index)
+
+    def generations(self) -> List[int]:
+        """
+        List the recorded generations.
+
+        Returns:
+            List[int]: The generations, in order.
+        """
+        return sorted({generation for generation, _ in self.index})
+
+    def read(self, generation: int, genome_id: int) -> Replay:
+        """
+        Read one episode.
+
+        Args:
+            generation (int): The generation.
+            genome_id (int): The genome.
+
+        Returns:
+            Replay: The episode.
+
+        Raises:
+            KeyError: If the episode was not recorded.
+        """
+        with open(self.path, 'rb') as f:
+            f.seek(self.index[(generation, genome_id)])
+            return self._read_record(f)
+
+    def __iter__(self) -> Iterator[Replay]:
+        """Read every episode in file order."""
+        with open(self.path, 'rb') as f:
+            for offset in sorted(self.index.values()):
+                f.seek(offset)
+                yield self._read_record(f)
+
+    def best(self, generation: Optional[int] = None) -> Replay:
+        """
+        Find the episode with the highest fitness.
+
+        Args:
+            generation (Optional[int]): Only look at this generation. Defaults to the whole file.
+
+        Returns:
+            Replay: The best episode.
+        """
+        best: Optional[Replay] = None
+        for replay in self:
+            if (generation is None or replay.generation == generation) and (best is None or replay.fitness > best.fitness):
+                best = replay
+        if best is None:
+            raise KeyError(f"No episodes recorded for generation {generation}")
+        return best
+
+    @staticmethod
+    def _read_record(f: BinaryIO) -> Replay:
+        """
+        Read the record at the current file position.
+
+        Args:
+            f (BinaryIO): The open file.
+
+        Returns:
+            Replay: The episode.
+        """
+        generation, genome_id, seed, frames, score, fitness, length = RECORD.unpack(f.read(RECORD.size))
+        jumps = np.unpackbits(np.frombuffer(f.read(length), dtype=np.uint8), count=frames).astype(bool)
+        return Replay(generation, genome_id, seed, frames, score, fitness, jumps)
+
+
+class ReplayPlayer:
+    """
+    Rebuilds a recorded episode with Bird, Pipe and create_pipe, replaying the recorded jumps instead of
+    evaluating a network.
+
+    The course and the physics are deterministic, so stepping the player reproduces the recorded flight
+    frame by frame. Seeking backwards restarts the episode and steps forward without drawing, which
+    takes milliseconds even for long episodes.
+    """
+
+    def __init__(self, replay: Replay) -> None:
+        """
+        Initialize the ReplayPlayer at the start of the episode.
+
+        Args:
+            replay (Replay): The episode to play.
+        """
+        self.replay: Replay = replay
+        self.reset()
+
+    def reset(self) -> None:
+        """Go back to the start of the episode."""
+        self.rng: random.Random = random.Random(self.replay.seed)
+        self.bird: Bird = Bird(random.Random(self.replay.genome_id))
+        self.bird.jump()  # Initial jump to start the game
+        self.pipes: pygame.sprite.Group = pygame.sprite.Group()
+        self.pairs: List[Tuple[Pipe, Pipe]] = []
+        self.frame: int = 0
+        self.passed: int = -1  # Index of the last pair the bird passed
+
+    @property
+    def done(self) -> bool:
+        """bool: Whether every recorded frame has been played."""
+        return self.frame >= self.replay.frames
+
+    def step(self) -> None:
+        """Play one frame, in the same order as Simulation.step."""
+        if self.done:
+            return
+        self.frame += 1
+        if not self.pairs or self.pairs[-1][0].rect.x < SCREEN_WIDTH - PIPE_DISTANCE:
+            pair = create_pipe(self.rng)
+            self.pairs.append(pair)
+            self.pipes.add(*pair)
+
+        self.bird.update()
+        self.pipes.update()
+        while self.pairs and not self.pairs[0][0].alive():
+            self.pairs.pop(0)
+            self.passed -= 1
+
+        if self.replay.jumps[self.frame - 1]:
+            self.bird.jump()
+
+        # The nearest pair is the first whose right edge is past the bird
+        for k, (top_pipe, _) in enumerate(self.pairs):
+            if top_pipe.rect.right > self.bird.rect.left:
+                if self.bird.rect.right > top_pipe.rect.x and k > self.passed:
+                    self.passed = k
+                    self.bird.score += 1
+                break
+
+    def crashed(self) -> bool:
+        """
+        Check whether the bird touches a pipe, the ground or the ceiling in the current frame.
+
+        Returns:
+            bool: True if the bird crashed.
+        """
+        bird = self.bird
+        return bool(pygame.sprite.spritecollide(bird, self.pipes, False, pygame.sprite.collide_mask)
+                    or bird.rect.bottom >= SCREEN_HEIGHT or bird.rect.top <= 0)
+
+    def seek(self, frame: int) -> None:
+        """
+        Jump to a frame.
+
+        Args:
+            frame (int): The frame to show, clamped to the episode.
+        """
+        frame = max(0, min(frame, self.replay.frames))
+        if frame < self.frame:
+            self.reset()
+        while self.frame < frame:
+            self.step()
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw the bird and the pipes.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+        """
+        self.bird.draw(screen)
+        for pipe in self.pipes:
+            pipe.draw(screen)
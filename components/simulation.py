@@ -0,0 +1,354 @@
+import configparser
+import random
+import time
+import numpy as np
+import neat
+from typing import List, Optional, Sequence, Tuple
+from components.pipe import Pipe, PIPE_HEIGHT
+from components.population import BirdPopulation
+from components.pipe_track import PipeTrack
+from components.batch_net import BatchNetwork
+from components.profiler import Profiler, NULL_PROFILER
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+SCREEN_HEIGHT: int = 600
+
+# Game variables
+PIPE_OFFSET: int = 100  # Distance from the right edge of the screen to generate pipes
+PIPE_GAP: int = 150  # Gap between the top and bottom pipes
+PIPE_DISTANCE: int = 200  # Distance in pixels between pipes during training
+
+
+def create_pipe(rng: random.Random = random) -> Tuple[Pipe, Pipe]:
+    """
+    Create a pair of pipes (top and bottom) and return them.
+
+    Args:
+        rng (random.Random): The random number generator that picks the gap height.
+
+    Returns:
+        Tuple[Pipe, Pipe]: A tuple containing the top and bottom pipes.
+    """
+    pipe_height: int = rng.randint(100, SCREEN_HEIGHT - PIPE_GAP - 100)
+    top_pipe: Pipe = Pipe(SCREEN_WIDTH + PIPE_OFFSET, pipe_height, True)
+    bottom_pipe: Pipe = Pipe(SCREEN_WIDTH + PIPE_OFFSET, pipe_height + PIPE_GAP, False)
+    return top_pipe, bottom_pipe
+
+
+class EpisodeBudget:
+    """
+    Limits on how long an episode runs, so one good genome cannot keep a generation going forever.
+
+    Birds still flying when a limit is reached keep the fitness they have earned, without the penalty
+    for dying. The frame limit is reproducible; the time limit depends on the machine and its load.
+    """
+
+    def __init__(self, max_frames: Optional[int] = None, max_seconds: Optional[float] = None,
+                 stop_when_decided: bool = False) -> None:
+        """
+        Initialize the EpisodeBudget.
+
+        Args:
+            max_frames (Optional[int]): Stop after this many frames.
+            max_seconds (Optional[float]): Stop after this many seconds of wall-clock time.
+            stop_when_decided (bool): Stop once a single bird is left and it is already ahead of every
+                dead bird, since flying on cannot change the ranking. This makes a bird's fitness depend
+                on the other birds of its episode.
+        """
+        self.max_frames: Optional[int] = max_frames
+        self.max_seconds: Optional[float] = max_seconds
+        self.stop_when_decided: bool = stop_when_decided
+
+    @property
+    def reproducible(self) -> bool:
+        """bool: Whether a genome's result depends only on the genome, the course and the frame limit."""
+        return self.max_seconds is None and not self.stop_when_decided
+
+
+class DecisionSchedule:
+    """
+    How often the birds' networks are queried.
+
+    With an interval of k, each bird's network decides every k frames and the bird repeats its last
+    decision in between, jumping on every frame of the interval if it decided to jump. This divides the
+    network evaluations by about k. With on_new_pipe, a bird also decides as soon as a new pipe becomes
+    the nearest one, so a long interval does not make it miss the start of a gap.
+    """
+
+    def __init__(self, interval: int = 1, on_new_pipe: bool = False) -> None:
+        """
+        Initialize the DecisionSchedule.
+
+        Args:
+            interval (int): The number of frames between decisions. 1 decides on every frame.
+            on_new_pipe (bool): Also decide when a new pipe becomes the nearest one.
+        """
+        self.interval: int = max(1, interval)
+        self.on_new_pipe: bool = on_new_pipe
+
+    @property
+    def every_frame(self) -> bool:
+        """bool: Whether every bird decides on every frame."""
+        return self.interval == 1
+
+    @staticmethod
+    def from_file(path: str, section: str = 'Training') -> 'DecisionSchedule':
+        """
+        Read the schedule from the [Training] section of a NEAT configuration file, which neat ignores.
+
+        Args:
+            path (str): The configuration file.
+            section (str): The section holding decision_interval and decide_on_new_pipe.
+
+        Returns:
+            DecisionSchedule: The schedule, deciding on every frame if the section is missing.
+        """
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        if not parser.has_section(section):
+            return DecisionSchedule()
+        return DecisionSchedule(parser.getint(section, 'decision_interval', fallback=1),
+                                parser.getboolean(section, 'decide_on_new_pipe', fallback=False))
+
+
+class Simulation:
+    """
+    One training episode: a population of birds, each controlled by a genome, on a shared course.
+
+    The course is generated from a seed, so every Simulation created with the same seed sees the
+    same pipe sequence. Each bird is scored on its own, which means a group of genomes can be split
+    across several Simulations (for example in worker processes) without changing their fitness.
+    """
+
+    def __init__(self, genomes: Sequence[neat.DefaultGenome], config: Optional[neat.Config], seed: int,
+                 profiler: Profiler = NULL_PROFILER, budget: Optional[EpisodeBudget] = None,
+                 record: bool = False, schedule: Optional[DecisionSchedule] = None) -> None:
+        """
+        Initialize the Simulation.
+
+        Args:
+            genomes (Sequence[neat.DefaultGenome]): The genomes to evaluate, one bird each.
+            config (Optional[neat.Config]): The NEAT configuration. If None, no networks are built, genomes
+                only sets the number of birds, and the birds are controlled with observe() and act().
+            seed (int): The seed of the course.
+            profiler (Profiler): Times the phases of each step. The caller starts and ends the frames.
+            budget (Optional[EpisodeBudget]): Limits on the episode length. Defaults to running until every bird has died.
+            record (bool): Keep every bird's jump decisions, for jump_streams().
+            schedule (Optional[DecisionSchedule]): How often the networks decide. Defaults to every frame.
+        """
+        self.nets: Optional[BatchNetwork] = BatchNetwork.create(genomes, config) if config is not None else None
+        size = len(genomes)
+        self.rng: random.Random = random.Random(seed)
+        self.population: BirdPopulation = BirdPopulation(size, random.Random(seed))
+        self.population.jump()  # Initial jump to start the game
+        self.fitness: np.ndarray = np.zeros(size)
+        self.pipes: PipeTrack = PipeTrack(self.rng)
+        self.frame: int = 0
+        self._last_passed: np.ndarray = np.full(size, -1, dtype=np.int64)
+        self.profiler: Profiler = profiler
+        self.budget: EpisodeBudget = budget if budget is not None else EpisodeBudget()
+        self.stopped: bool = False  # Whether the budget ended the episode
+        self._died_at: np.ndarray = np.zeros(size, dtype=np.int64)
+        self._start_time: float = time.perf_counter()
+        self.record: bool = record
+        self._jump_frames: List[np.ndarray] = []
+        self._jump_birds: List[np.ndarray] = []
+        self.schedule: DecisionSchedule = schedule if schedule is not None else DecisionSchedule()
+        self.decisions: int = 0  # Number of network evaluations
+        self._holding: np.ndarray = np.zeros(size, dtype=bool)  # Each bird's last decision
+        self._next_decision: np.ndarray = np.zeros(size, dtype=np.int64)  # The frame each bird decides again
+        self._decided_pipe: np.ndarray = np.full(size, -1, dtype=np.int64)  # The nearest pipe at the last decision
+        self._frame_state: Tuple[np.ndarray, ...] = ()
+
+    @property
+    def done(self) -> bool:
+        """bool: Whether every bird has died or the budget has run out."""
+        return self.stopped or self.population.alive_count == 0
+
+    @property
+    def frames_alive(self) -> np.ndarray:
+        """np.ndarray: The number of frames each bird has flown."""
+        return np.where(self.population.alive, self.frame, self._died_at)
+
+    def step(self) -> None:
+        """Advance the episode by one frame: spawn pipes, move everything, let the networks decide and score the birds."""
+        rows, inputs = self.observe()
+        if len(rows):
+            # Let the networks of all birds that can see a pipe decide in one batch
+            output: np.ndarray = self.nets.activate(inputs, rows)
+            decisions: np.ndarray = output[:, 0] > 0.5
+        else:
+            decisions = np.zeros(0, dtype=bool)
+        self.act(decisions)
+
+    def observe(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start a frame: spawn pipes, move everything and build the network inputs of the birds that see a pipe.
+
+        Finish the frame with act(). step() does both with the genomes' networks; calling them directly
+        lets the birds be controlled from elsewhere, for example by an inference server. Birds that see a
+        pipe but are not due to decide under the schedule repeat their last decision and are not returned.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The birds that have to decide, and their inputs, one row each.
+        """
+        profiler = self.profiler
+        self.frame += 1
+        self.pipes.spawn(PIPE_DISTANCE)
+        profiler.mark('spawn')
+
+        population = self.population
+        pipes = self.pipes
+        population.update()
+        pipes.update()
+        profiler.mark('physics')
+
+        # All living birds share one x column, so the next gap is found for everyone at once
+        alive: np.ndarray = population.alive_indices
+        left: np.ndarray = population.left[alive]
+        nearest: np.ndarray = pipes.nearest(left)
+        sees_pipe: np.ndarray = nearest < len(pipes)
+        rows: np.ndarray = alive[sees_pipe]
+        pair: np.ndarray = nearest[sees_pipe]
+        deciding, deciding_pair = rows, pair
+        schedule = self.schedule
+        if not schedule.every_frame:
+            due: np.ndarray = self._next_decision[rows] <= self.frame
+            if schedule.on_new_pipe:
+                due |= self._decided_pipe[rows] != pipes.number[pair]
+            deciding, deciding_pair = rows[due], pair[due]
+        self._frame_state = (alive, nearest, rows, pair, deciding, deciding_pair)
+        profiler.mark('nearest')
+
+        gap_top: np.ndarray = pipes.gap_top[deciding_pair]
+        inputs: np.ndarray = np.column_stack((
+            population.y[deciding] / SCREEN_HEIGHT,
+            (gap_top - PIPE_HEIGHT) / SCREEN_HEIGHT,  # Top of the top pipe
+            gap_top / SCREEN_HEIGHT,  # Bottom of the top pipe
+            pipes.x[deciding_pair] / SCREEN_WIDTH
+        ))
+        return deciding, inputs
+
+    def act(self, decisions: np.ndarray) -> None:
+        """
+        Finish the frame started by observe(): apply the jump decisions, then score the birds and check for crashes.
+
+        Args:
+            decisions (np.ndarray): For each bird returned by observe(), whether it jumps.
+        """
+        profiler = self.profiler
+        population = self.population
+        pipes = self.pipes
+        alive, nearest, rows, pair, deciding, deciding_pair = self._frame_state
+        self.decisions += len(deciding)
+        if len(rows):
+            if deciding is rows:
+                jumping: np.ndarray = rows[decisions]
+            else:
+                # Birds that decided start a new interval; the others repeat their last decision
+                self._holding[deciding] = decisions
+                self._next_decision[deciding] = self.frame + self.schedule.interval
+                self._decided_pipe[deciding] = pipes.number[deciding_pair]
+                jumping = rows[self._holding[rows]]
+            population.jump(jumping)
+            if self.record:
+                self._jump_frames.append(np.full(len(jumping), self.frame))
+                self._jump_birds.append(jumping)
+            profiler.mark('activation')
+
+            self.fitness[rows] += 0.1  # Reward for staying alive
+
+            passing = (population.right[rows] > pipes.x[pair]) & (self._last_passed[rows] < pipes.number[pair])
+            passed = rows[passing]
+            self._last_passed[passed] = pipes.number[pair[passing]]
+            self.fitness[passed] += 5  # Reward for passing a pipe
+            population.score[passed] += 1  # Increment bird's score for passing a pipe
+            profiler.mark('scoring')
+
+        # Check if birds hit the ground, pipe, or ceiling
+        top: np.ndarray = population.y[alive]
+        dead: np.ndarray = alive[
+            pipes.collides(population, alive, nearest)
+            | (top + population.extent[alive] >= SCREEN_HEIGHT)
+            | (top <= 0)  # Check for collision with the ceiling
+        ]
+        self.fitness[dead] -= 1  # Penalize for hitting ground, pipe, or ceiling
+        if len(dead):
+            population.kill(dead)
+            self._died_at[dead] = self.frame
+        profiler.mark('collision')
+
+        if population.alive_count:
+            self.stopped = self.out_of_budget()
+
+    def out_of_budget(self) -> bool:
+        """
+        Check whether the budget ends the episode while birds are still flying.
+
+        Returns:
+            bool: True if the episode should stop.
+        """
+        budget = self.budget
+        if budget.max_frames is not None and self.frame >= budget.max_frames:
+            return True
+        if budget.max_seconds is not None and time.perf_counter() - self._start_time >= budget.max_seconds:
+            return True
+        if budget.stop_when_decided and self.population.alive_count == 1 and len(self.fitness) > 1:
+            # The last bird only gains fitness, so it stays first once it is ahead even after the death penalty
+            leader = self.population.alive_indices[0]
+            others = np.delete(self.fitness, leader)
+            return bool(self.fitness[leader] - 1 > others.max())
+        return False
+
+    def run(self) -> None:
+        """Step the episode until every bird has died or the budget has run out."""
+        while not self.done:
+            self.step()
+
+    def jump_streams(self) -> List[np.ndarray]:
+        """
+        Get the recorded jump decisions of every bird.
+
+        Returns:
+            List[np.ndarray]: For each bird, a boolean per frame it flew that is True if its network decided to jump.
+        """
+        frames = np.concatenate(self._jump_frames) if self._jump_frames else np.zeros(0, dtype=np.int64)
+        birds = np.concatenate(self._jump_birds) if self._jump_birds else np.zeros(0, dtype=np.int64)
+        order = np.argsort(birds, kind='stable')
+        frames = frames[order]
+        bounds = np.searchsorted(birds[order], np.arange(len(self.fitness) + 1))
+        streams = [np.zeros(flown, dtype=bool) for flown in self.frames_alive.tolist()]
+        for bird, stream in enumerate(streams):
+            stream[frames[bounds[bird]:bounds[bird + 1]] - 1] = True
+        return streams
+
+    def results(self) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Get the results of the episode.
+
+        Returns:
+            Tuple[List[float], List[int], List[int]]: The fitness, final score and frames flown of each genome.
+        """
+        return self.fitness.tolist(), self.population.score.tolist(), self.frames_alive.tolist()
+
+
+def simulate(genomes: Sequence[neat.DefaultGenome], config: neat.Config, seed: int,
+             budget: Optional[EpisodeBudget] = None,
+             schedule: Optional[DecisionSchedule] = None) -> Tuple[List[float], List[int], List[int]]:
+    """
+    Run a headless episode and return the results instead of storing them on the genomes.
+
+    Args:
+        genomes (Sequence[neat.DefaultGenome]): The genomes to evaluate.
+        config (neat.Config): The NEAT configuration.
+        seed (int): The seed of the course.
+        budget (Optional[EpisodeBudget]): Limits on the episode length.
+        schedule (Optional[DecisionSchedule]): How often the networks decide.
+
+    Returns:
+        Tuple[List[float], List[int], List[int]]: The fitness, final score and frames flown of each genome.
+    """
+    simulation = Simulation(genomes, config, seed, budget=budget, schedule=schedule)
+    simulation.run()
+    return simulation.results()
@@ -0,0 +1,176 @@
+import configparser
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import neat
+from components.pipe import PIPE_VELOCITY
+from components.simulation import PIPE_DISTANCE, EpisodeBudget
+from components.vector_env import course_seeds, evaluate_courses
+
+# Fitness rewards, matching Simulation
+ALIVE_REWARD: float = 0.1
+PIPE_REWARD: float = 5.0
+
+# A bird loses at most the death penalty, so its fitness is always above -STAGE_GAP
+STAGE_GAP: float = 1.0
+
+
+def stage_ceiling(max_frames: int) -> float:
+    """
+    The most fitness a bird can earn in an episode of at most this many frames.
+
+    Args:
+        max_frames (int): The frame limit.
+
+    Returns:
+        float: The alive reward of every frame plus the reward of every pipe that can be passed, one
+        every PIPE_DISTANCE / |PIPE_VELOCITY| frames.
+    """
+    return ALIVE_REWARD * max_frames + PIPE_REWARD * (max_frames // (PIPE_DISTANCE // -PIPE_VELOCITY) + 1)
+
+
+class Stage:
+    """One stage of a staged evaluation: how long and on how many courses its genomes fly, and how many move on."""
+
+    def __init__(self, max_frames: int, courses: int = 1, promote: float = 0.25) -> None:
+        """
+        Initialize the Stage.
+
+        Args:
+            max_frames (int): End every episode of the stage after this many frames.
+            courses (int): The number of courses each genome flies; its fitness is the mean over them.
+            promote (float): The fraction of the stage's genomes that fly the next stage. At least one
+                genome is always promoted. Unused in the last stage.
+        """
+        self.max_frames: int = max(1, max_frames)
+        self.courses: int = max(1, courses)
+        self.promote: float = min(1.0, max(0.0, promote))
+
+
+class StagedEvaluation:
+    """
+    Evaluates a generation in stages of growing length, giving the longer stages only to the best genomes.
+
+    Every genome flies the short first stage. The best fraction of them fly the second stage, which
+    is longer and may use more courses, and so on. Hopeless genomes are dropped after a cheap episode
+    and only promising ones pay for the long ones.
+
+    A genome's fitness is its fitness in the last stage it flew, raised by a fixed offset per stage:
+    the most fitness any bird can earn in all earlier stages, plus STAGE_GAP for each. Genomes that got
+    further therefore always rank higher, and genomes that stopped at the same stage rank by that
+    stage's fitness, so neat.Population sees one consistent ranking. Since the offsets depend only on
+    the stage frame limits, a fitness means the same in every generation, which the stagnation check,
+    the checkpointed best genome and the telemetry rely on.
+    """
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        """
+        Initialize the StagedEvaluation.
+
+        Args:
+            stages (Sequence[Stage]): The stages, shortest first.
+
+        Raises:
+            ValueError: If there are no stages.
+        """
+        if not stages:
+            raise ValueError("A staged evaluation needs at least one stage")
+        self.stages: List[Stage] = list(stages)
+        self.offsets: List[float] = [0.0]
+        for stage in self.stages[:-1]:
+            self.offsets.append(self.offsets[-1] + stage_ceiling(stage.max_frames) + STAGE_GAP)
+        self.report: List[Dict[str, float]] = []
+
+    @staticmethod
+    def from_file(path: str, section: str = 'Training') -> Optional['StagedEvaluation']:
+        """
+        Read the stages from the [Training] section of a NEAT configuration file.
+
+        stage_frames lists the frame limit of each stage. stage_courses and stage_promote list the
+        courses and promoted fraction of each stage, or give one value for all of them.
+
+        Args:
+            path (str): The configuration file.
+            section (str): The section holding stage_frames, stage_courses and stage_promote.
+
+        Returns:
+            Optional[StagedEvaluation]: The staged evaluation, or None if stage_frames is missing or empty.
+
+        Raises:
+            ValueError: If stage_courses or stage_promote has neither one value nor one per stage.
+        """
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        frames = [int(value) for value in parser.get(section, 'stage_frames', fallback='').split()]
+        if not frames:
+            return None
+
+        def per_stage(option: str, default: str, kind: type) -> list:
+            """Read an option with one value, or one value per stage."""
+            values = [kind(value) for value in parser.get(section, option, fallback=default).split()]
+            if len(values) == 1:
+                values *= len(frames)
+            if len(values) != len(frames):
+                raise ValueError(f"{option} needs one value or one per stage ({len(frames)}), got {len(values)}")
+            return values
+
+        courses = per_stage('stage_courses', '1', int)
+        promote = per_stage('stage_promote', '0.25', float)
+        return StagedEvaluation([Stage(*stage) for stage in zip(frames, courses, promote)])
+
+    def evaluate(self, genomes: Sequence[neat.DefaultGenome], config: neat.Config,
+                 seed: int) -> Tuple[List[float], List[int], List[int]]:
+        """
+        Evaluate genomes stage by stage and record the work each stage did in report.
+
+        Args:
+            genomes (Sequence[neat.DefaultGenome]): The genomes to evaluate.
+            config (neat.Config): The NEAT configuration.
+            seed (int): The seed of the first course of every stage.
+
+        Returns:
+            Tuple[List[float], List[int], List[int]]: The combined fitness of each genome, and its best
+            score and mean frames flown in the last stage it flew.
+        """
+        fitness = np.zeros(len(genomes))
+        scores = np.zeros(len(genomes), dtype=np.int64)
+        frames = np.zeros(len(genomes), dtype=np.int64)
+        active = np.arange(len(genomes))
+        self.report = []
+
+        for index, stage in enumerate(self.stages):
+            start = time.perf_counter()
+            stage_fitness, stage_scores, stage_frames = evaluate_courses(
+                [genomes[i] for i in active], config, course_seeds(seed, stage.courses),
+                EpisodeBudget(stage.max_frames))
+            stage_fitness = np.array(stage_fitness)
+            fitness[active] = stage_fitness + self.offsets[index]
+            scores[active] = stage_scores
+            frames[active] = stage_frames
+            self.report.append({
+                'stage': index + 1, 'genomes': len(active), 'courses': stage.courses,
+                'max_frames': stage.max_frames, 'bird_frames': int(np.sum(stage_frames)) * stage.courses,
+                'seconds': time.perf_counter() - start,
+            })
+
+            if index == len(self.stages) - 1 or len(active) <= 1:
+                break
+            keep = max(1, int(round(len(active) * stage.promote)))
+            order = np.argsort(-stage_fitness, kind='stable')
+            active = active[order[:keep]]
+
+        return fitness.tolist(), scores.tolist(), frames.tolist()
+
+    def format_report(self) -> str:
+        """
+        Describe the work of each stage of the last evaluation.
+
+        Returns:
+            str: One part per stage with its genomes, courses, frame limit, bird frames and time.
+        """
+        total = sum(stage['bird_frames'] for stage in self.report) or 1
+        return " | ".join(
+            f"Stage {stage['stage']}: {stage['genomes']} genomes x {stage['courses']} "
+            f"course{'s' if stage['courses'] > 1 else ''} x {stage['max_frames']} frames, "
+            f"{stage['bird_frames']:,} bird frames ({stage['bird_frames'] / total:.0%}) in {stage['seconds']:.2f} s"
+            for stage in self.report)
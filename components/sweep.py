@@ -0,0 +1,459 @@
+import configparser
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from components.telemetry import TelemetryTail
+
+# Every trial is an ordinary headless run of main.py in its own directory
+MAIN_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+TRIAL_CONFIG: str = 'config-feedforward.txt'
+TRIAL_LOG: str = 'train.log'
+TRIAL_TELEMETRY: str = 'telemetry.jsonl'
+
+# A 'key = value' line of a configuration file
+SETTING_PATTERN = re.compile(r"^(\s*)([A-Za-z_]\w*)(\s*=\s*)(.*?)(\s*)$")
+
+Value = Union[int, float, str]
+
+
+def parse_value(text: str) -> Value:
+    """
+    Read a setting value as an int or a float if it is one.
+
+    Args:
+        text (str): The value as written.
+
+    Returns:
+        Value: The number, or the text itself.
+    """
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+class Parameter:
+    """
+    One setting of the search space: either a list of values or a range sampled uniformly.
+
+    Written as 'name=1,2,3' for a list or 'name=0.1:0.9' for a range, where name is a key of the
+    configuration file, optionally prefixed with its section as in 'DefaultGenome.conn_add_prob'.
+    A range of two ints samples ints.
+    """
+
+    def __init__(self, name: str, values: Optional[List[Value]] = None,
+                 low: Optional[float] = None, high: Optional[float] = None) -> None:
+        """
+        Initialize the Parameter.
+
+        Args:
+            name (str): The setting, optionally prefixed with its section and a dot.
+            values (Optional[List[Value]]): The values to try. None for a range.
+            low (Optional[float]): The lowest value of a range.
+            high (Optional[float]): The highest value of a range.
+        """
+        self.name: str = name
+        self.values: Optional[List[Value]] = values
+        self.low: Optional[float] = low
+        self.high: Optional[float] = high
+
+    @staticmethod
+    def parse(text: str) -> 'Parameter':
+        """
+        Parse a parameter from the command line.
+
+        Args:
+            text (str): 'name=v1,v2,...' or 'name=low:high'.
+
+        Returns:
+            Parameter: The parameter.
+
+        Raises:
+            ValueError: If the text has neither form.
+        """
+        name, separator, spec = text.partition('=')
+        name, spec = name.strip(), spec.strip()
+        if not separator or not name or not spec:
+            raise ValueError(f"Expected name=v1,v2,... or name=low:high, got '{text}'")
+        if ':' in spec:
+            low, high = (parse_value(part.strip()) for part in spec.split(':', 1))
+            if isinstance(low, str) or isinstance(high, str) or low > high:
+                raise ValueError(f"Invalid range '{spec}' for {name}")
+            return Parameter(name, low=low, high=high)
+        return Parameter(name, values=[parse_value(part.strip()) for part in spec.split(',')])
+
+    @property
+    def is_range(self) -> bool:
+        """bool: True if the values are sampled from a range rather than listed."""
+        return self.values is None
+
+    def sample(self, rng: random.Random) -> Value:
+        """
+        Draw a value.
+
+        Args:
+            rng (random.Random): The random number generator.
+
+        Returns:
+            Value: One of the listed values, or a uniform value of the range.
+        """
+        if self.values is not None:
+            return rng.choice(self.values)
+        if isinstance(self.low, int) and isinstance(self.high, int):
+            return rng.randint(self.low, self.high)
+        return float(f"{rng.uniform(self.low, self.high):.4g}")
+
+
+def grid_variants(parameters: Sequence[Parameter]) -> List[Dict[str, Value]]:
+    """
+    List every combination of the parameters' values.
+
+    Args:
+        parameters (Sequence[Parameter]): Parameters with listed values.
+
+    Returns:
+        List[Dict[str, Value]]: One override dictionary per combination.
+
+    Raises:
+        ValueError: If a parameter is a range, which has no grid.
+    """
+    if any(parameter.is_range for parameter in parameters):
+        raise ValueError("Ranges can only be sampled; set a number of samples for a random search")
+    names = [parameter.name for parameter in parameters]
+    return [dict(zip(names, values)) for values in itertools.product(*(p.values for p in parameters))]
+
+
+def random_variants(parameters: Sequence[Parameter], samples: int, rng: random.Random) -> List[Dict[str, Value]]:
+    """
+    Draw random combinations of the parameters' values, without repeating one.
+
+    Args:
+        parameters (Sequence[Parameter]): The parameters.
+        samples (int): The number of combinations to draw.
+        rng (random.Random): The random number generator.
+
+    Returns:
+        List[Dict[str, Value]]: Up to samples override dictionaries; fewer if the space has fewer combinations.
+    """
+    variants: List[Dict[str, Value]] = []
+    seen = set()
+    for _ in range(samples * 20):
+        if len(variants) == samples:
+            break
+        variant = {parameter.name: parameter.sample(rng) for parameter in parameters}
+        key = tuple(variant.items())
+        if key not in seen:
+            seen.add(key)
+            variants.append(variant)
+    return variants
+
+
+def find_settings(base_path: str, names: Sequence[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Find the section and key of settings of a configuration file.
+
+    Args:
+        base_path (str): The configuration file.
+        names (Sequence[str]): Setting names, optionally prefixed with the section.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: The section and key of each setting, by name.
+
+    Raises:
+        ValueError: If a setting is not in the file, or is in several sections and has no section prefix.
+    """
+    parser = configparser.ConfigParser()
+    if not parser.read(base_path):
+        raise ValueError(f"Cannot read {base_path}")
+    settings: Dict[str, Tuple[str, str]] = {}
+    for name in names:
+        section, _, key = name.rpartition('.')
+        sections = [s for s in parser.sections() if parser.has_option(s, key) and section in ('', s)]
+        if not sections:
+            raise ValueError(f"'{name}' is not a setting of {base_path}")
+        if len(sections) > 1:
+            raise ValueError(f"'{key}' is in sections {', '.join(sections)}; write it as section.{key}")
+        settings[name] = (sections[0], key)
+    return settings
+
+
+def write_variant(base_path: str, overrides: Dict[str, Value], path: str) -> None:
+    """
+    Write a copy of a configuration file with some settings changed.
+
+    The copy keeps the comments and layout of the original; only the values of the overridden
+    lines change.
+
+    Args:
+        base_path (str): The configuration file to copy.
+        overrides (Dict[str, Value]): New values by setting name, optionally prefixed with the section.
+        path (str): The file to write.
+
+    Raises:
+        ValueError: If a setting is not in the file, or is in several sections and has no section prefix.
+    """
+    settings = find_settings(base_path, list(overrides))
+    targets = {settings[name]: value for name, value in overrides.items()}
+
+    lines: List[str] = []
+    section = ''
+    with open(base_path) as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                section = stripped[1:-1]
+            match = SETTING_PATTERN.match(line.rstrip('\n'))
+            if match and (section, match.group(2)) in targets:
+                indent, key, equals = match.group(1, 2, 3)
+                line = f"{indent}{key}{equals}{targets[(section, key)]}\n"
+            lines.append(line)
+    with open(path, 'w') as f:
+        f.writelines(lines)
+
+
+class Trial:
+    """One configuration of a sweep, trained in its own directory and resumed from its checkpoint at every rung."""
+
+    def __init__(self, number: int, overrides: Dict[str, Value], directory: str) -> None:
+        """
+        Initialize the Trial.
+
+        Args:
+            number (int): The trial's number in the sweep.
+            overrides (Dict[str, Value]): The settings that differ from the base configuration.
+            directory (str): The directory for its configuration, checkpoints, telemetry and log.
+        """
+        self.number: int = number
+        self.overrides: Dict[str, Value] = overrides
+        self.directory: str = directory
+        self.generations: int = 0
+        self.best_fitness: Optional[float] = None
+        self.genomes: int = 0
+        self.train_seconds: float = 0.0
+        self.wall_seconds: float = 0.0
+        self.stopped_at: Optional[int] = None  # The budget of the rung it was pruned at
+        self.finished: bool = False  # Reached the fitness threshold, so it cannot be resumed
+        self.error: Optional[str] = None
+
+    @property
+    def config_path(self) -> str:
+        """str: The trial's configuration file."""
+        return os.path.join(self.directory, TRIAL_CONFIG)
+
+    @property
+    def throughput(self) -> float:
+        """float: Genomes evaluated per second of training."""
+        return self.genomes / self.train_seconds if self.train_seconds > 0 else 0.0
+
+    def read_telemetry(self) -> None:
+        """Update the trial's results from its telemetry log."""
+        records = TelemetryTail(os.path.join(self.directory, TRIAL_TELEMETRY)).read()
+        if not records:
+            return
+        self.generations = records[-1]['generation'] + 1
+        self.best_fitness = max(record['best']['fitness'] for record in records)
+        self.genomes = sum(record['population'] for record in records)
+        self.train_seconds = sum(record.get('seconds', record['evaluation_seconds']) for record in records)
+        self.finished = bool(records[-1].get('solved'))
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Describe the trial's results.
+
+        Returns:
+            Dict[str, object]: The settings and measurements, ready to be written as JSON.
+        """
+        return {
+            'trial': self.number, 'overrides': self.overrides, 'generations': self.generations,
+            'best_fitness': self.best_fitness, 'genomes': self.genomes, 'train_seconds': round(self.train_seconds, 3),
+            'wall_seconds': round(self.wall_seconds, 3), 'genomes_per_second': round(self.throughput, 1),
+            'stopped_at': self.stopped_at, 'finished': self.finished, 'error': self.error,
+        }
+
+
+def train_trial(trial: Trial, generations: int, seed: Optional[int] = None, max_frames: Optional[int] = None,
+                courses: int = 1) -> Trial:
+    """
+    Train a trial up to a total number of generations, resuming from its newest checkpoint.
+
+    The run checkpoints exactly at its last generation, so the next rung continues where this one
+    stopped. It runs in a separate process with its output in the trial's log.
+
+    Args:
+        trial (Trial): The trial.
+        generations (int): The total number of generations to reach.
+        seed (Optional[int]): Passed to main.py so every trial flies the same courses.
+        max_frames (Optional[int]): Passed to main.py to bound each generation.
+        courses (int): Passed to main.py to fly several courses per generation.
+
+    Returns:
+        Trial: The trial, with its results updated.
+    """
+    remaining = generations - trial.generations
+    if remaining <= 0 or trial.finished or trial.error is not None:
+        return trial
+    command = [sys.executable, MAIN_PATH, '--headless', '--quiet', '--resume', '--config', TRIAL_CONFIG,
+               '--generations', str(generations), '--checkpoint-every', str(remaining), '--checkpoint-seconds', '0',
+               '--telemetry', TRIAL_TELEMETRY, '--courses', str(courses)]
+    if seed is not None:
+        command += ['--seed', str(seed)]
+    if max_frames is not None:
+        command += ['--max-frames', str(max_frames)]
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    start = time.perf_counter()
+    with open(os.path.join(trial.directory, TRIAL_LOG), 'a') as log:
+        result = subprocess.run(command, cwd=trial.directory, env=env, stdout=log, stderr=subprocess.STDOUT)
+    trial.wall_seconds += time.perf_counter() - start
+    trial.read_telemetry()
+    if result.returncode != 0:
+        trial.error = f"exit status {result.returncode}, see {os.path.join(trial.directory, TRIAL_LOG)}"
+    return trial
+
+
+def halving_rungs(min_generations: int, max_generations: int, eta: int) -> List[int]:
+    """
+    List the generation budgets of successive halving.
+
+    Args:
+        min_generations (int): The budget of the first rung.
+        max_generations (int): The budget of the last rung.
+        eta (int): The factor the budget grows by, and the number of trials shrinks by, at every rung.
+
+    Returns:
+        List[int]: The total number of generations at each rung, ending with max_generations.
+    """
+    rungs: List[int] = []
+    generations = max(1, min_generations)
+    while generations < max_generations and eta > 1:
+        rungs.append(generations)
+        generations *= eta
+    rungs.append(max_generations)
+    return rungs
+
+
+def ranking_key(trial: Trial) -> tuple:
+    """
+    Order trials from best to worst: working trials by their best fitness, then failed ones.
+
+    Args:
+        trial (Trial): The trial.
+
+    Returns:
+        tuple: A key that sorts the best trial first.
+    """
+    fitness = trial.best_fitness if trial.best_fitness is not None else float('-inf')
+    return (trial.error is not None, -fitness, trial.number)
+
+
+class SuccessiveHalving:
+    """
+    Trains many configurations on a small generation budget, then keeps training only the best.
+
+    Every rung trains the surviving trials in parallel up to the rung's budget, ranks them by their
+    best fitness and keeps the best 1/eta of them for the next rung, whose budget is eta times larger.
+    Poor configurations are dropped after a few generations, so most of the CPU time goes to the
+    promising ones.
+    """
+
+    def __init__(self, trials: List[Trial], rungs: List[int], eta: int = 3, jobs: int = 1,
+                 seed: Optional[int] = None, max_frames: Optional[int] = None, courses: int = 1) -> None:
+        """
+        Initialize the SuccessiveHalving.
+
+        Args:
+            trials (List[Trial]): The trials, with their configuration files written.
+            rungs (List[int]): The generation budget of every rung, as returned by halving_rungs.
+            eta (int): Keep the best 1/eta of the trials after every rung.
+            jobs (int): The number of trials trained at the same time.
+            seed (Optional[int]): The course seed of every trial.
+            max_frames (Optional[int]): The frame limit of every generation.
+            courses (int): The number of courses per generation.
+        """
+        self.trials: List[Trial] = trials
+        self.rungs: List[int] = rungs
+        self.eta: int = max(2, eta)
+        self.jobs: int = max(1, jobs)
+        self.seed: Optional[int] = seed
+        self.max_frames: Optional[int] = max_frames
+        self.courses: int = courses
+
+    def run(self, report: Callable[[str], None] = print) -> List[Trial]:
+        """
+        Run every rung.
+
+        Args:
+            report (Callable[[str], None]): Called with a line of progress after every rung.
+
+        Returns:
+            List[Trial]: All trials, best first.
+        """
+        alive = list(self.trials)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for index, generations in enumerate(self.rungs):
+                start = time.perf_counter()
+                list(executor.map(lambda trial: train_trial(trial, generations, self.seed, self.max_frames,
+                                                            self.courses), alive))
+                alive.sort(key=ranking_key)
+                best = alive[0]
+                report(f"Rung {index + 1}/{len(self.rungs)}: {len(alive)} trials to {generations} generations "
+                       f"in {time.perf_counter() - start:.1f} s, best trial {best.number} "
+                       f"with fitness {best.best_fitness if best.best_fitness is not None else float('nan'):.1f}")
+                if index < len(self.rungs) - 1:
+                    keep = max(1, len(alive) // self.eta)
+                    for trial in alive[keep:]:
+                        trial.stopped_at = generations
+                    alive = alive[:keep]
+        return sorted(self.trials, key=lambda trial: (trial.stopped_at is not None,
+                                                      -(trial.stopped_at or 0)) + ranking_key(trial))
+
+
+def format_table(trials: List[Trial]) -> str:
+    """
+    Format the results of a sweep as a table, one trial per line.
+
+    Args:
+        trials (List[Trial]): The trials, in the order to show them.
+
+    Returns:
+        str: The table.
+    """
+    lines = [f"{'rank':>4}  {'trial':>5}  {'gens':>5}  {'best fitness':>12}  {'genomes/s':>9}  {'train s':>8}  "
+             f"{'status':<14}  settings"]
+    for rank, trial in enumerate(trials, start=1):
+        if trial.error is not None:
+            status = 'failed'
+        elif trial.finished:
+            status = 'solved'
+        elif trial.stopped_at is not None:
+            status = f"pruned at {trial.stopped_at}"
+        else:
+            status = 'survived'
+        fitness = f"{trial.best_fitness:12.1f}" if trial.best_fitness is not None else f"{'-':>12}"
+        settings = ' '.join(f"{name}={value}" for name, value in trial.overrides.items())
+        lines.append(f"{rank:>4}  {trial.number:>5}  {trial.generations:>5}  {fitness}  {trial.throughput:>9.0f}  "
+                     f"{trial.train_seconds:>8.1f}  {status:<14}  {settings}")
+    return '\n'.join(lines)
+
+
+def save_results(trials: List[Trial], path: str) -> None:
+    """
+    Write the results of a sweep as JSON.
+
+    Args:
+        trials (List[Trial]): The trials, best first.
+        path (str): The file to write.
+    """
+    with open(path, 'w') as f:
+        json.dump([trial.to_dict() for trial in trials], f, indent=2)
@@ -0,0 +1,219 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, TextIO
+import numpy as np
+import neat
+
+# Number of bins of the fitness histogram stored per generation
+HISTOGRAM_BINS: int = 10
+
+# Characters of the sparkline drawn by the viewer, from low to high
+SPARK_CHARACTERS: str = " ▁▂▃▄▅▆▇█"
+
+
+def compact(value: float) -> float:
+    """
+    Round a statistic so the log stays short.
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        float: The value with six significant digits.
+    """
+    return float(f"{value:.6g}")
+
+
+def fitness_summary(fitness: np.ndarray) -> Dict[str, object]:
+    """
+    Describe the fitness distribution of a generation.
+
+    Args:
+        fitness (np.ndarray): The fitness of every genome.
+
+    Returns:
+        Dict[str, object]: The minimum, maximum, mean, standard deviation, 10th, 50th and 90th percentile,
+        and a histogram of HISTOGRAM_BINS equal bins between the minimum and the maximum.
+    """
+    p10, p50, p90 = np.percentile(fitness, [10, 50, 90])
+    counts, _ = np.histogram(fitness, bins=HISTOGRAM_BINS)
+    return {
+        'min': compact(fitness.min()), 'max': compact(fitness.max()),
+        'mean': compact(fitness.mean()), 'stdev': compact(fitness.std()),
+        'p10': compact(p10), 'p50': compact(p50), 'p90': compact(p90),
+        'histogram': counts.tolist(),
+    }
+
+
+class TelemetryReporter(neat.reporting.BaseReporter):
+    """
+    A NEAT reporter that streams per-generation statistics to an append-only JSON Lines file.
+
+    Unlike neat.StatisticsReporter, which keeps the best genome and the species sizes of every
+    generation, it summarizes each generation into one short record (the fitness distribution, the
+    species sizes, the size of the best genome and the timings), hands the record to a background
+    thread that appends it to the log, and keeps only the most recent records in memory. Memory use
+    stays flat however long the run is, and the log can be watched while training runs.
+    """
+
+    def __init__(self, path: str, window: int = 100) -> None:
+        """
+        Initialize the TelemetryReporter, appending to the file if it exists.
+
+        Args:
+            path (str): The JSON Lines file.
+            window (int): The number of recent records kept in memory.
+        """
+        self.path: str = path
+        self.recent: Deque[Dict[str, object]] = deque(maxlen=window)
+        self.generation: int = 0
+        self.extinctions: int = 0
+        self._generation_start: float = time.perf_counter()
+        self._pending: Optional[Dict[str, object]] = None
+        self._file: TextIO = open(path, 'a')
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+    def start_generation(self, generation: int) -> None:
+        """Start timing a generation."""
+        self.generation = generation
+        self._generation_start = time.perf_counter()
+
+    def post_evaluate(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                      species: neat.DefaultSpeciesSet, best_genome: neat.DefaultGenome) -> None:
+        """Summarize the evaluated generation."""
+        fitness = np.array([genome.fitness for genome in population.values() if genome.fitness is not None])
+        nodes, connections = best_genome.size()
+        self._pending = {
+            'generation': self.generation,
+            'time': round(time.time(), 3),
+            'population': len(population),
+            'evaluation_seconds': compact(time.perf_counter() - self._generation_start),
+            'fitness': fitness_summary(fitness) if len(fitness) else None,
+            'species': {str(key): len(s.members) for key, s in species.species.items()},
+            'best': {'key': best_genome.key, 'fitness': compact(best_genome.fitness),
+                     'nodes': nodes, 'connections': connections},
+        }
+
+    def complete_extinction(self) -> None:
+        """Count extinctions."""
+        self.extinctions += 1
+
+    def end_generation(self, config: neat.Config, population: Dict[int, neat.DefaultGenome],
+                       species_set: neat.DefaultSpeciesSet) -> None:
+        """Add the reproduction time and write the generation's record."""
+        if self._pending is not None:
+            self._pending['seconds'] = compact(time.perf_counter() - self._generation_start)
+            self._submit()
+
+    def found_solution(self, config: neat.Config, generation: int, best: neat.DefaultGenome) -> None:
+        """Write the last generation's record, since the run stops before end_generation."""
+        if self._pending is not None:
+            self._pending['solved'] = True
+            self._submit()
+
+    def _submit(self) -> None:
+        """Keep the pending record in the window and queue it for the background writer."""
+        record = self._pending
+        record['extinctions'] = self.extinctions
+        self._pending = None
+        self.recent.append(record)
+        self._executor.submit(self._write, json.dumps(record, separators=(',', ':')) + '\n')
+
+    def _write(self, line: str) -> None:
+        """
+        Append a record and flush it, so viewers see it right away. Runs on the background thread.
+
+        Args:
+            line (str): The JSON line.
+        """
+        self._file.write(line)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write the records still queued and close the log."""
+        if self._pending is not None:
+            self._submit()
+        self._executor.shutdown()
+        self._file.close()
+
+
+class TelemetryTail:
+    """Reads the records appended to a telemetry log since the last read, without interfering with the writer."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the TelemetryTail at the start of the file.
+
+        Args:
+            path (str): The JSON Lines file.
+        """
+        self.path: str = path
+        self.offset: int = 0
+        self._partial: str = ''
+
+    def read(self) -> List[Dict[str, object]]:
+        """
+        Read the complete records written since the last call.
+
+        Returns:
+            List[Dict[str, object]]: The new records, oldest first.
+        """
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            self.offset, self._partial = 0, ''  # The log was replaced by a new one
+        with open(self.path) as f:
+            f.seek(self.offset)
+            text = self._partial + f.read()
+            self.offset = f.tell()
+        lines = text.split('\n')
+        self._partial = lines.pop()  # A line the writer has not finished yet
+        records = []
+        for line in lines:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+
+def sparkline(values: List[float]) -> str:
+    """
+    Draw values as a line of block characters.
+
+    Args:
+        values (List[float]): The values, oldest first.
+
+    Returns:
+        str: One character per value, higher blocks for higher values.
+    """
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    steps = len(SPARK_CHARACTERS) - 1
+    if high == low:
+        return SPARK_CHARACTERS[steps // 2] * len(values)
+    return ''.join(SPARK_CHARACTERS[1 + round((value - low) / (high - low) * (steps - 1))] for value in values)
+
+
+def format_record(record: Dict[str, object]) -> str:
+    """
+    Format a generation's record on one line.
+
+    Args:
+        record (Dict[str, object]): The record.
+
+    Returns:
+        str: The generation, fitness percentiles, species, best genome size and timing.
+    """
+    fitness = record.get('fitness') or {}
+    best = record['best']
+    species = record['species']
+    return (f"{record['generation']:>6}  best {best['fitness']:>10.2f}  max {fitness.get('max', 0):>10.2f}  "
+            f"p90 {fitness.get('p90', 0):>9.2f}  mean {fitness.get('mean', 0):>9.2f}  "
+            f"species {len(species):>3} (largest {max(species.values(), default=0):>3})  "
+            f"best size {best['nodes']}/{best['connections']}  {record.get('seconds', record['evaluation_seconds']):.3f} s")
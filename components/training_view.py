@@ -0,0 +1,176 @@
+import numpy as np
+import pygame
+from typing import List, Optional, Tuple
+from components.assets import assets
+from components.background import Sky
+from components.simulation import Simulation
+from components.profiler import Profiler, NULL_PROFILER
+
+# Colors
+BLACK: Tuple[int, int, int] = (0, 0, 0)
+BLUE: Tuple[int, int, int] = (135, 206, 235)  # Sky blue color
+
+# Limits for the render rate keys
+MAX_RENDER_EVERY: int = 1024
+
+# Drawn frames between refreshes of the profiling overlay
+OVERLAY_REFRESH: int = 30
+
+
+class TrainingView:
+    """
+    Draws a training run while keeping the simulation decoupled from the display.
+
+    - Only every Nth simulated frame is drawn, and only drawn frames wait for the frame limiter.
+    - Optionally only the top-K living birds (by fitness so far) are drawn.
+    - Optionally only the changed parts of the screen are sent to the display with
+      pygame.display.update(rects) instead of flipping the whole screen.
+
+    Press UP to draw fewer frames (the simulation runs faster) and DOWN to draw more, D to toggle
+    dirty-rect updates and O to toggle the profiling overlay. The view lives for the whole run, so these
+    settings carry over between generations.
+    """
+
+    def __init__(self, render_every: int = 1, top_k: Optional[int] = None, dirty_rects: bool = False,
+                 fps: int = 60, profiler: Profiler = NULL_PROFILER, overlay: bool = False) -> None:
+        """
+        Initialize the TrainingView.
+
+        Args:
+            render_every (int): Draw one of every this many simulated frames.
+            top_k (Optional[int]): Only draw this many of the best living birds. Defaults to all of them.
+            dirty_rects (bool): Update only the changed parts of the display.
+            fps (int): The frame rate limit for drawn frames. 0 or less draws as fast as possible.
+            profiler (Profiler): Times drawing, presenting and waiting for the frame limiter.
+            overlay (bool): Show the profiler's rolling phase times on screen.
+        """
+        self.render_every: int = max(1, render_every)
+        self.top_k: Optional[int] = top_k
+        self.dirty_rects: bool = dirty_rects
+        self.fps: int = fps
+        self.clock: pygame.time.Clock = pygame.time.Clock()
+        self.profiler: Profiler = profiler
+        self.overlay: bool = overlay
+        self._dirty: List[pygame.Rect] = []
+        self._full_redraw: bool = True
+        self._overlay_font: Optional[pygame.font.Font] = None
+        self._overlay_lines: List[str] = []
+        self._overlay_age: int = OVERLAY_REFRESH
+
+    def start(self) -> None:
+        """Prepare for a new generation, redrawing the whole screen on the next frame."""
+        self._full_redraw = True
+
+    def wants_frame(self, frame: int) -> bool:
+        """
+        Check whether a simulated frame should be drawn.
+
+        Args:
+            frame (int): The simulated frame number.
+
+        Returns:
+            bool: True if the frame should be drawn.
+        """
+        return frame % self.render_every == 0
+
+    def handle_events(self) -> None:
+        """Handle window events and the render rate keys."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    self.render_every = min(MAX_RENDER_EVERY, self.render_every * 2)
+                if event.key == pygame.K_DOWN:
+                    self.render_every = max(1, self.render_every // 2)
+                if event.key == pygame.K_d:
+                    self.dirty_rects = not self.dirty_rects
+                    self._full_redraw = True
+                if event.key == pygame.K_o:
+                    self.overlay = not self.overlay
+                    self._overlay_age = OVERLAY_REFRESH
+
+    def visible_birds(self, simulation: Simulation) -> np.ndarray:
+        """
+        Pick the birds to draw.
+
+        Args:
+            simulation (Simulation): The running episode.
+
+        Returns:
+            np.ndarray: Indices of the living birds to draw.
+        """
+        alive = simulation.population.alive_indices
+        if self.top_k is None or len(alive) <= self.top_k:
+            return alive
+        best = np.argpartition(-simulation.fitness[alive], self.top_k - 1)[:self.top_k]
+        return alive[best]
+
+    def overlay_lines(self) -> List[str]:
+        """
+        Get the profiling overlay text, refreshed every few drawn frames so it stays readable and cheap.
+
+        Returns:
+            List[str]: One line per phase with its rolling mean and 99th percentile.
+        """
+        self._overlay_age += 1
+        if self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay_age = 0
+            self._overlay_lines = [f"{phase:<10} {summary['mean']:7.3f} ms  p99 {summary['p99']:7.3f}"
+                                   for phase, summary in self.profiler.rolling().items()]
+        return self._overlay_lines
+
+    def draw(self, screen: pygame.Surface, sky: Sky, simulation: Simulation, lines: List[str],
+             font: pygame.font.Font) -> None:
+        """
+        Draw a frame and present it on the display.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            sky (Sky): The cloud layers.
+            simulation (Simulation): The running episode.
+            lines (List[str]): Status lines shown in the top left corner.
+            font (pygame.font.Font): The font for the status lines.
+        """
+        full = self._full_redraw or not self.dirty_rects
+        if full:
+            screen.fill(BLUE)
+        else:
+            for rect in self._dirty:
+                screen.fill(BLUE, rect)
+
+        drawn: List[pygame.Rect] = list(sky.rects())
+        sky.draw(screen)
+        for bird in simulation.population.sprites(self.visible_birds(simulation)):
+            drawn.append(screen.blit(bird.image, bird.rect))
+        for pipe in simulation.pipes.sprites():
+            pipe.draw(screen)
+            drawn.append(pipe.rect)
+            drawn.append(pipe.edge_rect)
+        if self.render_every > 1:
+            lines = lines + [f"Render: 1/{self.render_every}"]
+        for k, line in enumerate(lines):
+            text_surface = assets.text(line, font, BLACK)
+            drawn.append(screen.blit(text_surface, text_surface.get_rect(center=(80, 10 + 40 * k))))
+        if self.overlay and self.profiler.enabled:
+            if self._overlay_font is None:
+                self._overlay_font = pygame.font.SysFont('monospace', 14)
+            for k, line in enumerate(self.overlay_lines()):
+                text_surface = assets.text(line, self._overlay_font, BLACK)
+                drawn.append(screen.blit(text_surface, text_surface.get_rect(topright=(screen.get_width() - 10,
+                                                                                       10 + 18 * k))))
+        self.profiler.mark('draw')
+
+        # Update the display and control the frame rate
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty + drawn)
+        self._dirty = [rect.clip(screen.get_rect()) for rect in drawn]
+        self._full_redraw = False
+        self.profiler.mark('present')
+        if self.fps > 0:
+            pygame.time.delay(10)
+            self.clock.tick(self.fps)
+        self.profiler.mark('tick')
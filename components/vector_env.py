@@ -0,0 +1,281 @@
+import random
+import time
+import numpy as np
+import neat
+from typing import Dict, List, Optional, Sequence, Tuple
+from components.pipe import PIPE_HEIGHT, PIPE_VELOCITY, PIPE_WIDTH
+from components.population import BirdPopulation
+from components.pipe_track import PIPE_GAP, PIPE_SPAWN_X, collide_gaps
+from components.batch_net import BatchNetwork
+from components.simulation import EpisodeBudget, PIPE_DISTANCE
+
+# Screen dimensions
+SCREEN_WIDTH: int = 800
+SCREEN_HEIGHT: int = 600
+
+# Stand-in x of the unused pipe slots, far to the right of any bird
+NO_PIPE: int = 1 << 40
+
+
+class VectorEnv:
+    """
+    Many independent games, each with one bird on its own seeded course, stepped together.
+
+    The birds share one BirdPopulation and the pipes of every course live in one (games, slots)
+    array, so a step costs a few NumPy operations however many games there are. Each game follows
+    the rules of Simulation exactly: a bird flying alone on a course in a VectorEnv earns the same
+    rewards, frame by frame, as in a Simulation with the same seed.
+
+    Like Simulation, a step is split in the middle of a frame. reset() and step() return the inputs
+    of the birds after the pipes were spawned and everything moved; step() then applies the jumps,
+    scores the birds and checks for crashes before moving on to the next frame. Birds that do not
+    see a pipe yet get zero inputs and their action is ignored, see sees_pipe.
+    """
+
+    def __init__(self, seeds: Sequence[int], max_frames: Optional[int] = None, auto_reset: bool = True,
+                 reset_seed: Optional[int] = None) -> None:
+        """
+        Initialize the VectorEnv. Call reset() before stepping.
+
+        Args:
+            seeds (Sequence[int]): The seed of each game's course. Their number sets the number of games.
+            max_frames (Optional[int]): End each episode after this many frames, without the crash penalty.
+            auto_reset (bool): Start a new episode in a game as soon as its episode ends. Otherwise the
+                game stays done until every game is done.
+            reset_seed (Optional[int]): Seeds the courses of the episodes started by auto-reset.
+        """
+        size = len(seeds)
+        self.num_envs: int = size
+        self.max_frames: Optional[int] = max_frames
+        self.auto_reset: bool = auto_reset
+        self.seeds: np.ndarray = np.array(seeds, dtype=np.int64)
+        self._reset_rng: random.Random = random.Random(reset_seed)
+        self._rngs: List[random.Random] = [random.Random(seed) for seed in seeds]
+        slots = (PIPE_SPAWN_X + PIPE_WIDTH) // PIPE_DISTANCE + 2
+        self.population: BirdPopulation = BirdPopulation(size)
+        self.pipe_x: np.ndarray = np.full((size, slots), NO_PIPE, dtype=np.int64)
+        self.gap_top: np.ndarray = np.zeros((size, slots), dtype=np.int64)
+        self.pipe_number: np.ndarray = np.zeros((size, slots), dtype=np.int64)
+        self.pipe_count: np.ndarray = np.zeros(size, dtype=np.int64)
+        self.pipes_created: np.ndarray = np.zeros(size, dtype=np.int64)
+        self.frame: np.ndarray = np.zeros(size, dtype=np.int64)
+        self.returns: np.ndarray = np.zeros(size)  # Reward of the running episodes, summed like Simulation.fitness
+        self.done: np.ndarray = np.zeros(size, dtype=bool)
+        self.sees_pipe: np.ndarray = np.zeros(size, dtype=bool)
+        self._last_passed: np.ndarray = np.full(size, -1, dtype=np.int64)
+        self._nearest: np.ndarray = np.zeros(size, dtype=np.int64)
+
+    @property
+    def all_done(self) -> bool:
+        """bool: Whether every game's episode has ended. Only happens without auto-reset."""
+        return bool(self.done.all())
+
+    def reset(self) -> np.ndarray:
+        """
+        Start a new episode in every game.
+
+        Returns:
+            np.ndarray: The inputs of every bird, shaped (games, 4).
+        """
+        self._reset_games(np.arange(self.num_envs))
+        return self._advance()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Apply every bird's action, finish the frame and start the next one.
+
+        Args:
+            actions (np.ndarray): For each game, whether the bird jumps.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]: The inputs of every bird for
+            the next frame, the reward of this frame, which episodes ended in this frame, and a dict with
+            the 'truncated' flag and the 'episode_return', 'score' and 'frames' of the ended episodes.
+        """
+        population = self.population
+        active = population.alive_indices
+        rows = np.flatnonzero(self.sees_pipe)
+        reward = np.zeros(self.num_envs)
+
+        if len(rows):
+            population.jump(rows[np.asarray(actions, dtype=bool)[rows]])
+            reward[rows] += 0.1  # Reward for staying alive
+            self.returns[rows] += 0.1
+
+            pair = self._nearest[rows]
+            numbers = self.pipe_number[rows, pair]
+            passing = (population.right[rows] > self.pipe_x[rows, pair]) & (self._last_passed[rows] < numbers)
+            passed = rows[passing]
+            self._last_passed[passed] = numbers[passing]
+            reward[passed] += 5  # Reward for passing a pipe
+            self.returns[passed] += 5
+            population.score[passed] += 1
+
+        # Check if birds hit the ground, pipe, or ceiling
+        ahead = self.sees_pipe[active]
+        pair = self._nearest[active]
+        top = population.y[active]
+        crashed = (collide_gaps(population, active, ahead, self.pipe_x[active, pair], self.gap_top[active, pair])
+                   | (top + population.extent[active] >= SCREEN_HEIGHT)
+                   | (top <= 0))
+        dead = active[crashed]
+        reward[dead] -= 1  # Penalize for hitting ground, pipe, or ceiling
+        self.returns[dead] -= 1
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_frames is not None:
+            truncated[active[~crashed & (self.frame[active] >= self.max_frames)]] = True
+
+        done = truncated.copy()
+        done[dead] = True
+        ended = np.flatnonzero(done)
+        info: Dict[str, np.ndarray] = {
+            'truncated': truncated,
+            'episode_return': np.where(done, self.returns, 0.0),
+            'score': np.where(done, population.score, 0),
+            'frames': np.where(done, self.frame, 0),
+        }
+        if len(ended):
+            population.kill(ended)
+            self.done[ended] = True
+            if self.auto_reset:
+                for game in ended.tolist():
+                    self.seeds[game] = self._reset_rng.getrandbits(32)
+                    self._rngs[game] = random.Random(int(self.seeds[game]))
+                self._reset_games(ended)
+        return self._advance(), reward, done, info
+
+    def _reset_games(self, games: np.ndarray) -> None:
+        """
+        Put the birds of some games back at the start of empty courses.
+
+        Args:
+            games (np.ndarray): The games to reset.
+        """
+        self.population.reset(games)
+        self.population.jump(games)  # Initial jump to start the game
+        self.pipe_x[games] = NO_PIPE
+        self.pipe_count[games] = 0
+        self.pipes_created[games] = 0
+        self.frame[games] = 0
+        self.returns[games] = 0.0
+        self.done[games] = False
+        self._last_passed[games] = -1
+
+    def _advance(self) -> np.ndarray:
+        """
+        Start a frame in every running game: spawn pipes, move everything and build the birds' inputs.
+
+        Returns:
+            np.ndarray: The inputs of every bird, shaped (games, 4); zero for birds that see no pipe.
+        """
+        population = self.population
+        active = population.alive_indices
+        self.frame[active] += 1
+        all_games = np.arange(self.num_envs)
+
+        # Add a pipe pair where the last one has moved far enough from the right edge
+        count = self.pipe_count[active]
+        last_x = self.pipe_x[active, np.maximum(count - 1, 0)]
+        spawning = active[(count == 0) | (last_x < SCREEN_WIDTH - PIPE_DISTANCE)]
+        if len(spawning):
+            slot = self.pipe_count[spawning]
+            self.pipe_x[spawning, slot] = PIPE_SPAWN_X
+            self.gap_top[spawning, slot] = [self._rngs[game].randint(100, SCREEN_HEIGHT - PIPE_GAP - 100)
+                                            for game in spawning.tolist()]
+            self.pipe_number[spawning, slot] = self.pipes_created[spawning]
+            self.pipes_created[spawning] += 1
+            self.pipe_count[spawning] += 1
+
+        population.update()
+        moving = np.zeros(self.num_envs, dtype=bool)
+        moving[active] = True
+        self.pipe_x[moving[:, None] & (np.arange(self.pipe_x.shape[1]) < self.pipe_count[:, None])] += PIPE_VELOCITY
+
+        # Only the first pair of a course can have left the screen
+        gone = active[(self.pipe_count[active] > 0) & (self.pipe_x[active, 0] + PIPE_WIDTH < 0)]
+        if len(gone):
+            for column in (self.pipe_x, self.gap_top, self.pipe_number):
+                column[gone, :-1] = column[gone, 1:]
+            self.pipe_x[gone, -1] = NO_PIPE
+            self.pipe_count[gone] -= 1
+
+        # The nearest pair is the first whose right edge is past the bird; empty slots hold NO_PIPE and never count
+        ahead = (self.pipe_x != NO_PIPE) & (self.pipe_x + PIPE_WIDTH > population.left[:, None])
+        self._nearest = np.argmax(ahead, axis=1)
+        self.sees_pipe = ahead[all_games, self._nearest] & population.alive
+
+        pipe_x = self.pipe_x[all_games, self._nearest]
+        gap_top = self.gap_top[all_games, self._nearest]
+        inputs = np.column_stack((
+            population.y / SCREEN_HEIGHT,
+            (gap_top - PIPE_HEIGHT) / SCREEN_HEIGHT,  # Top of the top pipe
+            gap_top / SCREEN_HEIGHT,  # Bottom of the top pipe
+            pipe_x / SCREEN_WIDTH
+        ))
+        inputs[~self.sees_pipe] = 0.0
+        return inputs
+
+
+def course_seeds(seed: int, courses: int) -> List[int]:
+    """
+    Derive the seeds of several courses from one seed.
+
+    Args:
+        seed (int): The seed of the first course.
+        courses (int): The number of courses.
+
+    Returns:
+        List[int]: The seeds, starting with seed itself, so one course is the usual single course.
+    """
+    rng = random.Random(seed)
+    return [seed] + [rng.getrandbits(32) for _ in range(courses - 1)]
+
+
+def evaluate_courses(genomes: Sequence[neat.DefaultGenome], config: neat.Config, seeds: Sequence[int],
+                     budget: Optional[EpisodeBudget] = None) -> Tuple[List[float], List[int], List[int]]:
+    """
+    Fly every genome on every course in one VectorEnv and average the results over the courses.
+
+    Args:
+        genomes (Sequence[neat.DefaultGenome]): The genomes to evaluate.
+        config (neat.Config): The NEAT configuration.
+        seeds (Sequence[int]): The seed of each course.
+        budget (Optional[EpisodeBudget]): Limits on the episode length. The frame and time limits apply to
+            every course; stop_when_decided compares birds on one course and is not used.
+
+    Returns:
+        Tuple[List[float], List[int], List[int]]: Each genome's mean fitness over the courses, its best score
+        and the mean number of frames it flew, rounded down.
+    """
+    budget = budget if budget is not None else EpisodeBudget()
+    num_genomes, num_courses = len(genomes), len(seeds)
+    nets = BatchNetwork.create(genomes, config)
+    env = VectorEnv([seed for _ in genomes for seed in seeds], budget.max_frames, auto_reset=False)
+    genome_of_game = np.repeat(np.arange(num_genomes), num_courses)
+    fitness = np.zeros(env.num_envs)
+    scores = np.zeros(env.num_envs, dtype=np.int64)
+    frames = np.zeros(env.num_envs, dtype=np.int64)
+
+    start = time.perf_counter()
+    inputs = env.reset()
+    while not env.all_done:
+        actions = np.zeros(env.num_envs, dtype=bool)
+        deciding = np.flatnonzero(env.sees_pipe)
+        if len(deciding):
+            # Let the networks of all birds on all courses decide in one batch
+            actions[deciding] = nets.activate(inputs[deciding], genome_of_game[deciding])[:, 0] > 0.5
+        inputs, _, done, info = env.step(actions)
+        fitness[done] = info['episode_return'][done]
+        scores[done] = info['score'][done]
+        frames[done] = info['frames'][done]
+        if budget.max_seconds is not None and time.perf_counter() - start >= budget.max_seconds:
+            # Birds still flying keep what they have earned, as in Simulation
+            running = ~env.done
+            fitness[running] = env.returns[running]
+            scores[running] = env.population.score[running]
+            frames[running] = env.frame[running]
+            break
+
+    return (fitness.reshape(num_genomes, num_courses).mean(axis=1).tolist(),
+            scores.reshape(num_genomes, num_courses).max(axis=1).tolist(),
+            (frames.reshape(num_genomes, num_courses).sum(axis=1) // num_courses).tolist())
@@ -2,14 +2,28 @@ import pygame
 import random
 import neat
 import os
+import sys
 import pickle
-from typing import List, Tuple
+import argparse
+import functools
+import time
+from typing import List, Optional, Tuple
 from components.bird import Bird
-from components.pipe import Pipe
-from components.cloud import Cloud
-
-# Initialize Pygame
-pygame.init()
+from components.background import Sky
+from components.assets import assets
+from components.display import Display
+from components.simulation import DecisionSchedule, EpisodeBudget, Simulation
+from components.curriculum import Curriculum
+from components.staged import StagedEvaluation
+from components.play import FixedTimestep, PlayGame
+from components.replay import ReplayFile, ReplayPlayer, ReplayWriter
+from components.vector_env import course_seeds, evaluate_courses
+from components.parallel import ParallelEvaluator
+from components.fitness_cache import FitnessCache
+from components.training_view import TrainingView
+from components.profiler import Profiler, ProfileReporter, NULL_PROFILER, export_stats
+from components.checkpoint import Checkpointer, latest_checkpoint, restore_checkpoint
+from components.telemetry import TelemetryReporter
 
 # Screen dimensions
 SCREEN_WIDTH: int = 800
@@ -20,34 +34,17 @@ WHITE: Tuple[int, int, int] = (255, 255, 255)
 BLACK: Tuple[int, int, int] = (0, 0, 0)
 BLUE: Tuple[int, int, int] = (135, 206, 235)  # Sky blue color
 
-# Game variables
-PIPE_OFFSET: int = 100  # Distance from the right edge of the screen to generate pipes
-PIPE_GAP: int = 150  # Gap between the top and bottom pipes
-
-# Set up display
-screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Flappy Bird')
+# Path to the NEAT configuration file
+CONFIG_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config-feedforward.txt')
 
-# Clock for controlling frame rate
-clock: pygame.time.Clock = pygame.time.Clock()
+# The window, clock and fonts are only created once something is drawn, so importing this module
+# or training headless never initializes pygame or needs a display
+display: Display = Display((SCREEN_WIDTH, SCREEN_HEIGHT), 'Flappy Bird')
 FPS: int = 60
 
-# Font for score display
-font: pygame.font.Font = pygame.font.Font(None, 36)
-large_font: pygame.font.Font = pygame.font.Font(None, 72)
-
-
-def create_pipe() -> Tuple[Pipe, Pipe]:
-    """
-    Create a pair of pipes (top and bottom) and return them.
-
-    Returns:
-        Tuple[Pipe, Pipe]: A tuple containing the top and bottom pipes.
-    """
-    pipe_height: int = random.randint(100, SCREEN_HEIGHT - PIPE_GAP - 100)
-    top_pipe: Pipe = Pipe(SCREEN_WIDTH + PIPE_OFFSET, pipe_height, True)
-    bottom_pipe: Pipe = Pipe(SCREEN_WIDTH + PIPE_OFFSET, pipe_height + PIPE_GAP, False)
-    return top_pipe, bottom_pipe
+# Font sizes for score display and titles
+FONT_SIZE: int = 36
+LARGE_FONT_SIZE: int = 72
 
 
 def draw_text(screen: pygame.Surface, text: str, font: pygame.font.Font, color: Tuple[int, int, int], x: int, y: int) -> None:
@@ -62,15 +59,30 @@ def draw_text(screen: pygame.Surface, text: str, font: pygame.font.Font, color:
         x (int): The x-coordinate of the text's center.
         y (int): The y-coordinate of the text's center.
     """
-    text_surface: pygame.Surface = font.render(text, True, color)
+    text_surface: pygame.Surface = assets.text(text, font, color)
     text_rect: pygame.Rect = text_surface.get_rect(center=(x, y))
     screen.blit(text_surface, text_rect)
 
 
 best_score_ever: int = 0
 
+# Number of simulated frames between progress lines in headless training
+PROGRESS_INTERVAL: int = 500
+
+# Directory for training checkpoints
+CHECKPOINT_DIR: str = "checkpoints"
+
+# Log of per-generation training statistics
+TELEMETRY_PATH: str = "telemetry.jsonl"
 
-def eval_genomes(genomes: List[Tuple[int, neat.DefaultGenome]], config: neat.Config) -> None:
+
+def eval_genomes(genomes: List[Tuple[int, neat.DefaultGenome]], config: neat.Config,
+                 headless: bool = False, progress: bool = True, seed: Optional[int] = None,
+                 cache: Optional[FitnessCache] = None, view: Optional[TrainingView] = None,
+                 profiler: Profiler = NULL_PROFILER, budget: Optional[EpisodeBudget] = None,
+                 curriculum: Optional[Curriculum] = None, recorder: Optional[ReplayWriter] = None,
+                 schedule: Optional[DecisionSchedule] = None, courses: int = 1,
+                 stages: Optional[StagedEvaluation] = None) -> None:
     """
     Evaluate genomes using the NEAT algorithm.
 
@@ -80,126 +92,199 @@ def eval_genomes(genomes: List[Tuple[int, neat.DefaultGenome]], config: neat.Con
     Args:
         genomes (List[Tuple[int, neat.DefaultGenome]]): A list of tuples, where each tuple contains a genome ID and a genome.
         config (neat.Config): The NEAT configuration.
+        headless (bool): If True, skip drawing, event handling and frame limiting so the simulation
+            runs as fast as the CPU allows. The physics and fitness rules are the same in both modes.
+        progress (bool): In headless mode, print a progress line to the terminal while simulating.
+        seed (Optional[int]): The seed of the course. Defaults to a new random course each generation.
+        cache (Optional[FitnessCache]): If given, genomes already evaluated on this course are not simulated
+            again. It is only used while the budget is reproducible.
+        view (Optional[TrainingView]): How to draw the generation when not headless. Defaults to drawing every frame.
+        profiler (Profiler): Times the phases of each frame.
+        budget (Optional[EpisodeBudget]): Limits on the episode length. Defaults to running until every bird has died.
+        curriculum (Optional[Curriculum]): If given, grows the budget's frame limit after the generation.
+        recorder (Optional[ReplayWriter]): If given, every simulated episode is recorded to it.
+        schedule (Optional[DecisionSchedule]): How often the networks decide. Defaults to every frame.
+        courses (int): In headless mode, fly each genome on this many courses, all at once in a VectorEnv,
+            and use its mean fitness. Drawing, recording and the decision schedule use a single course.
+        stages (Optional[StagedEvaluation]): In headless mode, evaluate the genomes in stages of growing
+            length that only the best genomes move on to. The stages set their own frame limits and
+            courses, and since a genome's fitness depends on the others, the fitness cache is not used.
 
     Explanation:
-        - For each genome, create a neural network and a bird.
+        - Compile the genomes into one batch of neural networks and create a bird for each.
         - Simulate the game, updating bird positions and checking for collisions.
-        - Use the neural network to decide whether each bird should jump.
-        - Assign fitness scores based on survival time and the number of pipes passed.
+        - Use the neural networks to decide, in one batch, whether each bird should jump.
+        - Assign fitness scores based on survival time and the number of pipes each bird passed.
     """
     global best_score_ever
 
-    nets: List[neat.nn.FeedForwardNetwork] = []
-    birds: List[Bird] = []
-    ge: List[neat.DefaultGenome] = []
+    ge: List[neat.DefaultGenome] = [genome for genome_id, genome in genomes]
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    if not headless and view is None:
+        view = TrainingView(fps=FPS)
+    if budget is None:
+        budget = EpisodeBudget()
+    simulate = functools.partial(play_generation, config=config, seed=seed, headless=headless, progress=progress,
+                                 view=view, profiler=profiler, budget=budget, recorder=recorder,
+                                 schedule=schedule)
+    if headless and stages is not None:
+        simulate = functools.partial(stages.evaluate, config=config, seed=seed)
+        cache = None
+    elif headless and courses > 1:
+        simulate = functools.partial(evaluate_courses, config=config, seeds=course_seeds(seed, courses), budget=budget)
+    else:
+        courses = 1
+        stages = None
+    if cache is not None and budget.reproducible:
+        results = cache.evaluate(ge, (seed, budget.max_frames, courses), simulate)
+        scores: List[int] = [score for _, score, _ in results]
+        frames: List[int] = [flown for _, _, flown in results]
+    else:
+        fitness, scores, frames = simulate(ge)
+        for genome, genome_fitness in zip(ge, fitness):
+            genome.fitness = genome_fitness
+    best_score_ever = max([best_score_ever] + scores)
+    if stages is not None and progress:
+        print(stages.format_report())
+    if curriculum is not None and stages is None:
+        curriculum.update(frames)
+
+
+def play_generation(ge: List[neat.DefaultGenome], config: neat.Config, seed: int,
+                    headless: bool = False, progress: bool = True, view: Optional[TrainingView] = None,
+                    profiler: Profiler = NULL_PROFILER, budget: Optional[EpisodeBudget] = None,
+                    recorder: Optional[ReplayWriter] = None,
+                    schedule: Optional[DecisionSchedule] = None) -> Tuple[List[float], List[int], List[int]]:
+    """
+    Simulate one episode for a list of genomes, drawing it unless headless.
 
-    # Initialize neural networks, birds, and genome fitness
-    for genome_id, genome in genomes:
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        nets.append(net)
-        bird = Bird()
-        bird.jump()  # Initial jump to start the game
-        genome.fitness = 0  # Initial fitness
-        birds.append(bird)
-        ge.append(genome)
+    Args:
+        ge (List[neat.DefaultGenome]): The genomes to evaluate, one bird each.
+        config (neat.Config): The NEAT configuration.
+        seed (int): The seed of the course.
+        headless (bool): Skip drawing, event handling and frame limiting.
+        progress (bool): In headless mode, print a progress line to the terminal while simulating.
+        view (Optional[TrainingView]): How to draw the episode. Required unless headless.
+        profiler (Profiler): Times the phases of each frame.
+        budget (Optional[EpisodeBudget]): Limits on the episode length.
+        recorder (Optional[ReplayWriter]): If given, the episode is recorded to it.
+        schedule (Optional[DecisionSchedule]): How often the networks decide.
 
-    bird_group: pygame.sprite.Group = pygame.sprite.Group(*birds)
-    pipe_group: pygame.sprite.Group = pygame.sprite.Group()
+    Returns:
+        Tuple[List[float], List[int], List[int]]: The fitness, final score and frames flown of each genome.
+    """
+    global best_score_ever
 
-    pipe_distance: int = 200  # Distance in pixels between pipes
-    last_pipe_x: int = SCREEN_WIDTH + PIPE_OFFSET  # Initial position for the first pipe
+    # All birds fly the same course; sprites are only built when drawing
+    simulation: Simulation = Simulation(ge, config, seed, profiler, budget, record=recorder is not None,
+                                        schedule=schedule)
+    population = simulation.population
 
-    clouds: List[Cloud] = [Cloud() for _ in range(10)]
+    sky: Optional[Sky] = None if headless else Sky(random.Random(seed))
+    screen: Optional[pygame.Surface] = None
+    if view is not None:
+        screen = display.screen  # Opens the window when the first generation is watched
+        view.start()
 
     running: bool = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+        profiler.start_frame()
+        simulation.step()
+        if sky is not None:
+            sky.update()
+            profiler.mark('sky')
 
-        # Generate new pipes based on distance
-        if len(pipe_group) == 0 or (pipe_group.sprites()[-1].rect.x < SCREEN_WIDTH - pipe_distance):
-            top_pipe, bottom_pipe = create_pipe()
-            pipe_group.add(top_pipe)
-            pipe_group.add(bottom_pipe)
-
-        bird_group.update()
-        pipe_group.update()
-        for cloud in clouds:
-            cloud.update()
-
-        for i, bird in enumerate(birds):
-            if bird.alive:
-                nearest_pipe: Pipe = None
-                for pipe in pipe_group:
-                    if pipe.rect.right > bird.rect.left:
-                        nearest_pipe = pipe
-                        break
-
-                if nearest_pipe is not None:
-                    inputs: Tuple[float, float, float, float] = (
-                        bird.rect.y / SCREEN_HEIGHT,
-                        nearest_pipe.rect.top / SCREEN_HEIGHT,
-                        nearest_pipe.rect.bottom / SCREEN_HEIGHT,
-                        nearest_pipe.rect.left / SCREEN_WIDTH
-                    )
-                    output: List[float] = nets[i].activate(inputs)
-                    if output[0] > 0.5:
-                        bird.jump()
-
-                    ge[i].fitness += 0.1  # Reward for staying alive
-
-                    if bird.rect.right > nearest_pipe.rect.left and not nearest_pipe.passed:
-                        nearest_pipe.passed = True
-                        ge[i].fitness += 5  # Reward for passing a pipe
-                        bird.score += 1  # Increment bird's score for passing a pipe
-
-            # Check if bird hits the ground, pipe, or ceiling
-            if bird.alive and (
-                    pygame.sprite.spritecollide(bird, pipe_group, False, pygame.sprite.collide_mask)
-                    or bird.rect.bottom >= SCREEN_HEIGHT
-                    or bird.rect.top <= 0  # Check for collision with the ceiling
-            ):
-                ge[i].fitness -= 1  # Penalize for hitting ground, pipe, or ceiling
-                bird.alive = False
-                bird_group.remove(bird)  # Remove dead bird from the sprite group
-
-        if all(not bird.alive for bird in birds):
+        if simulation.done:
             running = False
 
-        # Draw the game screen
-        screen.fill(BLUE)
-        for cloud in clouds:
-            cloud.draw(screen)
-        bird_group.draw(screen)
-        for pipe in pipe_group:
-            pipe.draw(screen)
-
-        # Display leading bird's score and number of birds left
-        leading_bird: Bird = max(birds, key=lambda b: b.score, default=None)
-        leading_score: int = leading_bird.score if leading_bird else 0
-        birds_left: int = sum(1 for b in birds if b.alive)
-
+        leading_score: int = population.leading_score()
         best_score_ever = max(best_score_ever, leading_score)
 
-        draw_text(screen, f"Score: {leading_score}", font, BLACK, 80, 10)
-        draw_text(screen, f"Birds Left: {birds_left}", font, BLACK, 80, 50)
-        draw_text(screen, f"Best Score: {best_score_ever}", font, BLACK, 80, 90)
-
-        # Update the display and control the frame rate
-        pygame.display.flip()
-        pygame.time.delay(10)
-        clock.tick(FPS)
-
-
-def run(config_file: str) -> None:
+        if headless:
+            if progress and (simulation.frame % PROGRESS_INTERVAL == 0 or not running):
+                sys.stdout.write(f"\rFrame {simulation.frame}  Birds Left: {population.alive_count}  "
+                                 f"Score: {leading_score}  Best Score: {best_score_ever}   ")
+                if not running:
+                    if not simulation.schedule.every_frame:
+                        bird_frames = int(simulation.frames_alive.sum())
+                        sys.stdout.write(f"\nNetwork evaluations: {simulation.decisions} for {bird_frames} bird frames")
+                    sys.stdout.write("\n")
+                sys.stdout.flush()
+
+        # Draw the game screen, skipping frames when the view renders only every Nth one
+        elif view.wants_frame(simulation.frame) or not running:
+            view.handle_events()
+            profiler.mark('events')
+            view.draw(screen, sky, simulation, [
+                f"Score: {leading_score}",
+                f"Birds Left: {population.alive_count}",
+                f"Best Score: {best_score_ever}",
+            ], display.font(FONT_SIZE))
+        profiler.end_frame()
+
+    if recorder is not None:
+        recorder.write_simulation(ge, seed, simulation)
+    return simulation.results()
+
+
+def run(config_file: str, headless: bool = False, generations: int = 50, progress: bool = True,
+        workers: int = 1, seed: Optional[int] = None, cache_size: int = 10000,
+        render_every: int = 1, top_k: Optional[int] = None, dirty_rects: bool = False,
+        checkpoint_dir: str = CHECKPOINT_DIR, checkpoint_every: Optional[int] = 5,
+        checkpoint_seconds: Optional[float] = 300.0, resume: Optional[str] = None,
+        profile: bool = False, profile_path: Optional[str] = None, profile_overlay: bool = False,
+        max_frames: Optional[int] = None, max_seconds: Optional[float] = None, stop_when_decided: bool = False,
+        curriculum_start: Optional[int] = None, record_path: Optional[str] = None, courses: int = 1,
+        telemetry_path: Optional[str] = None) -> None:
     """
     Run the NEAT algorithm to train a neural network to play Flappy Bird.
 
     Args:
         config_file (str): Path to the NEAT configuration file.
+        headless (bool): Train without rendering or frame limiting.
+        generations (int): Maximum number of generations to run.
+        progress (bool): Print a progress line while simulating in headless mode, and announce saved checkpoints.
+        workers (int): Number of worker processes. More than one evaluates the genomes in parallel,
+            which is always headless.
+        seed (Optional[int]): Make the run reproducible: seeds evolution and flies every generation on
+            the course with this seed. Defaults to a new random course each generation.
+        cache_size (int): Number of results kept in the fitness cache; 0 disables it. The cache is only
+            used with a seed, since only then do later generations fly the courses of earlier ones.
+        render_every (int): When watching training, draw only one of every this many simulated frames.
+        top_k (Optional[int]): When watching training, draw only this many of the best living birds.
+        dirty_rects (bool): When watching training, update only the changed parts of the display.
+        checkpoint_dir (str): The directory checkpoints are written to.
+        checkpoint_every (Optional[int]): Save a checkpoint at least every this many generations. None disables it.
+        checkpoint_seconds (Optional[float]): Save a checkpoint at least every this many seconds. None disables it.
+        resume (Optional[str]): Path of a checkpoint to resume from, or 'latest' for the newest one in
+            checkpoint_dir. The run then continues until the total number of generations is reached.
+        profile (bool): Time the phases of each frame and print their mean after every generation.
+        profile_path (Optional[str]): Append the per-generation phase statistics to this .jsonl or .csv
+            file. Implies profile.
+        profile_overlay (bool): When watching training, show live phase times on screen. Implies profile.
+        max_frames (Optional[int]): End each generation after this many frames. With a curriculum, the
+            largest frame limit it grows to.
+        max_seconds (Optional[float]): End each generation after this many seconds. Disables the fitness cache.
+        stop_when_decided (bool): End a generation once the last bird is ahead of every other. Disables the
+            fitness cache.
+        curriculum_start (Optional[int]): Start with generations of at most this many frames and double
+            the limit whenever a tenth of the genomes reach it.
+        record_path (Optional[str]): Record every simulated episode to this replay file. A resumed run
+            appends to it, a new run replaces it.
+        courses (int): Fly each genome on this many courses per generation and use its mean fitness.
+            Only headless and parallel training use several courses.
+        telemetry_path (Optional[str]): Append a summary of every generation to this JSON Lines file.
+            None, the default, writes no log.
     """
+    global best_score_ever
+
+    if seed is not None:
+        random.seed(seed)
+    # Without a seed every generation flies a new course, so earlier results could never be reused
+    cache: Optional[FitnessCache] = FitnessCache(cache_size) if cache_size > 0 and seed is not None else None
+
     config: neat.Config = neat.config.Config(
         neat.DefaultGenome,
         neat.DefaultReproduction,
@@ -208,27 +293,186 @@ def run(config_file: str) -> None:
         config_file
     )
 
-    # Create the population, which is the top-level object for a NEAT run.
-    p: neat.Population = neat.Population(config)
+    # The decision interval is set per run in the [Training] section of the configuration file
+    schedule: DecisionSchedule = DecisionSchedule.from_file(config_file)
+    if not schedule.every_frame:
+        print(f"Networks decide every {schedule.interval} frames"
+              + (" and when a new pipe is nearest" if schedule.on_new_pipe else ""))
+
+    # Staged evaluation is set per run in the [Training] section of the configuration file
+    stages: Optional[StagedEvaluation] = StagedEvaluation.from_file(config_file)
+    if stages is not None:
+        if not headless or workers > 1:
+            print("Staged evaluation applies to single-process headless training and is skipped")
+            stages = None
+        else:
+            print("Genomes are evaluated in stages of "
+                  + ", ".join(f"{stage.max_frames} frames on {stage.courses} course{'s' if stage.courses > 1 else ''}"
+                              for stage in stages.stages)
+                  + "; the stage limits replace --max-frames, --curriculum and --courses")
+            if record_path is not None:
+                print("Replays record single-course episodes and are skipped with staged evaluation")
+                record_path = None
+            courses = 1
+
+    # Bound how long a generation can run
+    budget: EpisodeBudget = EpisodeBudget(max_frames, max_seconds, stop_when_decided)
+    curriculum: Optional[Curriculum] = None
+    if curriculum_start is not None and stages is None:
+        curriculum = Curriculum(budget, curriculum_start, limit=max_frames)
+
+    # Create the population, which is the top-level object for a NEAT run, or restore it from a checkpoint.
+    if resume == 'latest':
+        resume = latest_checkpoint(checkpoint_dir)
+        if resume is None:
+            print(f"No checkpoint found in {checkpoint_dir}, starting a new run")
+    if resume is not None:
+        # A curriculum continues at the frame limit the saved run had reached
+        p: neat.Population = restore_checkpoint(resume, config, budget if curriculum is not None else None)
+        if curriculum is not None and curriculum.limit is not None:
+            budget.max_frames = min(budget.max_frames, curriculum.limit)
+        print(f"Resuming from {resume} at generation {p.generation}")
+        generations = max(0, generations - p.generation)
+    else:
+        p = neat.Population(config)
 
     # Add a stdout reporter to show progress in the terminal.
     p.add_reporter(neat.StdOutReporter(True))
-    stats: neat.StatisticsReporter = neat.StatisticsReporter()
-    p.add_reporter(stats)
-
-    # Run for up to 50 generations.
-    winner: neat.DefaultGenome = p.run(eval_genomes, 50)
+    # Stream per-generation statistics to a log instead of keeping them all in memory
+    telemetry: Optional[TelemetryReporter] = None
+    if telemetry_path:
+        telemetry = TelemetryReporter(telemetry_path)
+        p.add_reporter(telemetry)
+    checkpointer: Checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, checkpoint_seconds, budget=budget,
+                                              quiet=not progress)
+    checkpointer.best_genome = p.best_genome
+    p.add_reporter(checkpointer)
+    profiler: Profiler = NULL_PROFILER
+    if profile or profile_path or profile_overlay:
+        if workers > 1:
+            print("Profiling times the frame loop of a single process and is skipped with --workers")
+        else:
+            profiler = Profiler()
+            p.add_reporter(ProfileReporter(profiler, profile_path))
+
+    if courses > 1:
+        if not headless and workers <= 1:
+            print("Watching training flies one course per generation; --courses applies to headless training")
+            courses = 1
+        else:
+            print(f"Every genome flies {courses} courses per generation")
+            if record_path is not None:
+                print("Replays record single-course episodes and are skipped with --courses")
+                record_path = None
+            if not schedule.every_frame:
+                print("The decision interval applies to single-course training and is ignored with --courses")
+
+    recorder: Optional[ReplayWriter] = None
+    if record_path is not None:
+        recorder = ReplayWriter(record_path, append=resume is not None)
+        p.add_reporter(recorder)
+
+    # Run for up to the requested number of generations.
+    try:
+        if workers > 1:
+            evaluator: ParallelEvaluator = ParallelEvaluator(workers, config, cache, budget, curriculum, recorder,
+                                                             schedule, courses)
+            try:
+                winner: neat.DefaultGenome = p.run(functools.partial(evaluator.evaluate, seed=seed), generations)
+            finally:
+                evaluator.close()
+            best_score_ever = max(best_score_ever, evaluator.best_score)
+        else:
+            view: Optional[TrainingView] = None if headless else TrainingView(
+                render_every, top_k, dirty_rects, FPS, profiler, profile_overlay)
+            fitness_function = functools.partial(eval_genomes, headless=headless, progress=progress,
+                                                 seed=seed, cache=cache, view=view, profiler=profiler,
+                                                 budget=budget, curriculum=curriculum, recorder=recorder,
+                                                 schedule=schedule, courses=courses, stages=stages)
+            winner = p.run(fitness_function, generations)
+    finally:
+        checkpointer.close()
+        if recorder is not None:
+            recorder.close()
+        if telemetry is not None:
+            telemetry.close()
 
     # Save the winner.
     with open('winner.pkl', 'wb') as f:
         pickle.dump(winner, f)
 
 
-def main() -> None:
+def watch_replay(path: str, generation: Optional[int] = None, genome_id: Optional[int] = None) -> None:
+    """
+    Play back a recorded episode without evaluating any network.
+
+    Press SPACE to pause, UP and DOWN to change the playback speed, LEFT and RIGHT to seek five
+    seconds back or forward, HOME to restart and ESC to quit.
+
+    Args:
+        path (str): The replay file.
+        generation (Optional[int]): The generation to show. Defaults to the whole file.
+        genome_id (Optional[int]): The genome to show. Defaults to the fittest genome of the generation.
+    """
+    replays: ReplayFile = ReplayFile(path)
+    if genome_id is None:
+        replay = replays.best(generation)
+    else:
+        replay = replays.read(generation if generation is not None else replays.generations()[-1], genome_id)
+    player: ReplayPlayer = ReplayPlayer(replay)
+    sky: Sky = Sky(random.Random(replay.seed))
+    speed: int = 1
+    paused: bool = False
+    screen: pygame.Surface = display.screen
+    font: pygame.font.Font = display.font(FONT_SIZE)
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                if event.key == pygame.K_UP:
+                    speed = min(64, speed * 2)
+                if event.key == pygame.K_DOWN:
+                    speed = max(1, speed // 2)
+                if event.key == pygame.K_RIGHT:
+                    player.seek(player.frame + 5 * FPS)
+                if event.key == pygame.K_LEFT:
+                    player.seek(player.frame - 5 * FPS)
+                if event.key == pygame.K_HOME:
+                    player.seek(0)
+
+        if not paused:
+            for _ in range(speed):
+                player.step()
+                sky.update()
+
+        screen.fill(BLUE)
+        sky.draw(screen)
+        player.draw(screen)
+        draw_text(screen, f"Generation {replay.generation}  Genome {replay.genome_id}", font, BLACK,
+                  SCREEN_WIDTH // 2, 20)
+        draw_text(screen, f"Frame {player.frame}/{replay.frames}  Score: {player.bird.score}  Speed: {speed}x"
+                  + ("  Paused" if paused else ""), font, BLACK, SCREEN_WIDTH // 2, 60)
+        pygame.display.flip()
+        display.clock.tick(FPS)
+
+
+def main(profile_path: Optional[str] = None) -> None:
     """
     Main function to run the Flappy Bird game.
 
     This function loads the high score, initializes the game state, shows the menu, and handles the game loop.
+
+    Args:
+        profile_path (Optional[str]): Time the phases of each frame of a played game and append their
+            statistics to this .jsonl or .csv file when the game ends. Training started from the menu
+            writes its per-generation statistics to the same file.
     """
     
     # Load high score
@@ -252,13 +496,18 @@ def main() -> None:
         """
         Reset the game state for a new game.
         """
-        nonlocal bird_group, pipe_group, clouds, bird
+        nonlocal sky, bird
         bird_group.empty()
         pipe_group.empty()
-        clouds = [Cloud() for _ in range(10)]
+        sky = Sky()
         bird = Bird()
         bird_group.add(bird)
     
+    # Open the window
+    screen: pygame.Surface = display.screen
+    font: pygame.font.Font = display.font(FONT_SIZE)
+    large_font: pygame.font.Font = display.font(LARGE_FONT_SIZE)
+
     # Create sprite groups
     bird_group: pygame.sprite.Group = pygame.sprite.Group()
     pipe_group: pygame.sprite.Group = pygame.sprite.Group()
@@ -267,8 +516,11 @@ def main() -> None:
     bird: Bird = Bird()
     bird_group.add(bird)
     
-    # Create clouds
-    clouds: List[Cloud] = [Cloud() for _ in range(10)]
+    # Create the cloud layers
+    sky: Sky = Sky()
+
+    profiler: Profiler = Profiler() if profile_path else NULL_PROFILER
+    games_played: int = 0
     
     def game_loop() -> int:
         """
@@ -277,60 +529,58 @@ def main() -> None:
         Returns:
             int: The final score of the game.
         """
-        nonlocal high_score
-        score: int = 0
-        last_pipe: int = pygame.time.get_ticks()
-        pipe_interval: int = 1500  # Milliseconds between pipe generation
-        running: bool = True
-        
-        while running:
-            # Handle events
+        nonlocal high_score, games_played
+        game: PlayGame = PlayGame(bird, pipe_group)
+        timestep: FixedTimestep = FixedTimestep(FPS)
+        last_frame: float = time.perf_counter()
+
+        profiler.reset_generation()
+        while not game.over:
+            profiler.start_frame()
+
+            # Handle events; a jump happens on the next tick
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                    bird.jump()
-            
-            # Add new pipes at regular intervals
-            if pygame.time.get_ticks() - last_pipe > pipe_interval:
-                last_pipe = pygame.time.get_ticks()
-                top_pipe, bottom_pipe = create_pipe()
-                pipe_group.add(top_pipe)
-                pipe_group.add(bottom_pipe)
-            
-            # Update game state
-            bird_group.update()
-            pipe_group.update()
-            for cloud in clouds:
-                cloud.update()
-            
-            # Check for collisions
-            if pygame.sprite.spritecollide(bird, pipe_group, False, pygame.sprite.collide_mask) or bird.rect.bottom >= SCREEN_HEIGHT:
-                running = False
-            
-            # Update score
-            for pipe in pipe_group:
-                if pipe.rect.centerx == bird.rect.centerx and pipe.rect.bottom >= SCREEN_HEIGHT:
-                    score += 1
-            
-            # Draw everything
+                    game.request_jump()
+            profiler.mark('events')
+
+            # Simulate every tick that is due since the last frame, catching up after slow frames
+            now: float = time.perf_counter()
+            for _ in range(timestep.advance(now - last_frame)):
+                game.tick(profiler)
+                sky.update()
+                profiler.mark('sky')
+                if game.over:
+                    break
+            last_frame = now
+
+            # Draw everything between the last two ticks
             screen.fill(BLUE)  # Background color for sky
-            for cloud in clouds:
-                cloud.draw(screen)
-            bird_group.draw(screen)
-            for pipe in pipe_group:
-                pipe.draw(screen)
-            
+            sky.draw(screen)
+            game.draw(screen, timestep.alpha)
+
             # Display the score
-            score_text: pygame.Surface = font.render(f"Score: {score}", True, BLACK)
+            score_text: pygame.Surface = assets.text(f"Score: {game.score}", font, BLACK)
             screen.blit(score_text, (10, 10))
-            
+
+            profiler.mark('draw')
+
             # Update display
             pygame.display.flip()
-            
+            profiler.mark('present')
+
             # Control frame rate
-            clock.tick(FPS)
+            display.clock.tick(FPS)
+            profiler.mark('tick')
+            profiler.end_frame()
+
+        score: int = game.score
+        if profile_path:
+            games_played += 1
+            export_stats(profile_path, profiler.generation(), 'play', game=games_played, score=score)
         
         # Update high score
         if score > high_score:
@@ -346,11 +596,10 @@ def main() -> None:
         Show the start or play-again menu.
 
         Returns:
-            str: The selected game mode ('play' or 'simulate').
+            str: The selected game mode ('play', 'simulate', 'headless' or 'resume').
         """
         screen.fill(BLUE)
-        for cloud in clouds:
-            cloud.draw(screen)
+        sky.draw(screen)
         bird_group.draw(screen)
         for pipe in pipe_group:
             pipe.draw(screen)
@@ -364,7 +613,9 @@ def main() -> None:
         draw_text(screen, "Flappy Bird", large_font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
         draw_text(screen, "Press P to play", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2.5)
         draw_text(screen, "Press S to simulate", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        draw_text(screen, f"High Score: {high_score}", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.5)
+        draw_text(screen, "Press H to train headless", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.75)
+        draw_text(screen, "Press R to resume training", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.5)
+        draw_text(screen, f"High Score: {high_score}", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.3)
         pygame.display.flip()
         
         waiting: bool = True
@@ -379,6 +630,12 @@ def main() -> None:
                     if event.key == pygame.K_s:
                         mode = 'simulate'
                         waiting = False
+                    if event.key == pygame.K_h:
+                        mode = 'headless'
+                        waiting = False
+                    if event.key == pygame.K_r:
+                        mode = 'resume'
+                        waiting = False
         return mode
 
     # Show the start menu
@@ -388,14 +645,17 @@ def main() -> None:
         if mode == 'play':
             score: int = game_loop()
             reset_game_state()  # Reset game state for play again
-        elif mode == 'simulate':
-            config_path: str = os.path.join(os.path.dirname(__file__), 'config-feedforward.txt')
-            run(config_path)
+        elif mode in ('simulate', 'headless', 'resume'):
+            if mode == 'headless':
+                screen.fill(BLUE)
+                draw_text(screen, "Training headless...", font, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                pygame.display.flip()
+            run(CONFIG_PATH, headless=(mode == 'headless'), resume='latest' if mode == 'resume' else None,
+                profile_path=profile_path, telemetry_path=TELEMETRY_PATH)
             reset_game_state()  # Reset game state after simulation
 
         screen.fill(BLUE)
-        for cloud in clouds:
-            cloud.draw(screen)
+        sky.draw(screen)
         bird_group.draw(screen)
         for pipe in pipe_group:
             pipe.draw(screen)
@@ -410,8 +670,10 @@ def main() -> None:
             draw_text(screen, "Game Over", large_font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
             draw_text(screen, f"Score: {score}", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
             draw_text(screen, f"High Score: {high_score}", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.5)
+        draw_text(screen, "Press R to resume training", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.3)
         draw_text(screen, "Press P to play again", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.2)
         draw_text(screen, "Press S to simulate", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.1)
+        draw_text(screen, "Press H to train headless", font, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.03)
         pygame.display.flip()
 
         waiting = True
@@ -427,9 +689,79 @@ def main() -> None:
                     if event.key == pygame.K_s:
                         mode = 'simulate'
                         waiting = False
+                    if event.key == pygame.K_h:
+                        mode = 'headless'
+                        waiting = False
+                    if event.key == pygame.K_r:
+                        mode = 'resume'
+                        waiting = False
                     # Reset game state
                     reset_game_state()
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Flappy Bird with NEAT training.")
+    parser.add_argument('--train', action='store_true', help="Start training immediately instead of showing the menu.")
+    parser.add_argument('--headless', action='store_true', help="Train without rendering or frame limiting.")
+    parser.add_argument('--generations', type=int, default=50, help="Maximum number of generations to train.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of processes that evaluate genomes in parallel (headless).")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for a reproducible run on a fixed course.")
+    parser.add_argument('--cache-size', type=int, default=10000,
+                        help="Fitness cache size (0 disables it). Only used with --seed, which keeps the course fixed.")
+    parser.add_argument('--render-every', type=int, default=1, help="When watching training, draw one of every N frames.")
+    parser.add_argument('--top-k', type=int, default=None, help="When watching training, draw only the K best living birds.")
+    parser.add_argument('--dirty-rects', action='store_true', help="When watching training, update only changed screen areas.")
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, help="Directory for training checkpoints.")
+    parser.add_argument('--checkpoint-every', type=int, default=5, help="Save a checkpoint every N generations (0 disables).")
+    parser.add_argument('--checkpoint-seconds', type=float, default=300.0, help="Save a checkpoint every N seconds (0 disables).")
+    parser.add_argument('--resume', nargs='?', const='latest', default=None,
+                        help="Resume training from a checkpoint file, or from the newest one if no file is given.")
+    parser.add_argument('--profile', action='store_true', help="Time the phases of each frame and print them per generation.")
+    parser.add_argument('--profile-output', default=None, metavar='PATH',
+                        help="Append per-generation (or per-game) phase timings to a .jsonl or .csv file.")
+    parser.add_argument('--profile-overlay', action='store_true', help="When watching training, show live phase timings.")
+    parser.add_argument('--max-frames', type=int, default=None, help="End each generation after N frames.")
+    parser.add_argument('--max-seconds', type=float, default=None, help="End each generation after N seconds.")
+    parser.add_argument('--stop-when-decided', action='store_true',
+                        help="End a generation once the last bird left is ahead of all others.")
+    parser.add_argument('--curriculum', type=int, default=None, metavar='FRAMES',
+                        help="Start with generations of at most FRAMES frames and grow the limit as the birds improve.")
+    parser.add_argument('--record', default=None, metavar='PATH', help="Record every training episode to a replay file.")
+    parser.add_argument('--replay', default=None, metavar='PATH', help="Play back an episode from a replay file.")
+    parser.add_argument('--replay-generation', type=int, default=None, help="Generation to play back.")
+    parser.add_argument('--replay-genome', type=int, default=None,
+                        help="Genome to play back. Defaults to the fittest one of the generation.")
+    parser.add_argument('--courses', type=int, default=1,
+                        help="Headless: fly each genome on N courses per generation and use its mean fitness.")
+    parser.add_argument('--telemetry', default=TELEMETRY_PATH, metavar='PATH',
+                        help="Append per-generation training statistics to this JSON Lines file (empty disables).")
+    parser.add_argument('--quiet', action='store_true', help="Do not print the headless progress line or saved checkpoints.")
+    parser.add_argument('--config', default=CONFIG_PATH, help="Path to the NEAT configuration file.")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.replay:
+        watch_replay(args.replay, args.replay_generation, args.replay_genome)
+    elif args.train or args.headless or args.workers > 1 or args.resume:
+        run(args.config, headless=args.headless, generations=args.generations, progress=not args.quiet,
+            workers=args.workers, seed=args.seed, cache_size=args.cache_size,
+            render_every=args.render_every, top_k=args.top_k, dirty_rects=args.dirty_rects,
+            checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every or None,
+            checkpoint_seconds=args.checkpoint_seconds or None, resume=args.resume,
+            profile=args.profile, profile_path=args.profile_output, profile_overlay=args.profile_overlay,
+            max_frames=args.max_frames, max_seconds=args.max_seconds, stop_when_decided=args.stop_when_decided,
+            curriculum_start=args.curriculum, record_path=args.record, courses=max(1, args.courses),
+            telemetry_path=args.telemetry or None)
+    else:
+        main(args.profile_output)
 
@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import random
+import time
+from typing import List, Optional
+import neat
+from components.champion import champion_source, load_champion, save_champion
+from components.inference import (DEFAULT_HOST, DEFAULT_PORT, InferenceServer, format_stats, generate_load,
+                                  load_network)
+
+# Path to the NEAT configuration file
+CONFIG_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config-feedforward.txt')
+
+
+def serve(args: argparse.Namespace) -> None:
+    """
+    Load the genome and answer requests until interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the serve command.
+    """
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         args.config)
+    net = load_network(args.genome, config)
+    server = InferenceServer(net, args.host, args.port, window=args.window_ms / 1000, max_batch=args.max_batch,
+                             report_interval=args.report_seconds if args.report_seconds > 0 else None)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print(format_stats(server.stats.snapshot()))
+
+
+def load(args: argparse.Namespace) -> None:
+    """
+    Drive a running server with concurrent games and print the measurements.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the load command.
+    """
+    max_frames = args.max_frames if args.max_frames > 0 else None
+    report = asyncio.run(generate_load(args.host, args.port, args.sessions, args.seed, max_frames))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['sessions']} games, mean score {report['mean_score']:.1f} over {report['mean_frames']:.0f} frames")
+    print(f"Client: {report['requests']} requests in {report['seconds']:.2f} s, "
+          f"{report['requests_per_second']:.0f}/s", end='')
+    if 'latency_p50_ms' in report:
+        print(f", round trip p50 {report['latency_p50_ms']:.2f} ms p99 {report['latency_p99_ms']:.2f} ms "
+              f"max {report['latency_max_ms']:.2f} ms", end='')
+    print()
+    print(f"Server: {format_stats(report['server'])}")
+
+
+def export(args: argparse.Namespace) -> None:
+    """
+    Export a pickled genome as a compiled champion and check it against neat.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the export command.
+    """
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         args.config)
+    with open(args.genome, 'rb') as f:
+        genome = pickle.load(f)
+    data = save_champion(genome, config, args.output)
+    links = sum(len(node['links']) for node in data['nodes'])
+    print(f"Exported genome {genome.key} to {args.output}: {len(data['nodes'])} nodes, {links} connections "
+          f"({len(genome.nodes)} nodes and {len(genome.connections)} connections in the genome)")
+    if args.source:
+        with open(args.source, 'w') as f:
+            f.write(champion_source(data))
+        print(f"Wrote the compiled evaluator to {args.source}")
+
+    start = time.perf_counter()
+    champion = load_champion(args.output)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # The compiled network must give exactly the outputs of neat's network
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    rng = random.Random(0)
+    samples = [[rng.uniform(-1.0, 2.0) for _ in range(champion.num_inputs)] for _ in range(args.checks)]
+    mismatches = sum(net.activate(inputs) != champion.activate(inputs) for inputs in samples)
+    start = time.perf_counter()
+    for inputs in samples:
+        champion.activate(inputs)
+    decide_us = (time.perf_counter() - start) / max(1, len(samples)) * 1e6
+    print(f"Loaded in {load_ms:.2f} ms, {decide_us:.2f} us per decision, "
+          f"{len(samples) - mismatches} of {len(samples)} checked outputs equal to neat")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Serve or export a trained genome and load-test the server.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="Answer observation requests with the genome's decisions.")
+    serve_parser.add_argument('--genome', default='winner.pkl', help="The pickled genome to serve.")
+    serve_parser.add_argument('--config', default=CONFIG_PATH, help="Path to the NEAT configuration file.")
+    serve_parser.add_argument('--window-ms', type=float, default=2.0,
+                              help="Longest time a request waits for others to join its batch (0 batches only what is queued).")
+    serve_parser.add_argument('--max-batch', type=int, default=256, help="Largest number of requests evaluated together.")
+    serve_parser.add_argument('--report-seconds', type=float, default=10.0, help="Print the counters every N seconds (0 disables).")
+    serve_parser.set_defaults(handler=serve)
+
+    export_parser = commands.add_parser('export', help="Compile a genome into a file that loads without neat or pickle.")
+    export_parser.add_argument('--genome', default='winner.pkl', help="The pickled genome to export.")
+    export_parser.add_argument('--config', default=CONFIG_PATH, help="Path to the NEAT configuration file.")
+    export_parser.add_argument('--output', default='winner.json', help="The exported network.")
+    export_parser.add_argument('--source', default=None, metavar='PATH',
+                               help="Also write the compiled evaluator as a Python module.")
+    export_parser.add_argument('--checks', type=int, default=10000, help="Random inputs to compare against neat.")
+    export_parser.set_defaults(handler=export)
+
+    load_parser = commands.add_parser('load', help="Play many concurrent games against a running server.")
+    load_parser.add_argument('--sessions', type=int, default=100, help="Number of concurrent games.")
+    load_parser.add_argument('--max-frames', type=int, default=2000, help="End each game after N frames (0 plays until the bird crashes).")
+    load_parser.add_argument('--seed', type=int, default=0, help="Seed of the first game's course; game K uses seed + K.")
+    load_parser.add_argument('--json', action='store_true', help="Print the measurements as JSON.")
+    load_parser.set_defaults(handler=load)
+
+    for command_parser in (serve_parser, load_parser):
+        command_parser.add_argument('--host', default=DEFAULT_HOST, help="Address of the server.")
+        command_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port of the server.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    args.handler(args)
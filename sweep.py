@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+import time
+from typing import List, Optional
+from components.sweep import (Parameter, SuccessiveHalving, Trial, find_settings, format_table, grid_variants,
+                              halving_rungs, random_variants, save_results, write_variant)
+
+# Path to the NEAT configuration file the variants are made from
+CONFIG_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config-feedforward.txt')
+
+# Directory the sweeps are written to
+SWEEP_DIR: str = "sweeps"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments, with each --param parsed into a Parameter.
+    """
+    parser = argparse.ArgumentParser(
+        description="Train variants of the NEAT configuration in parallel and prune the poor ones early.")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUES', required=True,
+                        help="A setting to vary, as name=v1,v2,... or name=low:high (repeatable). "
+                             "Prefix the name with its section if it is ambiguous.")
+    parser.add_argument('--samples', type=int, default=0,
+                        help="Draw N random variants instead of trying every combination (required for ranges).")
+    parser.add_argument('--min-generations', type=int, default=5, help="Generations of the first rung.")
+    parser.add_argument('--max-generations', type=int, default=45, help="Generations of the last rung.")
+    parser.add_argument('--eta', type=int, default=3,
+                        help="Keep the best 1/ETA of the variants and multiply the generations by ETA at every rung.")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Number of variants trained at the same time.")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Course seed of every variant, so they are compared on the same courses.")
+    parser.add_argument('--sample-seed', type=int, default=None, help="Seed for drawing random variants.")
+    parser.add_argument('--max-frames', type=int, default=5000, help="End each generation after N frames (0 for no limit).")
+    parser.add_argument('--courses', type=int, default=1, help="Fly each genome on N courses per generation.")
+    parser.add_argument('--config', default=CONFIG_PATH, help="The NEAT configuration file to make the variants from.")
+    parser.add_argument('--output', default=None, metavar='DIR',
+                        help="Directory for the variants and results. Defaults to a new directory in sweeps/.")
+    args = parser.parse_args(argv)
+
+    # Check every setting before a trial directory is made, so a typo fails without leaving a sweep behind
+    try:
+        args.param = [Parameter.parse(text) for text in args.param]
+        find_settings(args.config, [parameter.name for parameter in args.param])
+    except ValueError as e:
+        parser.error(str(e))
+    if args.samples <= 0 and any(parameter.is_range for parameter in args.param):
+        parser.error("ranges can only be sampled; set --samples for a random search")
+    return args
+
+
+def sweep(args: argparse.Namespace) -> None:
+    """
+    Run a sweep and print the results table.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    parameters: List[Parameter] = args.param
+    if args.samples > 0:
+        variants = random_variants(parameters, args.samples, random.Random(args.sample_seed))
+    else:
+        variants = grid_variants(parameters)
+
+    directory = args.output or os.path.join(SWEEP_DIR, time.strftime("%Y%m%d-%H%M%S"))
+    config_path = os.path.abspath(args.config)
+    trials: List[Trial] = []
+    for number, overrides in enumerate(variants):
+        trial = Trial(number, overrides, os.path.join(directory, f"trial-{number:03d}"))
+        os.makedirs(trial.directory, exist_ok=True)
+        write_variant(config_path, overrides, trial.config_path)
+        trials.append(trial)
+
+    rungs = halving_rungs(args.min_generations, args.max_generations, args.eta)
+    print(f"{len(trials)} variants in {directory}, rungs of {', '.join(map(str, rungs))} generations, "
+          f"{args.jobs} at a time")
+    start = time.perf_counter()
+    halving = SuccessiveHalving(trials, rungs, args.eta, args.jobs, args.seed,
+                                args.max_frames if args.max_frames > 0 else None, max(1, args.courses))
+    ranked = halving.run()
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(format_table(ranked))
+    save_results(ranked, os.path.join(directory, 'results.json'))
+
+    # Compare with training every variant for the full budget, at each variant's measured speed
+    used = sum(trial.train_seconds for trial in trials)
+    full = sum(trial.train_seconds / trial.generations * rungs[-1] for trial in trials if trial.generations)
+    print(f"\n{elapsed:.1f} s wall time, {used:.1f} CPU-seconds of training; "
+          f"training every variant for {rungs[-1]} generations would take about {full:.1f}")
+    print(f"Results saved to {os.path.join(directory, 'results.json')}")
+
+
+if __name__ == "__main__":
+    sweep(parse_args())
@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+import warnings
+from typing import Callable, List
+
+# The tests never open a window, but pygame needs a video driver for surfaces and masks
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import neat
+import pytest
+
+CONFIG_PATH: str = os.path.join(ROOT, 'config-feedforward.txt')
+
+
+@pytest.fixture(scope='session')
+def config() -> neat.Config:
+    """The NEAT configuration the game trains with."""
+    with warnings.catch_warnings():
+        # neat warns about every option the file leaves at its default
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                           neat.DefaultStagnation, CONFIG_PATH)
+
+
+# Heights, in pixels above the middle of the gap, below which the hand-made pilots jump
+PILOT_OFFSETS: List[int] = [100, 102, 108]
+
+
+def pilot(config: neat.Config, key: int, offset: int) -> neat.DefaultGenome:
+    """
+    Build a genome that flies far without training: it jumps whenever the bird's top is more than
+    offset pixels below the top of the gap.
+
+    Args:
+        config (neat.Config): The NEAT configuration.
+        key (int): The genome key.
+        offset (int): The jump height in pixels.
+
+    Returns:
+        neat.DefaultGenome: The genome, with one sigmoid output reading the bird height and the gap.
+    """
+    genome = config.genome_type(key)
+    genome.configure_new(config.genome_config)
+    for connection in genome.connections.values():
+        connection.weight = 0.0
+        connection.enabled = True
+    genome.connections[(-1, 0)].weight = 100.0  # Bird height
+    genome.connections[(-3, 0)].weight = -100.0  # Top of the gap
+    output = genome.nodes[0]
+    output.bias = -100.0 * offset / 600
+    output.response = 1.0
+    output.activation = 'sigmoid'
+    return genome
+
+
+@pytest.fixture
+def make_genomes(config: neat.Config) -> Callable[..., List[neat.DefaultGenome]]:
+    """
+    Build reproducible genomes of different sizes.
+
+    Returns:
+        Callable[..., List[neat.DefaultGenome]]: make_genomes(count, seed=0) returns fresh genomes mutated
+        a different number of times, which mostly crash early, followed by the pilots, which fly far.
+    """
+    def make(count: int, seed: int = 0) -> List[neat.DefaultGenome]:
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            genomes: List[neat.DefaultGenome] = []
+            for key in range(count):
+                genome = config.genome_type(key)
+                genome.configure_new(config.genome_config)
+                for _ in range(key % 5):
+                    genome.mutate_add_node(config.genome_config)
+                    genome.mutate(config.genome_config)
+                genomes.append(genome)
+            genomes += [pilot(config, count + k, offset) for k, offset in enumerate(PILOT_OFFSETS)]
+            return genomes
+        finally:
+            random.setstate(state)
+    return make
@@ -0,0 +1,56 @@
+import numpy as np
+import neat
+import pytest
+from components.batch_net import BatchNetwork
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    """Genomes with different numbers of hidden nodes, so the batch has several size groups."""
+    return make_genomes(20)
+
+
+def reference(genomes, config, inputs, rows):
+    """Evaluate each requested network with neat's FeedForwardNetwork."""
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+    return np.array([nets[row].activate(list(x)) for row, x in zip(rows, inputs)])
+
+
+def test_groups_by_size(genomes, config):
+    """Networks of different sizes are kept in separate groups instead of all being padded to the largest."""
+    nets = BatchNetwork.create(genomes, config)
+    sizes = [group.weights.shape[1] for group in nets.groups]
+    assert len(nets) == len(genomes)
+    assert len(sizes) > 1 and sizes == sorted(set(sizes))
+
+
+def test_all_networks_match_neat(genomes, config):
+    """Evaluating every network at once gives the outputs of FeedForwardNetwork."""
+    inputs = np.random.default_rng(0).uniform(-1.5, 1.5, (len(genomes), 4))
+    nets = BatchNetwork.create(genomes, config)
+    expected = reference(genomes, config, inputs, range(len(genomes)))
+    np.testing.assert_allclose(nets.activate(inputs), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_selected_rows_match_neat(genomes, config):
+    """A subset of networks, in any order and with repeats, gives the same outputs as neat."""
+    rng = np.random.default_rng(1)
+    nets = BatchNetwork.create(genomes, config)
+    for rows in (np.array([3, 0, 7, 7, 21]), rng.permutation(len(genomes))[:9], np.array([5])):
+        inputs = rng.uniform(-1.5, 1.5, (len(rows), 4))
+        expected = reference(genomes, config, inputs, rows)
+        np.testing.assert_allclose(nets.activate(inputs, rows), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_selection_is_reused(genomes, config):
+    """Asking for the same networks again reuses their compacted arrays, and the full set is never copied."""
+    nets = BatchNetwork.create(genomes, config)
+    rows = np.arange(0, len(genomes), 2)
+    inputs = np.random.default_rng(2).uniform(-1.5, 1.5, (len(rows), 4))
+    first = nets.activate(inputs, rows)
+    selection = nets._select(rows)
+    assert nets._select(rows.copy()) is selection
+    np.testing.assert_array_equal(nets.activate(inputs, rows), first)
+
+    for _, group in nets._select(np.arange(len(genomes))):
+        assert any(group is whole for whole in nets.groups)
@@ -0,0 +1,90 @@
+import copy
+import math
+import os
+import random
+import subprocess
+import sys
+import neat
+import pytest
+from components.champion import Champion, export_champion, load_champion, save_champion
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    return make_genomes(15)
+
+
+def random_inputs(rng, count=200):
+    """Inputs in the ranges Simulation.observe produces, plus a few outside them."""
+    return [[rng.uniform(-0.5, 1.5) for _ in range(4)] for _ in range(count)]
+
+
+def test_matches_neat_bit_for_bit(tmp_path, genomes, config):
+    """A saved and loaded champion gives exactly the outputs of FeedForwardNetwork."""
+    rng = random.Random(0)
+    for genome in genomes:
+        path = tmp_path / f"{genome.key}.json"
+        save_champion(genome, config, str(path))
+        champion = load_champion(str(path))
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        for inputs in random_inputs(rng):
+            assert champion.activate(inputs) == net.activate(inputs)
+            assert champion.decide(inputs) == (net.activate(inputs)[0] > 0.5)
+
+
+def test_loading_does_not_import_neat(tmp_path, genomes, config):
+    """Loading and evaluating a saved champion works without neat."""
+    path = tmp_path / "champion.json"
+    save_champion(genomes[-1], config, str(path))
+    script = ("import sys\n"
+              "from components.champion import load_champion\n"
+              f"print(load_champion({str(path)!r}).decide([0.5, 0.5, 0.5, 0.5]))\n"
+              "assert 'neat' not in sys.modules\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=root)
+    assert result.returncode == 0, result.stderr
+
+
+def test_wrong_number_of_inputs(genomes, config):
+    """The compiled function checks the number of inputs."""
+    champion = Champion(export_champion(genomes[0], config))
+    with pytest.raises(ValueError):
+        champion.activate([0.0, 0.0])
+
+
+def break_num_inputs(data):
+    data['num_inputs'] = "4); import os; (1"
+
+
+def break_activation(data):
+    data['nodes'][0]['activation'] = 'print'
+
+
+def break_source(data):
+    data['nodes'][0]['links'].append([len(data['nodes']) + data['num_inputs'], 1.0])
+
+
+def break_weight(data):
+    data['nodes'][0]['links'].append([0, "1) or (2"])
+
+
+def break_bias(data):
+    data['nodes'][0]['bias'] = math.nan
+
+
+def break_output(data):
+    data['outputs'] = ["v0"]
+
+
+def break_format(data):
+    data['version'] = 99
+
+
+@pytest.mark.parametrize('damage', [break_num_inputs, break_activation, break_source, break_weight, break_bias,
+                                    break_output, break_format])
+def test_malformed_export_is_rejected(genomes, config, damage):
+    """A damaged export raises ValueError before any code is generated from it."""
+    data = copy.deepcopy(export_champion(genomes[-1], config))
+    damage(data)
+    with pytest.raises(ValueError):
+        Champion(data)
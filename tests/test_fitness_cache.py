@@ -0,0 +1,68 @@
+import copy
+import numpy as np
+from components.fitness_cache import FitnessCache, genome_key
+from components.simulation import EpisodeBudget, simulate
+import main
+
+SEED: int = 4
+COURSE = (SEED, 1000, 1)
+
+
+def test_key_depends_only_on_what_decides_play(make_genomes):
+    """Equal genomes share a key whatever their ID or gene order; any change to the network or course changes it."""
+    genome = make_genomes(5)[4]
+    twin = copy.deepcopy(genome)
+    twin.key = 999
+    twin.connections = dict(reversed(list(twin.connections.items())))
+    assert genome_key(twin, COURSE) == genome_key(genome, COURSE)
+    assert genome_key(genome, (SEED + 1, 1000, 1)) != genome_key(genome, COURSE)
+
+    changed = copy.deepcopy(genome)
+    next(iter(changed.connections.values())).weight += 0.5
+    assert genome_key(changed, COURSE) != genome_key(genome, COURSE)
+
+    disabled = copy.deepcopy(genome)
+    connection = next(cg for cg in disabled.connections.values() if cg.enabled)
+    connection.enabled = False
+    key = genome_key(disabled, COURSE)
+    assert key != genome_key(genome, COURSE)
+    connection.weight += 1.0  # The weight of a disabled connection does not matter
+    assert genome_key(disabled, COURSE) == key
+
+
+def test_least_recently_used_is_evicted():
+    """At capacity, the result that was used longest ago is dropped."""
+    cache = FitnessCache(max_size=2)
+    cache.put(b'a', (1.0, 1, 1))
+    cache.put(b'b', (2.0, 2, 2))
+    assert cache.get(b'a') == (1.0, 1, 1)
+    cache.put(b'c', (3.0, 3, 3))
+    assert len(cache) == 2
+    assert cache.get(b'b') is None
+    assert cache.get(b'a') == (1.0, 1, 1) and cache.get(b'c') == (3.0, 3, 3)
+
+
+def test_elites_skip_simulation_on_a_fixed_course(make_genomes, config):
+    """Genomes carried over unchanged to the next generation are not simulated again and keep their fitness."""
+    budget = EpisodeBudget(1000)
+    parents = make_genomes(12)
+    expected = simulate(parents, config, SEED, budget)[0]
+    cache = FitnessCache()
+    main.eval_genomes([(genome.key, genome) for genome in parents], config, headless=True, progress=False,
+                      seed=SEED, cache=cache, budget=budget)
+    assert [genome.fitness for genome in parents] == expected
+    assert cache.misses == len(parents)
+
+    # The next generation: copies of the parents under new IDs, and one new genome
+    elites = [copy.deepcopy(genome) for genome in parents]
+    for key, genome in enumerate(elites, start=100):
+        genome.key, genome.fitness = key, None
+    newcomer = make_genomes(1, seed=1)[0]
+    newcomer.key = 200
+    generation = elites + [newcomer]
+    main.eval_genomes([(genome.key, genome) for genome in generation], config, headless=True, progress=False,
+                      seed=SEED, cache=cache, budget=budget)
+    assert cache.misses == len(parents) + 1
+    assert cache.hits == len(parents)
+    assert [genome.fitness for genome in elites] == expected
+    assert np.isclose(newcomer.fitness, simulate([newcomer], config, SEED, budget)[0][0])
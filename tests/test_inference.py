@@ -0,0 +1,90 @@
+import asyncio
+import json
+import neat
+import numpy as np
+import pytest
+from components.batch_net import BatchNetwork
+from components.inference import InferenceServer, MicroBatcher
+
+
+@pytest.fixture
+def genome(make_genomes):
+    """A genome with hidden nodes."""
+    return make_genomes(5)[4]
+
+
+def observations(count, seed=0):
+    return np.random.default_rng(seed).uniform(0.0, 1.0, (count, 4)).tolist()
+
+
+async def submit_all(batcher, batch):
+    """Submit observations concurrently and collect the answers, or the exceptions."""
+    batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(observation) for observation in batch), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+
+def test_concurrent_requests_share_a_batch(genome, config):
+    """Requests that arrive within the window are answered with one activation, with neat's outputs."""
+    batcher = MicroBatcher(BatchNetwork.create([genome], config), window=0.05)
+    batch = observations(10)
+    outputs = asyncio.run(submit_all(batcher, batch))
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    assert outputs == pytest.approx([net.activate(observation)[0] for observation in batch], rel=1e-12, abs=1e-12)
+    assert (batcher.stats.requests, batcher.stats.batches, batcher.stats.largest_batch) == (10, 1, 10)
+
+
+def test_full_batches_do_not_wait(genome, config):
+    """A batch is evaluated as soon as it is full, so a burst is split into batches of at most max_batch."""
+    batcher = MicroBatcher(BatchNetwork.create([genome], config), window=10.0, max_batch=4)
+    outputs = asyncio.run(asyncio.wait_for(submit_all(batcher, observations(8)), 5.0))
+    assert len(outputs) == 8 and batcher.stats.batches == 2 and batcher.stats.largest_batch == 4
+
+
+def test_failed_batch_does_not_stop_the_batcher(genome, config):
+    """A batch that cannot be evaluated fails its own requests, and later requests are still answered."""
+    batcher = MicroBatcher(BatchNetwork.create([genome], config), window=0.01)
+
+    async def scenario():
+        batcher.start()
+        try:
+            failed = await asyncio.gather(batcher.submit(['a', 'b', 'c', 'd']), batcher.submit([0.1] * 4),
+                                          return_exceptions=True)
+            answered = await asyncio.wait_for(batcher.submit([0.5] * 4), 5.0)
+        finally:
+            await batcher.stop()
+        return failed, answered
+
+    failed, answered = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in failed)
+    assert isinstance(answered, float)
+
+
+def test_server_answers_and_reports_errors(genome, config):
+    """The server answers valid requests, replies to malformed ones with an error and keeps the connection."""
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+    observation = [0.4, 0.1, 0.35, 0.8]
+    malformed = [b'not json', b'[1, 2]', b'{}', b'{"obs": [1, 2]}', b'{"obs": "abcd"}', b'{"obs": [1, 2, "x", 4]}']
+
+    async def scenario():
+        server = InferenceServer(BatchNetwork.create([genome], config), port=0, window=0.001, report_interval=None)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            replies = []
+            for line in malformed + [json.dumps({'obs': observation}).encode(), b'{"stats": true}']:
+                writer.write(line + b'\n')
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            return replies
+        finally:
+            await server.close()
+
+    replies = asyncio.run(scenario())
+    assert all('error' in reply for reply in replies[:len(malformed)])
+    answer, stats = replies[-2:]
+    assert answer['output'] == pytest.approx(net.activate(observation)[0], rel=1e-12, abs=1e-12)
+    assert answer['jump'] == (answer['output'] > 0.5)
+    assert (stats['requests'], stats['errors'], stats['connections'], stats['batches']) == (1, len(malformed), 1, 1)
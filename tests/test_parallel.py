@@ -0,0 +1,37 @@
+import pytest
+from components.parallel import ParallelEvaluator
+from components.simulation import EpisodeBudget, simulate
+from components.vector_env import course_seeds, evaluate_courses
+
+SEED: int = 5
+MAX_FRAMES: int = 1500
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    return make_genomes(24)
+
+
+def test_workers_match_single_process(genomes, config):
+    """Splitting a generation over worker processes gives every genome the results of one process."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    evaluator = ParallelEvaluator(2, config, budget=budget)
+    try:
+        assert evaluator.simulate(genomes, SEED) == simulate(genomes, config, SEED, budget)
+        evaluator.evaluate([(genome.key, genome) for genome in genomes], config, seed=SEED)
+    finally:
+        evaluator.close()
+    assert [genome.fitness for genome in genomes] == simulate(genomes, config, SEED, budget)[0]
+
+
+def test_workers_match_single_process_on_several_courses(genomes, config):
+    """With several courses, the workers give the results of evaluate_courses in one process."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    evaluator = ParallelEvaluator(2, config, budget=budget, courses=3)
+    try:
+        results = evaluator.simulate(genomes, SEED)
+    finally:
+        evaluator.close()
+    expected = evaluate_courses(genomes, config, course_seeds(SEED, 3), budget)
+    assert results[1] == expected[1] and results[2] == expected[2]
+    assert results[0] == pytest.approx(expected[0], rel=1e-12)
@@ -0,0 +1,55 @@
+import random
+import numpy as np
+import pygame
+from components.bird import BIRD_JUMP, GRAVITY, Bird
+from components.pipe import PIPE_WIDTH, Pipe
+from components.pipe_track import PIPE_GAP, collide_gaps
+from components.population import BirdPopulation
+
+LAYOUTS: int = 5000
+
+
+def test_collide_gaps_matches_collide_mask():
+    """For birds at every angle placed around the gap edges and pipe lips, collide_gaps agrees with collide_mask."""
+    rng = random.Random(6)
+    population = BirdPopulation(LAYOUTS)
+    birds = [Bird(random.Random(i)) for i in range(LAYOUTS)]
+    pipe_x = np.zeros(LAYOUTS, dtype=np.int64)
+    gap_top = np.zeros(LAYOUTS, dtype=np.int64)
+    expected = np.zeros(LAYOUTS, dtype=bool)
+
+    # One update from a velocity a bird can reach in play gives it one of the rotations seen in play
+    for i, bird in enumerate(birds):
+        bird.velocity = population.velocity[i] = BIRD_JUMP + GRAVITY * rng.randint(0, 80)
+        bird.update()
+    population.update()
+
+    for i, bird in enumerate(birds):
+        assert population.rect(i).size == bird.rect.size
+        top = rng.randint(150, 350)
+        bird.rect.y = population.y[i] = top
+        rect = bird.rect
+
+        # Put a lip of the pair just around the bird's left or right edge, or the pair across the bird
+        pipe_x[i] = rng.choice([rect.left - PIPE_WIDTH, rect.right, rect.centerx - PIPE_WIDTH // 2]) + rng.randint(-4, 4)
+        # Put the top pipe's bottom near the bird's top, or the bottom pipe's top near the bird's bottom
+        if rng.random() < 0.5:
+            gap_top[i] = rect.top + rng.randint(-6, 6)
+        else:
+            gap_top[i] = rect.bottom - PIPE_GAP + rng.randint(-6, 6)
+
+        pipes = pygame.sprite.Group(Pipe(int(pipe_x[i]) + PIPE_WIDTH // 2, int(gap_top[i]), True),
+                                    Pipe(int(pipe_x[i]) + PIPE_WIDTH // 2, int(gap_top[i]) + PIPE_GAP, False))
+        assert pipes.sprites()[0].rect.x == pipe_x[i]
+        expected[i] = bool(pygame.sprite.spritecollide(bird, pipes, False, pygame.sprite.collide_mask))
+
+    hit = collide_gaps(population, np.arange(LAYOUTS), np.ones(LAYOUTS, dtype=bool), pipe_x, gap_top)
+    assert np.array_equal(hit, expected)
+    assert 0.1 < expected.mean() < 0.9  # Both outcomes are well represented
+
+
+def test_no_pair_ahead_never_collides():
+    """Birds without a pair in front of them are not tested against the ignored pipe positions."""
+    population = BirdPopulation(3)
+    hit = collide_gaps(population, np.arange(3), np.zeros(3, dtype=bool), np.full(3, 85), np.full(3, 400))
+    assert not hit.any()
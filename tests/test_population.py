@@ -0,0 +1,58 @@
+import random
+import numpy as np
+from components.bird import Bird
+from components.population import BirdPopulation, rotated_extent
+
+
+def test_update_matches_bird_sprites():
+    """Every bird of a population moves, rotates and scores exactly like a Bird sprite given the same jumps."""
+    rng = random.Random(1)
+    size = 12
+    birds = [Bird(random.Random(i)) for i in range(size)]
+    population = BirdPopulation(size)
+    for bird in birds:
+        bird.jump()
+    population.jump()
+
+    for frame in range(400):
+        for bird in birds:
+            bird.update()
+        population.update()
+        jumping = [i for i in range(size) if rng.random() < 0.08]
+        for i in jumping:
+            birds[i].jump()
+        population.jump(jumping)
+
+        for i, bird in enumerate(birds):
+            assert population.rect(i) == bird.rect, f"bird {i} at frame {frame}"
+            assert population.velocity[i] == bird.velocity
+            assert population.angle[i] == bird.angle
+            assert population.score[i] == bird.score
+
+
+def test_dead_birds_stop_moving():
+    """Killed birds keep their state while the others move on, and reset puts them back at the start."""
+    population = BirdPopulation(4)
+    population.jump()
+    population.update()
+    population.kill([1, 3])
+    y, score = population.y.copy(), population.score.copy()
+    population.update()
+    assert np.array_equal(population.alive_indices, [0, 2])
+    assert np.array_equal(population.y[[1, 3]], y[[1, 3]])
+    assert np.array_equal(population.score[[1, 3]], score[[1, 3]])
+    assert np.all(population.score[[0, 2]] == score[[0, 2]] + 1)
+
+    population.reset([1])
+    fresh = BirdPopulation(1)
+    assert population.rect(1) == fresh.rect(0)
+    assert population.alive[1] and population.score[1] == 0
+
+
+def test_rotated_extent_matches_pygame():
+    """The rotated image size computed for every reachable angle equals the one pygame produces."""
+    import pygame
+    image = pygame.Surface((30, 30), pygame.SRCALPHA)
+    angles = np.arange(-90.0, 90.25, 0.25)
+    expected = [pygame.transform.rotate(image, angle).get_width() for angle in angles]
+    assert np.array_equal(rotated_extent(angles), expected)
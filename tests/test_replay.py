@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from components.replay import ReplayFile, ReplayPlayer, ReplayWriter
+from components.simulation import EpisodeBudget, Simulation
+
+SEED: int = 11
+MAX_FRAMES: int = 1200
+
+
+@pytest.fixture
+def episode(make_genomes, config):
+    """A finished simulation that recorded its jumps, with its genomes."""
+    genomes = make_genomes(10)
+    simulation = Simulation(genomes, config, SEED, budget=EpisodeBudget(MAX_FRAMES), record=True)
+    simulation.run()
+    return genomes, simulation
+
+
+def record(path, genomes, simulation, generation=0, append=False):
+    """Write one generation of a simulation to a replay file."""
+    writer = ReplayWriter(str(path), append=append)
+    writer.start_generation(generation)
+    writer.write_simulation(genomes, SEED, simulation)
+    return writer
+
+
+def test_round_trip(tmp_path, episode):
+    """Every recorded episode reads back with its seed, results and jump decisions."""
+    genomes, simulation = episode
+    path = tmp_path / 'run.fbr'
+    record(path, genomes, simulation).close()
+
+    replays = ReplayFile(str(path))
+    fitness, scores, frames = simulation.results()
+    assert len(replays) == len(genomes)
+    for genome, genome_fitness, score, flown, jumps in zip(genomes, fitness, scores, frames,
+                                                           simulation.jump_streams()):
+        replay = replays.read(0, genome.key)
+        assert (replay.seed, replay.fitness, replay.score, replay.frames) == (SEED, genome_fitness, score, flown)
+        assert np.array_equal(replay.jumps, jumps)
+    assert replays.best().fitness == max(fitness)
+
+
+def test_player_reproduces_the_flight(tmp_path, episode):
+    """Playing a replay with the game sprites gives the recorded score and crashes on the recorded frame."""
+    genomes, simulation = episode
+    path = tmp_path / 'run.fbr'
+    record(path, genomes, simulation).close()
+
+    for replay in ReplayFile(str(path)):
+        player = ReplayPlayer(replay)
+        while not player.done:
+            player.step()
+            crashed = player.crashed()
+            assert not crashed or player.done, f"genome {replay.genome_id} crashed early at frame {player.frame}"
+        assert player.bird.score == replay.score
+        assert crashed == (replay.frames < MAX_FRAMES)
+
+
+def test_unfinished_file_is_readable(tmp_path, episode):
+    """A file whose writer never wrote the index is read by scanning its records."""
+    genomes, simulation = episode
+    path = tmp_path / 'run.fbr'
+    writer = record(path, genomes, simulation)
+    writer.end_generation(None, {}, None)
+    assert len(ReplayFile(str(path))) == len(genomes)
+    writer.close()
+
+
+def test_append_keeps_earlier_episodes(tmp_path, episode):
+    """Appending, as a resumed run does, keeps the earlier records under one new index."""
+    genomes, simulation = episode
+    path = tmp_path / 'run.fbr'
+    record(path, genomes, simulation, generation=0).close()
+    record(path, genomes, simulation, generation=1, append=True).close()
+
+    replays = ReplayFile(str(path))
+    assert replays.generations() == [0, 1]
+    assert len(replays) == 2 * len(genomes)
+    assert np.array_equal(replays.read(0, genomes[-1].key).jumps, replays.read(1, genomes[-1].key).jumps)
+
+    record(path, genomes, simulation, generation=2).close()
+    assert ReplayFile(str(path)).generations() == [2]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from components.simulation import DecisionSchedule, EpisodeBudget, Simulation, simulate
+
+SEED: int = 3
+MAX_FRAMES: int = 1500
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    """Fresh genomes that mostly crash early and pilots that pass many pipes."""
+    return make_genomes(16)
+
+
+def test_same_seed_same_results(genomes, config):
+    """A course is fully determined by its seed."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    first = simulate(genomes, config, SEED, budget)
+    assert simulate(genomes, config, SEED, budget) == first
+    assert max(first[2]) > 300
+
+
+def test_splitting_does_not_change_results(genomes, config):
+    """Birds are scored on their own, so any split or order of the genomes gives each one the same results."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    fitness, scores, frames = simulate(genomes, config, SEED, budget)
+    half = len(genomes) // 2
+    parts = [simulate(genomes[:half], config, SEED, budget), simulate(genomes[half:], config, SEED, budget)]
+    assert [value for part in parts for value in part[0]] == fitness
+    assert [value for part in parts for value in part[1]] == scores
+    assert [value for part in parts for value in part[2]] == frames
+
+    reversed_results = simulate(genomes[::-1], config, SEED, budget)
+    assert reversed_results[0][::-1] == fitness
+
+
+def test_frame_limit_only_cuts_long_flights(genomes, config):
+    """A frame limit stops the birds still flying without the crash penalty and leaves the others alone."""
+    limit = 300
+    fitness, scores, frames = simulate(genomes, config, SEED, EpisodeBudget(MAX_FRAMES))
+    cut_fitness, cut_scores, cut_frames = simulate(genomes, config, SEED, EpisodeBudget(limit))
+    for i in range(len(genomes)):
+        if frames[i] < limit:
+            assert (cut_fitness[i], cut_scores[i], cut_frames[i]) == (fitness[i], scores[i], frames[i])
+        else:
+            assert cut_frames[i] == limit
+    assert any(flown >= limit for flown in frames)
+
+
+def test_every_frame_schedule_is_the_default(genomes, config):
+    """A decision interval of one frame is the same as deciding on every frame."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    assert simulate(genomes, config, SEED, budget, DecisionSchedule(1)) == simulate(genomes, config, SEED, budget)
+
+
+def test_observe_and_act_match_step(genomes, config):
+    """Controlling the birds from outside with observe() and act() gives the same episode as step()."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    expected = simulate(genomes, config, SEED, budget)
+    stepped = Simulation(genomes, config, SEED, budget=budget)
+    outside = Simulation(genomes, None, SEED, budget=budget)
+    while not outside.done:
+        rows, inputs = outside.observe()
+        decisions = stepped.nets.activate(inputs, rows)[:, 0] > 0.5 if len(rows) else np.zeros(0, dtype=bool)
+        outside.act(decisions)
+    assert outside.results() == expected
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from components.simulation import EpisodeBudget
+from components.staged import STAGE_GAP, Stage, StagedEvaluation, stage_ceiling
+from components.vector_env import course_seeds, evaluate_courses
+
+SEED: int = 2
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    return make_genomes(21)
+
+
+def test_offsets_depend_only_on_the_stages():
+    """Each stage's offset is the most fitness of all earlier stages plus the gap, whatever was evaluated."""
+    stages = StagedEvaluation([Stage(300), Stage(1500), Stage(6000)])
+    assert stages.offsets == [0.0, stage_ceiling(300) + STAGE_GAP,
+                              stage_ceiling(300) + stage_ceiling(1500) + 2 * STAGE_GAP]
+
+
+def test_ceiling_bounds_fitness(genomes, config):
+    """No bird earns more than the ceiling of the frame limit."""
+    for max_frames in (50, 200, 700):
+        fitness, _, _ = evaluate_courses(genomes, config, [SEED], EpisodeBudget(max_frames))
+        assert max(fitness) <= stage_ceiling(max_frames)
+
+
+def test_one_stage_is_a_plain_evaluation(genomes, config):
+    """A single stage scores every genome as evaluate_courses does."""
+    stages = StagedEvaluation([Stage(400, courses=2)])
+    expected = evaluate_courses(genomes, config, course_seeds(SEED, 2), EpisodeBudget(400))
+    assert stages.evaluate(genomes, config, SEED) == expected
+
+
+def test_promoted_genomes_rank_above_the_rest(genomes, config):
+    """The best genomes of a stage fly the next one, and every promoted genome ends above every dropped one."""
+    stages = StagedEvaluation([Stage(150, promote=0.25), Stage(700, courses=2)])
+    fitness, _, _ = stages.evaluate(genomes, config, SEED)
+
+    first, _, _ = evaluate_courses(genomes, config, [SEED], EpisodeBudget(150))
+    promoted = np.argsort(-np.array(first), kind='stable')[:round(len(genomes) * 0.25)]
+    dropped = np.setdiff1d(np.arange(len(genomes)), promoted)
+    second, _, _ = evaluate_courses([genomes[i] for i in promoted], config, course_seeds(SEED, 2),
+                                    EpisodeBudget(700))
+
+    assert [fitness[i] for i in dropped] == [first[i] for i in dropped]
+    assert [fitness[i] for i in promoted] == pytest.approx([value + stages.offsets[1] for value in second])
+    assert min(fitness[i] for i in promoted) > max(fitness[i] for i in dropped)
+    assert [stage['genomes'] for stage in stages.report] == [len(genomes), len(promoted)]
+
+
+def test_from_file(tmp_path):
+    """Stages are read from the [Training] section, with one value or one per stage."""
+    path = tmp_path / 'config.txt'
+    path.write_text("[Training]\nstage_frames = 300 1500\nstage_courses = 1 3\nstage_promote = 0.5\n")
+    stages = StagedEvaluation.from_file(str(path))
+    assert [(stage.max_frames, stage.courses, stage.promote) for stage in stages.stages] == [(300, 1, 0.5),
+                                                                                           (1500, 3, 0.5)]
+
+    path.write_text("[Training]\nstage_frames =\n")
+    assert StagedEvaluation.from_file(str(path)) is None
+
+    path.write_text("[Training]\nstage_frames = 300 1500\nstage_courses = 1 2 3\n")
+    with pytest.raises(ValueError):
+        StagedEvaluation.from_file(str(path))
@@ -0,0 +1,114 @@
+import random
+import pytest
+import sweep
+from components import sweep as components_sweep
+from components.sweep import (Parameter, SuccessiveHalving, Trial, grid_variants, halving_rungs, random_variants,
+                              write_variant)
+
+BASE_CONFIG = """# A test configuration
+[NEAT]
+pop_size              = 50
+fitness_threshold     = 1000
+
+[DefaultGenome]
+# Mutation rates
+conn_add_prob         = 0.5
+compatibility_weight  = 0.5
+
+[DefaultSpeciesSet]
+compatibility_weight  = 3.0
+"""
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    path = tmp_path / "base.txt"
+    path.write_text(BASE_CONFIG)
+    return str(path)
+
+
+def test_parse_lists_and_ranges():
+    """Lists keep their values as numbers where they are numbers; ranges keep their bounds."""
+    listed = Parameter.parse("DefaultGenome.conn_add_prob = 0.1, 0.3,sigmoid")
+    assert (listed.name, listed.values, listed.is_range) == ("DefaultGenome.conn_add_prob", [0.1, 0.3, 'sigmoid'], False)
+    ranged = Parameter.parse("pop_size=20:50")
+    assert (ranged.low, ranged.high, ranged.is_range) == (20, 50, True)
+    rng = random.Random(0)
+    assert all(isinstance(ranged.sample(rng), int) and 20 <= ranged.sample(rng) <= 50 for _ in range(100))
+
+
+@pytest.mark.parametrize('text', ["foo", "foo=", "=1,2", "foo=a:b", "foo=3:1"])
+def test_parse_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        Parameter.parse(text)
+
+
+def test_grid_variants():
+    """The grid has every combination once, and ranges have no grid."""
+    variants = grid_variants([Parameter.parse("a=1,2,3"), Parameter.parse("b=x,y")])
+    assert len(variants) == 6 and len({tuple(variant.items()) for variant in variants}) == 6
+    with pytest.raises(ValueError):
+        grid_variants([Parameter.parse("a=1,2"), Parameter.parse("b=0.1:0.9")])
+
+
+def test_random_variants_do_not_repeat():
+    """Sampling more variants than the space holds returns each combination once."""
+    variants = random_variants([Parameter.parse("a=1,2"), Parameter.parse("b=x,y")], 10, random.Random(0))
+    assert sorted(tuple(variant.items()) for variant in variants) == [
+        (('a', 1), ('b', 'x')), (('a', 1), ('b', 'y')), (('a', 2), ('b', 'x')), (('a', 2), ('b', 'y'))]
+
+
+def test_halving_rungs():
+    assert halving_rungs(5, 45, 3) == [5, 15, 45]
+    assert halving_rungs(5, 40, 3) == [5, 15, 40]
+    assert halving_rungs(5, 5, 3) == [5]
+    assert halving_rungs(5, 45, 1) == [45]
+
+
+def test_write_variant_keeps_layout(base_path, tmp_path):
+    """Only the overridden lines change, and a section prefix picks one of several settings with the same key."""
+    path = tmp_path / "variant.txt"
+    write_variant(base_path, {'pop_size': 30, 'DefaultSpeciesSet.compatibility_weight': 2.5}, str(path))
+    expected = (BASE_CONFIG.replace("pop_size              = 50", "pop_size              = 30")
+                .replace("compatibility_weight  = 3.0", "compatibility_weight  = 2.5"))
+    assert path.read_text() == expected
+
+
+@pytest.mark.parametrize('name', ['compatibility_weight', 'nosuch', 'NEAT.conn_add_prob'])
+def test_write_variant_rejects_unknown_and_ambiguous_settings(base_path, tmp_path, name):
+    path = tmp_path / "variant.txt"
+    with pytest.raises(ValueError):
+        write_variant(base_path, {name: 1}, str(path))
+    assert not path.exists()
+
+
+def test_successive_halving_prunes_the_worst(tmp_path, monkeypatch):
+    """Each rung keeps the best 1/eta of the trials, and the results list the survivor, then later prunes first."""
+    fitness = [3.0, 9.0, 1.0, 7.0, 5.0, 8.0, 2.0, 6.0, 4.0]
+    trained = []
+
+    def train_trial(trial, generations, seed=None, max_frames=None, courses=1):
+        trained.append((trial.number, generations))
+        trial.generations = generations
+        trial.best_fitness = fitness[trial.number] + generations / 100
+        return trial
+
+    monkeypatch.setattr(components_sweep, 'train_trial', train_trial)
+    trials = [Trial(number, {}, str(tmp_path / str(number))) for number in range(len(fitness))]
+    ranked = SuccessiveHalving(trials, [1, 3, 9], eta=3, jobs=1).run(report=lambda line: None)
+
+    assert sorted(number for number, generations in trained if generations == 3) == [1, 3, 5]
+    assert [number for number, generations in trained if generations == 9] == [1]
+    assert [trial.number for trial in ranked] == [1, 5, 3, 7, 4, 8, 0, 6, 2]
+    assert [trial.stopped_at for trial in ranked] == [None, 3, 3, 1, 1, 1, 1, 1, 1]
+
+
+@pytest.mark.parametrize('param', ['foo', 'nosuch=1,2', 'pop_size=10:20'])
+def test_bad_parameters_stop_before_any_trial_directory(tmp_path, capsys, param):
+    """A bad --param is reported as a usage error before the sweep directory is made."""
+    output = tmp_path / "sweep"
+    with pytest.raises(SystemExit) as exit_info:
+        sweep.parse_args(['--param', param, '--output', str(output)])
+    assert exit_info.value.code == 2
+    assert 'error:' in capsys.readouterr().err
+    assert not output.exists()
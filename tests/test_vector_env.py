@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from components.simulation import EpisodeBudget, simulate
+from components.vector_env import NO_PIPE, VectorEnv, course_seeds, evaluate_courses
+
+SEED: int = 7
+MAX_FRAMES: int = 1500
+
+
+@pytest.fixture
+def genomes(make_genomes):
+    return make_genomes(16)
+
+
+def test_one_course_matches_simulate(genomes, config):
+    """Every bird flying alone on its course earns exactly what it earns in a Simulation with the same seed."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    assert evaluate_courses(genomes, config, [SEED], budget) == simulate(genomes, config, SEED, budget)
+
+
+def test_several_courses_average_simulate(genomes, config):
+    """Flying several courses at once gives the mean fitness, best score and mean frames of one Simulation per course."""
+    budget = EpisodeBudget(MAX_FRAMES)
+    seeds = course_seeds(SEED, 3)
+    assert seeds[0] == SEED
+    fitness, scores, frames = evaluate_courses(genomes, config, seeds, budget)
+    runs = [simulate(genomes, config, seed, budget) for seed in seeds]
+    assert fitness == pytest.approx(np.mean([run[0] for run in runs], axis=0).tolist(), rel=1e-12)
+    assert scores == np.max([run[1] for run in runs], axis=0).tolist()
+    assert frames == (np.sum([run[2] for run in runs], axis=0) // len(seeds)).tolist()
+
+
+def test_nearest_pipe_is_never_an_empty_slot():
+    """A bird that sees a pipe always sees a real one, never a slot holding NO_PIPE."""
+    env = VectorEnv(list(range(64)), max_frames=400, reset_seed=0)
+    rng = np.random.default_rng(0)
+    env.reset()
+    games = np.arange(env.num_envs)
+    for _ in range(800):
+        nearest = env.pipe_x[games, env._nearest]
+        assert np.all(nearest[env.sees_pipe] != NO_PIPE)
+        assert np.all(env.sees_pipe[env.population.alive])
+        env.step(rng.random(env.num_envs) < 0.07)
@@ -0,0 +1,57 @@
+import argparse
+import time
+from collections import deque
+from typing import Deque, List, Optional
+from components.telemetry import TelemetryTail, format_record, sparkline
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): The arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Show the training telemetry log, optionally following it as it grows.")
+    parser.add_argument('path', nargs='?', default='telemetry.jsonl', help="The telemetry log written by main.py.")
+    parser.add_argument('--follow', action='store_true', help="Keep printing new generations until interrupted.")
+    parser.add_argument('--window', type=int, default=60, help="Number of recent generations in the best fitness sparkline.")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between reads when following.")
+    return parser.parse_args(argv)
+
+
+def watch(path: str, follow: bool = False, window: int = 60, interval: float = 1.0) -> None:
+    """
+    Print a line per generation of a telemetry log, followed by a sparkline of the recent best fitness.
+
+    The log is only read, so watching never slows down or interferes with training.
+
+    Args:
+        path (str): The telemetry log.
+        follow (bool): Keep reading new generations until interrupted.
+        window (int): Number of recent generations in the sparkline.
+        interval (float): Seconds between reads when following.
+    """
+    tail = TelemetryTail(path)
+    best: Deque[float] = deque(maxlen=window)
+    try:
+        while True:
+            records = tail.read()
+            for record in records:
+                print(format_record(record), flush=True)
+                best.append(record['best']['fitness'])
+            if records and best:
+                print(f"best of last {len(best)}: {sparkline(list(best))}  {min(best):.2f} .. {max(best):.2f}", flush=True)
+            if not follow:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    watch(args.path, args.follow, max(1, args.window), args.interval)